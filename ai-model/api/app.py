@@ -3,12 +3,15 @@ Enhanced FastAPI application for Kiswahili Kwanza AI Model API
 Integrates all AI components for personalized learning
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.datastructures import FormData
+from starlette.formparsers import MultiPartException, MultiPartParser
 from typing import Optional, List, Dict, Any
 import numpy as np
 import json
+import shutil
 import sys
 import os
 from datetime import datetime
@@ -20,6 +23,9 @@ from models.recommendation_engine import LearningRecommendationEngine
 from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
 from models.progress_tracker import ProgressTracker, LearningSession
 from preprocessing.data_processor import KiswahiliDataProcessor
+from preprocessing.audio_decoder import AudioDecoder
+from inference.recommendation_cache import RecommendationCache
+from inference.streaming_pronunciation import StreamingPronunciationSession
 
 app = FastAPI(
     title="Kiswahili Kwanza AI API",
@@ -39,8 +45,27 @@ app.add_middleware(
 # Initialize AI components
 recommendation_engine = LearningRecommendationEngine()
 pronunciation_evaluator = KiswahiliPronunciationEvaluator()
-progress_tracker = ProgressTracker()
+# Word references precomputed by build_pronunciation_reference.py
+PRONUNCIATION_REFERENCE_PATH = os.environ.get(
+    "PRONUNCIATION_REFERENCE_PATH",
+    os.path.join(os.path.dirname(__file__), '..', 'models', 'pronunciation_reference.json')
+)
+if os.path.exists(PRONUNCIATION_REFERENCE_PATH):
+    pronunciation_evaluator.load_reference_table(PRONUNCIATION_REFERENCE_PATH)
+audio_decoder = AudioDecoder(target_sample_rate=22050)
+# Set PROGRESS_STORAGE_DIR to persist sessions across restarts and workers
+progress_tracker = ProgressTracker(storage_dir=os.environ.get("PROGRESS_STORAGE_DIR"))
 data_processor = KiswahiliDataProcessor()
+# Uploaded vocabulary files are processed this many rows at a time
+DATA_PROCESS_CHUNK_ROWS = int(os.environ.get("DATA_PROCESS_CHUNK_ROWS", 50000))
+
+# Recommendations are reused until the learner's stats change, a new session
+# is recorded for them or the entry expires
+recommendation_cache = RecommendationCache(
+    max_size=int(os.environ.get("RECOMMENDATION_CACHE_SIZE", 10000)),
+    ttl_seconds=float(os.environ.get("RECOMMENDATION_CACHE_TTL", 300))
+)
+progress_tracker.add_session_listener(recommendation_cache.invalidate_users)
 
 # Request/Response Models
 class UserData(BaseModel):
@@ -69,7 +94,8 @@ class RecommendationResponse(BaseModel):
 class PronunciationRequest(BaseModel):
     word: str
     user_id: str
-    audio_features: Optional[Dict] = None  # In production, this would be actual audio
+    audio_features: Optional[Dict] = None  # Recordings go to /api/pronunciation/evaluate/audio
+    seed: Optional[int] = None  # Makes the simulated evaluation reproducible
 
 class PronunciationResponse(BaseModel):
     word: str
@@ -79,6 +105,7 @@ class PronunciationResponse(BaseModel):
     areas_for_improvement: List[str]
     encouragement: str
     practice_suggestions: List[Dict]
+    metadata: Optional[Dict] = None
 
 class ProgressRequest(BaseModel):
     user_id: str
@@ -116,6 +143,7 @@ async def root():
         "endpoints": {
             "recommendations": "/api/recommend",
             "pronunciation": "/api/pronunciation/evaluate",
+            "pronunciation_stream": "/ws/pronunciation",
             "progress": "/api/progress/report",
             "session": "/api/session/record"
         }
@@ -143,6 +171,15 @@ async def get_recommendation(user_data: UserData):
         # Convert user data to dictionary
         user_dict = user_data.dict()
         
+        # Pick up sessions logged by other workers so their cache entries are dropped
+        progress_tracker.sync_from_log()
+        
+        fingerprint = recommendation_engine.feature_fingerprint(user_dict)
+        model_version = recommendation_engine.model_version
+        cached = recommendation_cache.get(user_data.user_id, fingerprint, model_version)
+        if cached is not None:
+            return cached
+        
         # Get recommendation from engine
         recommendation = recommendation_engine.predict_next_topic(user_dict)
         
@@ -154,7 +191,7 @@ async def get_recommendation(user_data: UserData):
         # Get learning insights
         insights = recommendation_engine.get_learning_insights(user_dict)
         
-        return RecommendationResponse(
+        response = RecommendationResponse(
             topic_id=recommendation["topic_id"],
             topic_name=recommendation["topic_name"],
             difficulty=recommendation["difficulty"],
@@ -163,6 +200,9 @@ async def get_recommendation(user_data: UserData):
             adapted_difficulty=adapted_difficulty,
             learning_insights=insights
         )
+        recommendation_cache.put(user_data.user_id, fingerprint, model_version, response)
+        
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Recommendation error: {str(e)}")
@@ -175,32 +215,207 @@ async def evaluate_pronunciation(request: PronunciationRequest):
     try:
         # In production, you would process actual audio data
         # For now, simulate audio data
+        rng = np.random.default_rng(request.seed) if request.seed is not None else None
         sample_rate = 22050
         duration = 2.0  # 2 seconds
-        audio_data = np.random.normal(0, 0.1, int(sample_rate * duration))
+        audio_data = (rng or np.random).normal(0, 0.1, int(sample_rate * duration))
         
-        # Evaluate pronunciation
-        result = pronunciation_evaluator.evaluate_pronunciation(
-            request.word, audio_data, sample_rate
-        )
+        return _evaluate_recording(request.word, audio_data, sample_rate, rng)
         
-        # Get practice suggestions for problem areas
-        practice_suggestions = pronunciation_evaluator.get_practice_suggestions(
-            result['areas_for_improvement']
-        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pronunciation evaluation error: {str(e)}")
+
+@app.post("/api/pronunciation/evaluate/audio", response_model=PronunciationResponse)
+async def evaluate_pronunciation_audio(request: Request,
+                                       word: Optional[str] = None,
+                                       user_id: Optional[str] = None,
+                                       sample_rate: Optional[int] = None):
+    """
+    Evaluate pronunciation of a Kiswahili word from a recording
+    
+    Accepts either a multipart form (fields "word", "user_id" and an "audio"
+    file) or the recording as the request body with word/user_id as query
+    parameters. WAV/FLAC/OGG are decoded from their headers; raw 16-bit mono
+    PCM (Content-Type audio/pcm or audio/L16) needs a sample_rate. Either way
+    the upload is rejected as soon as more than the decoder's encoded size
+    limit has arrived (plus FORM_OVERHEAD_BYTES for a form), and nothing is
+    written to disk.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await _read_audio_form(request)
+            try:
+                word = form.get("word", word)
+                audio = form.get("audio")
+                if audio is None or isinstance(audio, str):
+                    raise ValueError("Missing 'audio' file field")
+                if audio.size is not None and audio.size > audio_decoder.max_encoded_bytes:
+                    raise ValueError("Recording too large")
+                data = await audio.read()
+                pcm_rate = None
+                if audio_decoder.is_pcm(audio.content_type):
+                    pcm_rate = int(form.get("sample_rate") or sample_rate or 0)
+                    if not pcm_rate:
+                        raise ValueError("Raw PCM requires a sample_rate")
+            finally:
+                await form.close()
+            audio_data, rate = audio_decoder.decode(data, pcm_sample_rate=pcm_rate)
+        else:
+            audio_data, rate = await _read_audio_body(request, content_type, sample_rate)
         
-        return PronunciationResponse(
-            word=result['word'],
-            overall_score=result['overall_score'],
-            phoneme_scores=result['phoneme_scores'],
-            feedback=result['feedback'],
-            areas_for_improvement=result['areas_for_improvement'],
-            encouragement=result['encouragement'],
-            practice_suggestions=practice_suggestions
+        if not word:
+            raise ValueError("Missing 'word'")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid audio upload: {str(e)}")
+    
+    try:
+        return _evaluate_recording(word, audio_data, rate)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pronunciation evaluation error: {str(e)}")
+
+# Room for the text fields and part headers around a multipart recording
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+async def _read_audio_form(request: Request) -> FormData:
+    """
+    Parse a multipart upload, keeping the recording in memory
+    
+    Starlette's request.form() reads the whole body before anything can be
+    checked and spools file parts over 1 MB to temporary files. Here the body
+    is counted as it streams in, and the file part stays in memory up to the
+    same limit, which is reached first.
+    
+    Raises:
+        ValueError: If the body is too large or is not a valid form
+    """
+    limit = audio_decoder.max_encoded_bytes + FORM_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise ValueError("Recording too large")
+    
+    async def limited_stream():
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise ValueError("Recording too large")
+            yield chunk
+    
+    parser = MultiPartParser(request.headers, limited_stream(), max_files=1, max_fields=8)
+    parser.spool_max_size = limit
+    try:
+        return await parser.parse()
+    except MultiPartException as e:
+        raise ValueError(e.message)
+
+async def _read_audio_body(request: Request, content_type: str, sample_rate: Optional[int]):
+    """Decode a recording sent as the raw request body"""
+    content_length = request.headers.get("content-length")
+    content_length = int(content_length) if content_length and content_length.isdigit() else None
+    
+    if audio_decoder.is_pcm(content_type):
+        if sample_rate is None:
+            raise ValueError("Raw PCM requires the sample_rate query parameter")
+        # Convert chunks into the float32 buffer as they arrive
+        buffer = audio_decoder.pcm_buffer(sample_rate, content_length)
+        async for chunk in request.stream():
+            buffer.write(chunk)
+        return audio_decoder.finish(buffer.samples(), sample_rate)
+    
+    if content_length is not None and content_length > audio_decoder.max_encoded_bytes:
+        raise ValueError("Recording too large")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > audio_decoder.max_encoded_bytes:
+            raise ValueError("Recording too large")
+    return audio_decoder.decode(bytes(body))
+
+def _evaluate_recording(word: str, audio_data: np.ndarray, sample_rate: int,
+                        rng: Optional[np.random.Generator] = None) -> PronunciationResponse:
+    """Run the evaluator and attach practice suggestions"""
+    result = pronunciation_evaluator.evaluate_pronunciation(
+        word, audio_data, sample_rate, rng=rng
+    )
+    
+    # Get practice suggestions for problem areas
+    practice_suggestions = pronunciation_evaluator.get_practice_suggestions(
+        result['areas_for_improvement']
+    )
+    
+    return PronunciationResponse(
+        word=result['word'],
+        overall_score=result['overall_score'],
+        phoneme_scores=result['phoneme_scores'],
+        feedback=result['feedback'],
+        areas_for_improvement=result['areas_for_improvement'],
+        encouragement=result['encouragement'],
+        practice_suggestions=practice_suggestions,
+        metadata=result.get('metadata')
+    )
+
+# Largest audio message accepted on the streaming socket, in seconds
+STREAM_MAX_CHUNK_SECONDS = 1.0
+
+@app.websocket("/ws/pronunciation")
+async def stream_pronunciation(websocket: WebSocket,
+                               word: str,
+                               sample_rate: int = 22050,
+                               user_id: Optional[str] = None):
+    """
+    Stream a recording and receive pronunciation feedback while speaking
+    
+    The client sends 16-bit mono PCM at sample_rate as binary messages of
+    at most STREAM_MAX_CHUNK_SECONDS, then the text message {"type": "end"}.
+    Every message that completes an analysis frame is answered with a
+    "partial" update (newly scored phonemes, running score and features);
+    "end" is answered with the "final" evaluation. Invalid input gets an
+    "error" message and the socket is closed.
+    """
+    await websocket.accept()
+    try:
+        audio_decoder.check_sample_rate(sample_rate)
+        session = StreamingPronunciationSession(
+            pronunciation_evaluator, word, sample_rate,
+            max_duration_seconds=audio_decoder.max_duration_seconds
         )
+        max_chunk_bytes = int(STREAM_MAX_CHUNK_SECONDS * sample_rate) * 2
         
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            
+            if message.get("bytes") is not None:
+                if len(message["bytes"]) > max_chunk_bytes:
+                    raise ValueError(f"Audio messages are limited to {STREAM_MAX_CHUNK_SECONDS:g} s")
+                update = session.push_pcm(message["bytes"])
+                if update is not None:
+                    await websocket.send_json(update)
+                continue
+            
+            control = json.loads(message.get("text") or "{}")
+            if not isinstance(control, dict):
+                raise ValueError('Text messages must be JSON objects such as {"type": "end"}')
+            if control.get("type") == "end":
+                result = session.finish()
+                result["type"] = "final"
+                result["practice_suggestions"] = pronunciation_evaluator.get_practice_suggestions(
+                    result["areas_for_improvement"]
+                )
+                await websocket.send_json(result)
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        return
+    except ValueError as e:
+        # Also covers malformed or non-object JSON control messages
+        await websocket.send_json({"type": "error", "detail": f"Invalid audio stream: {str(e)}"})
+        await websocket.close(code=1003)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Pronunciation evaluation error: {str(e)}")
+        await websocket.send_json({"type": "error", "detail": f"Pronunciation streaming error: {str(e)}"})
+        await websocket.close(code=1011)
 
 @app.post("/api/session/record")
 async def record_session(session_data: SessionData):
@@ -237,6 +452,115 @@ async def record_session(session_data: SessionData):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Session recording error: {str(e)}")
 
+def _parse_session_batch(body: bytes) -> List[Any]:
+    """Decode a JSON array or newline-delimited JSON (NDJSON) request body"""
+    text = body.decode('utf-8').strip()
+    if text.startswith('['):
+        return json.loads(text)
+    
+    items = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            # Keep the line's slot so per-item statuses stay aligned
+            items.append(e)
+    return items
+
+SESSION_BATCH = TypeAdapter(List[SessionData])
+
+def _validate_session_batch(items: List[Any]):
+    """
+    Validate a parsed batch in one pass over the list
+    
+    Pydantic reports every failing item in a single ValidationError, with
+    the item's index at the start of each error location. When some items
+    fail, the rest are validated again together without them.
+    
+    Returns:
+        index -> SessionData for valid items, and index -> error message
+        for invalid ones
+    """
+    errors = {index: str(item) for index, item in enumerate(items) if isinstance(item, Exception)}
+    candidates = [index for index in range(len(items)) if index not in errors]
+    try:
+        validated = SESSION_BATCH.validate_python([items[index] for index in candidates])
+    except ValidationError as e:
+        messages = {}
+        for err in e.errors():
+            position, *loc = err['loc']
+            messages.setdefault(candidates[position], []).append(f"{'.'.join(map(str, loc))}: {err['msg']}")
+        errors.update((index, "; ".join(lines)) for index, lines in messages.items())
+        candidates = [index for index in candidates if index not in messages]
+        validated = SESSION_BATCH.validate_python([items[index] for index in candidates])
+    return dict(zip(candidates, validated)), errors
+
+@app.post("/api/session/record/batch")
+async def record_session_batch(request: Request):
+    """
+    Record many learning sessions at once
+    
+    Accepts a JSON array of sessions or an NDJSON stream (one session per
+    line). Valid sessions are recorded together; invalid ones are reported
+    per item without rejecting the rest of the batch.
+    """
+    try:
+        items = _parse_session_batch(await request.body())
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid session batch: {str(e)}")
+    
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Invalid session batch: expected a JSON array or NDJSON")
+    
+    validated, errors = _validate_session_batch(items)
+    
+    sessions = []
+    for index, session_data in validated.items():
+        try:
+            sessions.append(LearningSession(
+                session_id=session_data.session_id,
+                user_id=session_data.user_id,
+                topic_id=session_data.topic_id,
+                start_time=datetime.fromisoformat(session_data.start_time),
+                end_time=datetime.fromisoformat(session_data.end_time),
+                activities_completed=session_data.activities_completed,
+                total_activities=session_data.total_activities,
+                accuracy_score=session_data.accuracy_score,
+                pronunciation_score=session_data.pronunciation_score,
+                engagement_score=session_data.engagement_score,
+                help_requests=session_data.help_requests,
+                retry_attempts=session_data.retry_attempts,
+                errors=session_data.errors
+            ))
+        except (ValueError, TypeError) as e:
+            errors[index] = str(e)
+    
+    try:
+        # Apply profile and aggregate updates for the whole batch at once
+        progress_tracker.record_sessions(sessions)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Session recording error: {str(e)}")
+    
+    # Statuses are only reported once the batch has been written
+    results = []
+    for index, item in enumerate(items):
+        session_id = item.get("session_id") if isinstance(item, dict) else None
+        if index in errors:
+            results.append({"index": index, "session_id": session_id, "status": "failed", "error": errors[index]})
+        else:
+            results.append({"index": index, "session_id": session_id, "status": "recorded"})
+    
+    failed = len(results) - len(sessions)
+    return {
+        "status": "success" if not failed else "partial",
+        "recorded": len(sessions),
+        "failed": failed,
+        "results": results
+    }
+
 @app.post("/api/progress/report")
 async def get_progress_report(request: ProgressRequest):
     """
@@ -325,17 +649,17 @@ async def process_learning_data(
     Process uploaded learning data
     """
     try:
-        # Save uploaded file temporarily
+        # Save uploaded file temporarily, without holding it in memory
         temp_file = f"temp_{vocab_file.filename}"
         with open(temp_file, "wb") as f:
-            content = await vocab_file.read()
-            f.write(content)
+            shutil.copyfileobj(vocab_file.file, f)
         
         # Process vocabulary data
         result = data_processor.process_vocabulary_dataset(
             temp_file, 
             "processed_vocab.csv",
-            target_age_group=1
+            target_age_group=1,
+            chunksize=DATA_PROCESS_CHUNK_ROWS
         )
         
         # Clean up temp file
@@ -399,9 +723,9 @@ async def get_system_stats():
         total_sessions = len(progress_tracker.sessions_data)
         
         # Calculate average metrics
-        if progress_tracker.sessions_data:
-            avg_accuracy = np.mean([s.accuracy_score for s in progress_tracker.sessions_data])
-            avg_engagement = np.mean([s.engagement_score for s in progress_tracker.sessions_data])
+        if total_sessions:
+            avg_accuracy = progress_tracker.sessions_data.column('accuracy_score').mean()
+            avg_engagement = progress_tracker.sessions_data.column('engagement_score').mean()
         else:
             avg_accuracy = 0.0
             avg_engagement = 0.0
@@ -418,7 +742,8 @@ async def get_system_stats():
                 "recommendation_engine": "active",
                 "pronunciation_evaluator": "active",
                 "progress_tracker": "active"
-            }
+            },
+            "recommendation_cache": recommendation_cache.stats()
         }
         
     except Exception as e:
@@ -0,0 +1,154 @@
+"""
+Benchmark parallel audio corpus extraction with the feature cache
+
+Writes a corpus of synthetic child recordings (16 kHz wav, resampled on
+load as real uploads are), including byte-identical copies under other
+names. Checks that AudioCorpusExtractor returns the same features as the
+previous per-file extraction, then reports files/second (and checks every
+run returns the same features) for:
+    
+    serial   one process, empty cache
+    pool     one worker process per CPU, empty cache
+    warm     rerun against the cache filled by the pool run
+
+Finally starts an extraction in a subprocess, kills it (SIGKILL) once about
+half the corpus has been flushed to the cache and reruns it, reporting how
+many files the rerun took from the cache.
+
+Usage:
+    python benchmarks/bench_audio_corpus.py [n_files] [max_workers]
+"""
+
+import glob
+import multiprocessing as mp
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.audio_corpus import FEATURE_NAMES, FEATURE_VERSION, AudioCorpusExtractor, AudioFeatureCache
+from bench_pronunciation_audio import child_recording
+
+FILE_SAMPLE_RATE = 16000
+TARGET_SAMPLE_RATE = 22050
+N_REFERENCE = 40
+FLUSH_EVERY = 100
+
+
+def reference_extract_audio_features(audio_file: str, target_sr: int) -> dict:
+    """KiswahiliDataProcessor._extract_audio_features before the corpus extractor"""
+    audio_data, sr = librosa.load(audio_file, sr=target_sr)
+    duration = len(audio_data) / sr
+    spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sr)[0]
+    spectral_rolloff = librosa.feature.spectral_rolloff(y=audio_data, sr=sr)[0]
+    mfccs = librosa.feature.mfcc(y=audio_data, sr=sr, n_mfcc=13)
+    zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
+    pitches, magnitudes = librosa.piptrack(y=audio_data, sr=sr)
+    pitch_values = pitches[pitches > 0]
+    return {
+        'filename': Path(audio_file).name,
+        'duration': duration,
+        'spectral_centroid_mean': np.mean(spectral_centroids),
+        'spectral_centroid_std': np.std(spectral_centroids),
+        'spectral_rolloff_mean': np.mean(spectral_rolloff),
+        'mfcc_mean': np.mean(mfccs, axis=1).tolist(),
+        'mfcc_std': np.std(mfccs, axis=1).tolist(),
+        'zcr_mean': np.mean(zcr),
+        'pitch_mean': np.mean(pitch_values) if len(pitch_values) > 0 else 0,
+        'pitch_std': np.std(pitch_values) if len(pitch_values) > 0 else 0,
+        'energy': np.sum(audio_data ** 2)
+    }
+
+
+def write_corpus(directory: str, n_files: int, rng) -> list:
+    """n_files recordings, about 5% of them copies of another one"""
+    files = []
+    for index in range(n_files):
+        path = os.path.join(directory, f"word{index:05d}_child{index % 30}.wav")
+        if index > 10 and rng.random() < 0.05:
+            shutil.copyfile(files[rng.integers(0, len(files))], path)
+        else:
+            sf.write(path, child_recording(rng.uniform(0.5, 2.0), FILE_SAMPLE_RATE, rng), FILE_SAMPLE_RATE)
+        files.append(path)
+    return files
+
+
+def check_equivalence(files: list):
+    results, stats = AudioCorpusExtractor(TARGET_SAMPLE_RATE, max_workers=1).extract(files)
+    assert stats['failed_files'] == 0, stats['errors']
+    for audio_file, features in zip(files, results):
+        expected = reference_extract_audio_features(audio_file, TARGET_SAMPLE_RATE)
+        expected.pop('filename')
+        assert list(features) == list(expected), f"{audio_file}: feature names differ"
+        for name in FEATURE_NAMES:
+            assert np.array_equal(expected[name], features[name]), f"{audio_file}: {name} differs"
+
+
+def timed_run(files: list, max_workers: int, cache_dir: str):
+    results, stats = AudioCorpusExtractor(TARGET_SAMPLE_RATE, max_workers=max_workers, cache_dir=cache_dir).extract(files)
+    assert stats['failed_files'] == 0, stats['errors']
+    return results, stats
+
+
+def interrupted_run(corpus_dir: str, cache_dir: str, max_workers: int, kill_after_shards: int) -> int:
+    """Kill an extraction and its workers once it has flushed some shards; returns the entries left in the cache"""
+    worker = subprocess.Popen([sys.executable, __file__, '--extract', corpus_dir, cache_dir, str(max_workers)],
+                              start_new_session=True)
+    shards = os.path.join(cache_dir, f"sr{TARGET_SAMPLE_RATE}-v{FEATURE_VERSION}", 'shard-*.parquet')
+    while len(glob.glob(shards)) < kill_after_shards and worker.poll() is None:
+        time.sleep(0.05)
+    os.killpg(worker.pid, signal.SIGKILL)
+    worker.wait()
+    return len(AudioFeatureCache(cache_dir, TARGET_SAMPLE_RATE))
+
+
+def main():
+    n_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else mp.cpu_count()
+    rng = np.random.default_rng(24)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_dir = os.path.join(directory, 'corpus')
+        os.makedirs(corpus_dir)
+        files = write_corpus(corpus_dir, n_files, rng)
+        
+        check_equivalence(files[:N_REFERENCE])
+        print(f"{N_REFERENCE} recordings: features identical to the per-file extraction")
+        
+        print(f"\n{n_files} files, {mp.cpu_count()} CPUs")
+        print(f"{'run':>8} {'workers':>8} {'extracted':>10} {'cached':>7} {'seconds':>8} {'files/s':>8}")
+        runs = [('serial', 1, 'serial-cache'), ('pool', max_workers, 'pool-cache'), ('warm', max_workers, 'pool-cache')]
+        expected = None
+        for name, workers, cache_name in runs:
+            results, stats = timed_run(files, workers, os.path.join(directory, cache_name))
+            assert expected is None or results == expected, f"{name}: features differ from the serial run"
+            expected = results
+            print(f"{name:>8} {workers:>8} {stats['extracted_files']:>10} {stats['cached_files']:>7} "
+                  f"{stats['seconds']:>8.1f} {stats['files_per_second']:>8.0f}")
+        
+        cache_dir = os.path.join(directory, 'interrupted-cache')
+        left = interrupted_run(corpus_dir, cache_dir, max_workers, kill_after_shards=max(1, n_files // (2 * FLUSH_EVERY)))
+        results, stats = timed_run(files, max_workers, cache_dir)
+        assert results == expected, "Resumed run: features differ from the serial run"
+        print(f"\nKilled part-way: {left} entries in the cache; the rerun took {stats['cached_files']} files from it "
+              f"and extracted {stats['extracted_files']}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--extract']:
+        corpus_dir, cache_dir, workers = sys.argv[2], sys.argv[3], int(sys.argv[4])
+        corpus = sorted(str(path) for path in Path(corpus_dir).glob('*.wav'))
+        AudioCorpusExtractor(TARGET_SAMPLE_RATE, max_workers=workers, cache_dir=cache_dir,
+                             flush_every=FLUSH_EVERY).extract(corpus)
+    else:
+        main()
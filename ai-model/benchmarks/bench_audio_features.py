@@ -0,0 +1,98 @@
+"""
+Benchmark pronunciation feature extraction: separate librosa calls vs one STFT
+
+The reference path is the evaluator's previous feature extraction, where
+spectral_centroid, mfcc and piptrack each compute their own STFT. The shared
+path is SpectralFeatureExtractor. Checks that both return the same features,
+then reports per-clip time and peak allocated memory (tracemalloc) for 1-5
+second clips.
+
+Usage:
+    python benchmarks/bench_audio_features.py [n_repeats]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import librosa
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.audio_features import SpectralFeatureExtractor
+from bench_pronunciation_audio import child_recording
+
+
+def reference_features(audio_data: np.ndarray, sample_rate: int) -> dict:
+    """Feature extraction as KiswahiliPronunciationEvaluator did it before"""
+    features = {}
+    spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sample_rate)[0]
+    features['spectral_centroid_mean'] = np.mean(spectral_centroids)
+    features['spectral_centroid_std'] = np.std(spectral_centroids)
+    
+    mfccs = librosa.feature.mfcc(y=audio_data, sr=sample_rate, n_mfcc=13)
+    features['mfccs'] = mfccs
+    features['mfcc_mean'] = np.mean(mfccs, axis=1)
+    features['mfcc_std'] = np.std(mfccs, axis=1)
+    
+    pitches, magnitudes = librosa.piptrack(y=audio_data, sr=sample_rate)
+    features['pitch_mean'] = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
+    
+    features['duration'] = len(audio_data) / sample_rate
+    features['energy'] = np.sum(audio_data ** 2)
+    return features
+
+
+def check_equivalence(extractor, clips, sample_rate):
+    for clip in clips:
+        expected = reference_features(clip, sample_rate)
+        actual = extractor.extract(clip, sample_rate)
+        assert set(expected) <= set(actual)
+        for key in expected:
+            # Matrix products instead of einsum/scipy.fft.dct round differently
+            assert np.allclose(expected[key], actual[key], rtol=1e-4, atol=1e-3), key
+
+
+def measure(extract, clip, sample_rate, n_repeats):
+    timings = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        extract(clip, sample_rate)
+        timings.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    extract(clip, sample_rate)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.median(timings) * 1000, peak / 2**20
+
+
+def main():
+    n_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    sample_rate = 22050
+    rng = np.random.default_rng(3)
+    extractor = SpectralFeatureExtractor()
+    
+    clips = {duration: child_recording(duration, sample_rate, rng) for duration in (1, 2, 3, 4, 5)}
+    silent = np.zeros(sample_rate, dtype=np.float32)
+    noise = rng.normal(0, 0.1, sample_rate * 2)
+    check_equivalence(extractor, list(clips.values()) + [silent, noise], sample_rate)
+    print("Features match the separate librosa calls (float32, float64 and silent clips)\n")
+    
+    # Warm librosa's caches and JIT before timing
+    reference_features(clips[1], sample_rate)
+    extractor.extract(clips[1], sample_rate)
+    
+    print(f"{'secs':>5} {'separate ms':>12} {'shared ms':>10} {'speedup':>8} "
+          f"{'separate MiB':>13} {'shared MiB':>11}")
+    for duration, clip in clips.items():
+        reference_ms, reference_mib = measure(reference_features, clip, sample_rate, n_repeats)
+        shared_ms, shared_mib = measure(extractor.extract, clip, sample_rate, n_repeats)
+        print(f"{duration:>5} {reference_ms:>12.2f} {shared_ms:>10.2f} {reference_ms / shared_ms:>7.1f}x "
+              f"{reference_mib:>13.2f} {shared_mib:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
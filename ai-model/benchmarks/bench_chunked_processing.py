@@ -0,0 +1,125 @@
+"""
+Benchmark chunked processing of large interaction exports and vocabularies
+
+Writes interaction exports (as a JSON array and as NDJSON, the way the
+Next.js app produces them) and vocabulary CSVs of growing size, then
+processes each one whole and in chunks. The output CSVs must be identical;
+the chunked peak memory (traced Python and numpy allocations) should stay
+flat as the files grow, while the whole-file peak grows with them.
+
+Usage:
+    python benchmarks/bench_chunked_processing.py [sizes] [chunksize]
+    
+    sizes is a comma-separated list of record counts (default 50000,200000)
+"""
+
+import filecmp
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.data_processor import KiswahiliDataProcessor
+from preprocessing.record_stream import iter_json_records
+from bench_vocabulary_processing import build_vocabulary
+
+ERROR_TYPES = ['none', 'phonetic', 'visual_confusion', 'sequence']
+ACTIVITIES = ['flashcards', 'pronunciation', 'spelling', 'listening']
+
+
+def write_interactions(path, n_logs, rng, ndjson):
+    """Write an interaction export one log at a time"""
+    with open(path, 'w', encoding='utf-8') as f:
+        if not ndjson:
+            f.write('[\n')
+        for index in range(n_logs):
+            log = {
+                'user_id': f"user_{rng.integers(0, 5000)}",
+                'session_id': f"session_{index // 20}",
+                'timestamp': f"2026-09-{1 + index % 28:02d}T10:{index % 60:02d}:00",
+                'activity_type': ACTIVITIES[index % len(ACTIVITIES)],
+                'topic_id': int(rng.integers(1, 12)),
+                'accuracy': round(float(rng.random()), 3),
+                'response_time': round(float(rng.gamma(2.0, 1.5)), 2),
+                'error_type': ERROR_TYPES[int(rng.integers(0, len(ERROR_TYPES)))],
+                'help_requested': bool(rng.random() < 0.1),
+                'retry_count': int(rng.integers(0, 4)),
+                'engagement_score': round(float(rng.random()), 3)
+            }
+            separator = '\n' if ndjson else (',\n' if index < n_logs - 1 else '\n')
+            f.write(json.dumps(log) + separator)
+        if not ndjson:
+            f.write(']\n')
+
+
+def measure(function, *args):
+    """Result, seconds, and peak traced memory in MB (from a second, traced run)"""
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(',')] if len(sys.argv) > 1 else [50000, 200000]
+    chunksize = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    rng = np.random.default_rng(22)
+    processor = KiswahiliDataProcessor()
+    
+    def interactions_whole(path, output_file):
+        with open(path, 'r', encoding='utf-8') as f:
+            logs = json.load(f) if path.endswith('.json') else [json.loads(line) for line in f]
+        return processor.process_user_interaction_data(logs, output_file)
+    
+    def interactions_chunked(path, output_file):
+        return processor.process_user_interaction_data(iter_json_records(path), output_file, chunksize=chunksize)
+    
+    def vocabulary_whole(path, output_file):
+        return processor.process_vocabulary_dataset(path, output_file)
+    
+    def vocabulary_chunked(path, output_file):
+        return processor.process_vocabulary_dataset(path, output_file, chunksize=chunksize)
+    
+    print(f"Chunks of {chunksize} records")
+    print(f"{'input':>18} {'records':>8} {'MB':>6} {'whole s':>8} {'chunked s':>10} "
+          f"{'whole peak MB':>14} {'chunked peak MB':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        expected, actual = os.path.join(directory, 'whole.csv'), os.path.join(directory, 'chunked.csv')
+        for n_records in sizes:
+            inputs = []
+            for name in ('interactions.json', 'interactions.ndjson'):
+                path = os.path.join(directory, name)
+                write_interactions(path, n_records, rng, ndjson=name.endswith('.ndjson'))
+                inputs.append((name, path, interactions_whole, interactions_chunked))
+            path = os.path.join(directory, 'vocabulary.csv')
+            build_vocabulary(n_records, rng, distinct=True).to_csv(path, index=False)
+            inputs.append(('vocabulary.csv', path, vocabulary_whole, vocabulary_chunked))
+            
+            for name, path, whole, chunked in inputs:
+                whole_summary, whole_seconds, whole_peak = measure(whole, path, expected)
+                chunked_summary, chunked_seconds, chunked_peak = measure(chunked, path, actual)
+                assert filecmp.cmp(expected, actual, shallow=False), f"{name}: chunked output differs"
+                for key, value in whole_summary.items():
+                    if key == 'average_accuracy':
+                        assert abs(value - chunked_summary[key]) < 1e-9, f"{name}: {key} differs"
+                    elif key != 'output_file':
+                        assert value == chunked_summary[key], f"{name}: {key} differs"
+                size_mb = os.path.getsize(path) / 1e6
+                print(f"{name:>18} {n_records:>8} {size_mb:>6.0f} {whole_seconds:>8.2f} {chunked_seconds:>10.2f} "
+                      f"{whole_peak:>14.1f} {chunked_peak:>16.1f}")
+    print("\nChunked outputs and summaries identical to whole-file processing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Equivalence check and latency benchmark for the flat-array forest evaluator
+
+Checks that FlatForest.predict_proba matches sklearn's
+RandomForestClassifier.predict_proba exactly on random inputs (including
+inputs sitting exactly on split thresholds), then compares single-learner
+latency of the recommendation path with the sklearn forest and with the
+compiled FlatForest. tests/test_flat_forest.py runs the same equivalence
+check, plus a joblib mmap save/load round trip, under pytest.
+
+Usage:
+    python benchmarks/bench_flat_forest.py [n_requests]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.flat_forest import FlatForest
+from models.recommendation_engine import LearningRecommendationEngine
+from bench_recommendation_batch import generate_learners
+
+
+def check_equivalence():
+    """FlatForest must reproduce sklearn's probabilities bit for bit"""
+    rng = np.random.default_rng(7)
+    configs = [
+        dict(n_estimators=100, max_depth=None, n_classes=10),
+        dict(n_estimators=30, max_depth=6, n_classes=3),
+        dict(n_estimators=10, max_depth=None, n_classes=2),
+        dict(n_estimators=1, max_depth=1, n_classes=4),
+    ]
+    
+    for config in configs:
+        n_classes = config.pop('n_classes')
+        X = rng.normal(size=(4000, 19))
+        y = rng.integers(1, n_classes + 1, len(X))
+        forest = RandomForestClassifier(random_state=3, **config).fit(X, y)
+        flat = FlatForest.from_sklearn(forest)
+        
+        inputs = [
+            rng.normal(size=(5000, 19)) * 3,
+            X[:500],
+            rng.normal(size=(1, 19)),
+        ]
+        
+        # Inputs exactly on thresholds exercise the float32 '<=' comparison
+        on_threshold = rng.normal(size=(500, 19))
+        internal = np.flatnonzero(flat.feature >= 0)
+        picks = rng.choice(internal, len(on_threshold))
+        on_threshold[np.arange(len(on_threshold)), flat.feature[picks]] = flat.threshold[picks]
+        inputs.append(on_threshold)
+        
+        for sample in inputs:
+            expected = forest.predict_proba(sample)
+            actual = flat.predict_proba(sample)
+            assert np.array_equal(expected, actual), "FlatForest probabilities differ from sklearn"
+            assert np.array_equal(forest.predict(sample), flat.predict(sample))
+        
+        print(f"  {forest.n_estimators:>3} trees, max depth {flat.max_depth:>2}, "
+              f"{n_classes:>2} classes: identical")
+
+
+def percentiles(timings):
+    timings = np.array(timings) * 1000
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def time_recommendations(engine, learners):
+    timings = []
+    for learner in learners:
+        start = time.perf_counter()
+        engine.predict_next_topic(learner)
+        engine.adapt_difficulty(learner, 2)
+        engine.get_learning_insights(learner)
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    print("Equivalence with RandomForestClassifier.predict_proba:")
+    check_equivalence()
+    
+    # Labels follow the features, as with real learner data
+    engine = LearningRecommendationEngine()
+    training = generate_learners(5000, seed=17)
+    X = engine.extract_features_batch(training)
+    y = np.clip(np.round(X[:, 0] * 10 + X[:, 2] * 3 - X[:, 3] * 0.3), 1, 10).astype(int)
+    engine.scaler.fit(X)
+    engine.model.fit(engine.scaler.transform(X), y)
+    engine.is_trained = True
+    
+    learners = generate_learners(n_requests)
+    sklearn_p50, sklearn_p99 = time_recommendations(engine, learners)
+    expected = [engine.predict_next_topic(learner) for learner in learners]
+    
+    engine.compile_model()
+    flat_p50, flat_p99 = time_recommendations(engine, learners)
+    assert [engine.predict_next_topic(learner) for learner in learners] == expected
+    
+    print(f"\n/api/recommend compute path, {n_requests} single-learner requests "
+          f"(forest max depth {engine.model.max_depth}):")
+    print(f"{'model':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    print(f"{'sklearn':>10} {sklearn_p50:>8.3f} {sklearn_p99:>8.3f}")
+    print(f"{'flat':>10} {flat_p50:>8.3f} {flat_p99:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark per-worker memory and cold start for recommendation model artifacts
+
+Trains a forest, saves it both as a pickled RandomForestClassifier and as a
+memory-mappable FlatForest, then starts several worker processes that each
+load the artifact and serve one prediction. Reports cold-start time and
+per-worker RSS / PSS / private memory (from /proc/self/smaps_rollup, Linux
+only) while all workers are alive.
+
+Usage:
+    python benchmarks/bench_model_sharing.py [n_workers] [n_training_rows]
+"""
+
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.append(SRC_DIR)
+
+from models.recommendation_engine import LearningRecommendationEngine
+
+
+def memory_kb() -> dict:
+    """Rss, Pss and private memory of this process in kB"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'private': fields['Private_Clean'] + fields['Private_Dirty']
+    }
+
+
+def worker(model_path: str, mmap_mode, barrier, results):
+    sys.path.append(SRC_DIR)
+    from models.recommendation_engine import LearningRecommendationEngine
+    
+    engine = LearningRecommendationEngine()
+    before = memory_kb()
+    
+    start = time.perf_counter()
+    assert engine.load_model(model_path, mmap_mode=mmap_mode)
+    engine.predict_next_topic({'overall_accuracy': 0.7, 'completed_topics': [1, 2]})
+    cold_start = time.perf_counter() - start
+    
+    # Measure while every worker holds the model
+    barrier.wait()
+    after = memory_kb()
+    barrier.wait()
+    
+    results.put({
+        'cold_start': cold_start,
+        **{key: after[key] - before[key] for key in after}
+    })
+
+
+def run_workers(model_path: str, mmap_mode, n_workers: int) -> dict:
+    context = mp.get_context('spawn')
+    barrier = context.Barrier(n_workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(model_path, mmap_mode, barrier, results))
+        for _ in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    
+    return {key: float(np.mean([m[key] for m in measurements])) for key in measurements[0]}
+
+
+def train_engine(n_rows: int) -> LearningRecommendationEngine:
+    rng = np.random.default_rng(0)
+    engine = LearningRecommendationEngine()
+    X = rng.normal(size=(n_rows, 19))
+    y = rng.integers(1, 11, n_rows)
+    engine.scaler.fit(X)
+    engine.model.fit(engine.scaler.transform(X), y)
+    engine.is_trained = True
+    return engine
+
+
+def main():
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    
+    engine = train_engine(n_rows)
+    directory = tempfile.mkdtemp(prefix="kiswahili-models-")
+    try:
+        pickled_path = os.path.join(directory, 'recommendation_model_pickled.joblib')
+        joblib.dump({'model': engine.model, 'scaler': engine.scaler, 'topics': engine.topics}, pickled_path)
+        
+        flat_path = os.path.join(directory, 'recommendation_model.joblib')
+        engine.save_model(flat_path)
+        
+        print(f"{n_workers} workers, forest trained on {n_rows} rows "
+              f"({os.path.getsize(pickled_path) / 2**20:.1f} MiB pickled, "
+              f"{os.path.getsize(flat_path) / 2**20:.1f} MiB flat)")
+        print(f"{'artifact':>16} {'cold start s':>13} {'RSS MiB':>8} {'PSS MiB':>8} {'private MiB':>12}")
+        
+        for label, path, mmap_mode in (("pickled forest", pickled_path, None),
+                                       ("flat + mmap", flat_path, 'r')):
+            stats = run_workers(path, mmap_mode, n_workers)
+            print(f"{label:>16} {stats['cold_start']:>13.3f} {stats['rss'] / 1024:>8.1f} "
+                  f"{stats['pss'] / 1024:>8.1f} {stats['private'] / 1024:>12.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
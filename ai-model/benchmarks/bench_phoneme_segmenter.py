@@ -0,0 +1,128 @@
+"""
+Equivalence check and benchmark for the shared phoneme segmenter
+
+Runs the previous character-walking _word_to_phonemes, _syllabify and
+_extract_phonetic_features next to the PhonemeSegmenter-based versions over
+the words of the 1000-entry dyslexia dataset. Syllables and phonetic
+features must be identical; phonemes may differ only where the segmenter
+now keeps "ng'" and "mb" together.
+
+Usage:
+    python benchmarks/bench_phoneme_segmenter.py [passes]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.phoneme_segmenter import PhonemeSegmenter
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', '..', 'nextjs-app', 'data',
+                       'dyslexia_dataset_1000.json')
+
+VOWELS = 'aeiou'
+CONSONANTS = 'bcdfghjklmnpqrstvwxyz'
+
+
+def reference_word_to_phonemes(word):
+    """KiswahiliPronunciationEvaluator._word_to_phonemes before the segmenter"""
+    word = word.lower()
+    phonemes = []
+    i = 0
+    while i < len(word):
+        if i < len(word) - 1:
+            digraph = word[i:i+2]
+            if digraph in ['ch', 'ng', 'ny', 'th']:
+                phonemes.append(digraph)
+                i += 2
+                continue
+        if word[i] in 'aeiou':
+            phonemes.append(word[i])
+        elif word[i] in 'bcdfghjklmnpqrstvwxyz':
+            phonemes.append(word[i])
+        i += 1
+    return phonemes
+
+
+def reference_syllabify(word):
+    """KiswahiliDataProcessor._syllabify before the segmenter"""
+    syllables = []
+    current_syllable = ""
+    for i, char in enumerate(word):
+        current_syllable += char
+        if char in VOWELS:
+            if i == len(word) - 1 or word[i + 1] in CONSONANTS:
+                syllables.append(current_syllable)
+                current_syllable = ""
+    if current_syllable:
+        syllables.append(current_syllable)
+    return syllables if syllables else [word]
+
+
+def reference_counts(word):
+    return (sum(1 for c in word if c in VOWELS), sum(1 for c in word if c in CONSONANTS))
+
+
+def load_words():
+    with open(DATASET, 'r', encoding='utf-8') as f:
+        return [entry['word'] for entry in json.load(f)]
+
+
+def check_equivalence(words):
+    segmenter = PhonemeSegmenter()
+    # Edge cases beyond the dataset: case, punctuation, vowel runs, no vowels
+    extra = ['', 'kiatu', 'Desemba', "ng'ombe", 'baba mdogo', 'tikiti-maji', 'mbwa', 'xyz', 'aa']
+    changed = set()
+    for word in words + extra:
+        segmentation = segmenter.segment(word)
+        assert list(segmentation.syllables) == reference_syllabify(word), word
+        assert (segmentation.vowel_count, segmentation.consonant_count) == reference_counts(word), word
+        if list(segmentation.phonemes) != reference_word_to_phonemes(word):
+            # Only the new units may change the split (ng' also keeps its apostrophe)
+            assert "ng'" in word.lower() or 'mb' in word.lower(), word
+            assert ''.join(segmentation.phonemes).replace("'", '') == ''.join(reference_word_to_phonemes(word)), word
+            changed.add(word)
+    return changed
+
+
+def time_pass(function, words, passes):
+    start = time.perf_counter()
+    for _ in range(passes):
+        for word in words:
+            function(word)
+    return (time.perf_counter() - start) / (passes * len(words)) * 1e6
+
+
+def main():
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    words = load_words()
+    
+    changed = check_equivalence(words)
+    print(f"{len(words)} dataset words ({len(set(words))} distinct): syllables and counts identical; "
+          f"phonemes now keep ng'/mb together in {len(changed)} words: {', '.join(sorted(changed))}")
+    
+    def reference_all(word):
+        reference_word_to_phonemes(word)
+        reference_syllabify(word)
+        reference_counts(word)
+    
+    cold = PhonemeSegmenter(cache_size=0)
+    warm = PhonemeSegmenter()
+    
+    print(f"\nPer-word cost, us ({passes} passes over the dataset):")
+    print(f"{'step':>26} {'reference':>10} {'uncached':>10} {'cached':>10}")
+    rows = [
+        ('phonemes', reference_word_to_phonemes, cold.phonemes, warm.phonemes),
+        ('syllables', reference_syllabify, cold.syllables, warm.syllables),
+        ('phonemes+syllables+counts', reference_all, cold.segment, warm.segment),
+    ]
+    for name, reference, uncached, cached in rows:
+        print(f"{name:>26} {time_pass(reference, words, passes):>10.2f} "
+              f"{time_pass(uncached, words, passes):>10.2f} {time_pass(cached, words, passes):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
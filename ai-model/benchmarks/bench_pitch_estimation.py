@@ -0,0 +1,74 @@
+"""
+Benchmark pitch estimation: librosa.piptrack vs band-limited peak picking
+
+Both methods of SpectralFeatureExtractor run on the same magnitude
+spectrogram. Checks that the 'peaks' method reports exactly the pitches
+piptrack does, then times the pitch step alone and full feature extraction
+for 1-5 second clips.
+
+Usage:
+    python benchmarks/bench_pitch_estimation.py [n_repeats]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.audio_features import SpectralFeatureExtractor
+from bench_pronunciation_audio import child_recording
+
+
+def median_ms(function, n_repeats):
+    timings = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000
+
+
+def main():
+    n_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = np.random.default_rng(5)
+    extractors = {method: SpectralFeatureExtractor(pitch_method=method)
+                  for method in SpectralFeatureExtractor.PITCH_METHODS}
+    
+    for sample_rate in (22050, 16000, 8000):
+        clips = [child_recording(2, sample_rate, rng),
+                 rng.normal(0, 0.1, sample_rate * 2),
+                 np.zeros(sample_rate, dtype=np.float32)]
+        for clip in clips:
+            magnitude = extractors['piptrack'].spectrogram(clip)
+            expected = extractors['piptrack'].pitches(magnitude, sample_rate)
+            actual = extractors['peaks'].pitches(magnitude, sample_rate)
+            assert np.array_equal(expected, actual), "peak picking differs from piptrack"
+            
+            expected = extractors['piptrack'].extract(clip, sample_rate)
+            actual = extractors['peaks'].extract(clip, sample_rate)
+            assert expected['pitch_mean'] == actual['pitch_mean']
+            assert expected['pitch_std'] == actual['pitch_std']
+    print("'peaks' reports exactly piptrack's pitches (8, 16 and 22.05 kHz)\n")
+    
+    sample_rate = 22050
+    print(f"{'secs':>5} {'piptrack ms':>12} {'peaks ms':>9} {'speedup':>8} "
+          f"{'extract/piptrack':>17} {'extract/peaks':>14}")
+    for duration in (1, 2, 3, 4, 5):
+        clip = child_recording(duration, sample_rate, rng)
+        magnitude = extractors['piptrack'].spectrogram(clip)
+        
+        pitch_ms = {method: median_ms(lambda: extractor.pitches(magnitude, sample_rate), n_repeats)
+                    for method, extractor in extractors.items()}
+        extract_ms = {method: median_ms(lambda: extractor.extract(clip, sample_rate), n_repeats)
+                      for method, extractor in extractors.items()}
+        
+        print(f"{duration:>5} {pitch_ms['piptrack']:>12.2f} {pitch_ms['peaks']:>9.2f} "
+              f"{pitch_ms['piptrack'] / pitch_ms['peaks']:>7.1f}x "
+              f"{extract_ms['piptrack']:>17.2f} {extract_ms['peaks']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark per-learner progress queries against the size of the session store
+
+Compares the previous full scan of ProgressTracker.sessions_data with the
+per-user start_time index for 10k / 100k / 1M recorded sessions.
+
+Usage:
+    python benchmarks/bench_progress_tracker.py [n_sessions ...]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.progress_tracker import ProgressTracker, LearningSession
+
+SESSIONS_PER_USER = 50
+QUERIES = 200
+
+
+def build_tracker(n_sessions: int) -> ProgressTracker:
+    """Record n_sessions spread over n_sessions / SESSIONS_PER_USER learners"""
+    rng = np.random.default_rng(42)
+    tracker = ProgressTracker()
+    n_users = max(1, n_sessions // SESSIONS_PER_USER)
+    now = datetime.now()
+    
+    offsets = np.sort(rng.uniform(0, 60 * 24 * 3600, n_sessions))[::-1]
+    users = rng.integers(0, n_users, n_sessions)
+    scores = rng.uniform(0.3, 1.0, (n_sessions, 3))
+    
+    for i in range(n_sessions):
+        start = now - timedelta(seconds=float(offsets[i]))
+        tracker.record_session(LearningSession(
+            session_id=f"s{i}",
+            user_id=f"user{users[i]}",
+            topic_id=int(i % 10) + 1,
+            start_time=start,
+            end_time=start + timedelta(minutes=12),
+            activities_completed=5,
+            total_activities=5,
+            accuracy_score=float(scores[i, 0]),
+            pronunciation_score=float(scores[i, 1]),
+            engagement_score=float(scores[i, 2]),
+            help_requests=0,
+            retry_attempts=0,
+            errors=[]
+        ))
+    
+    return tracker
+
+
+def scan_recent_sessions(tracker: ProgressTracker, user_id: str, days_back: int):
+    """Previous implementation: filter every recorded session"""
+    cutoff_date = datetime.now() - timedelta(days=days_back)
+    return [
+        session for session in tracker.sessions_data
+        if session.user_id == user_id and session.start_time >= cutoff_date
+    ]
+
+
+def indexed_recent_sessions(tracker: ProgressTracker, user_id: str, days_back: int):
+    """Current implementation: bisect into the per-user index"""
+    cutoff_date = datetime.now() - timedelta(days=days_back)
+    return tracker.get_user_sessions(user_id, since=cutoff_date)
+
+
+def time_queries(fn, tracker: ProgressTracker, user_ids) -> float:
+    """Mean milliseconds per query"""
+    start = time.perf_counter()
+    for user_id in user_ids:
+        fn(tracker, user_id, 30)
+    return (time.perf_counter() - start) * 1000 / len(user_ids)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    
+    print(f"{'sessions':>10} {'scan ms':>10} {'index ms':>10} {'report ms':>10} {'speedup':>9}")
+    
+    for n_sessions in sizes:
+        tracker = build_tracker(n_sessions)
+        user_ids = list(tracker.user_profiles.keys())[:QUERIES]
+        
+        # Sanity check: both paths select the same sessions
+        for user_id in user_ids[:10]:
+            scanned = sorted(s.session_id for s in scan_recent_sessions(tracker, user_id, 30))
+            indexed = sorted(s.session_id for s in indexed_recent_sessions(tracker, user_id, 30))
+            assert scanned == indexed, f"Index mismatch for {user_id}"
+        
+        scan_ms = time_queries(scan_recent_sessions, tracker, user_ids)
+        index_ms = time_queries(indexed_recent_sessions, tracker, user_ids)
+        
+        start = time.perf_counter()
+        for user_id in user_ids:
+            tracker.generate_progress_report(user_id, 30)
+        report_ms = (time.perf_counter() - start) * 1000 / len(user_ids)
+        
+        print(f"{n_sessions:>10} {scan_ms:>10.3f} {index_ms:>10.4f} {report_ms:>10.3f} {scan_ms / index_ms:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark end-to-end latency of pronunciation evaluation from real audio
+
+Posts synthetic 1-5 second child recordings (a voiced tone around 300 Hz with
+syllable-rate amplitude modulation and background noise) to
+/api/pronunciation/evaluate/audio as a multipart WAV upload, as a WAV request
+body and as streamed raw PCM, at the evaluator's rate and at 16 kHz (which
+needs resampling). Reports p50/p99 latency per duration, and how much of it
+is decoding.
+
+Usage:
+    python benchmarks/bench_pronunciation_audio.py [n_requests]
+"""
+
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import soundfile as sf
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+def child_recording(duration: float, sample_rate: int, rng) -> np.ndarray:
+    """A voiced, syllable-modulated tone with noise, as 16-bit range floats"""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    pitch = 300 + 25 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    audio = 0.2 * voice * syllables + rng.normal(0, 0.01, len(t))
+    return np.clip(audio, -1, 1).astype(np.float32)
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+def chunked(data: bytes, chunk_size: int = 4096):
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+def percentiles(timings):
+    timings = np.array(timings) * 1000
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main():
+    # Imported here so other benchmarks can reuse child_recording cheaply
+    from fastapi.testclient import TestClient
+    import app as app_module
+    
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    client = TestClient(app_module.app)
+    decoder = app_module.audio_decoder
+    rng = np.random.default_rng(11)
+    
+    uploads = {
+        "multipart wav": lambda wav, pcm, rate: client.post(
+            "/api/pronunciation/evaluate/audio",
+            data={"word": "jambo", "user_id": "bench"},
+            files={"audio": ("recording.wav", wav, "audio/wav")}),
+        "wav body": lambda wav, pcm, rate: client.post(
+            "/api/pronunciation/evaluate/audio?word=jambo&user_id=bench",
+            content=wav, headers={"Content-Type": "audio/wav"}),
+        "streamed pcm": lambda wav, pcm, rate: client.post(
+            f"/api/pronunciation/evaluate/audio?word=jambo&user_id=bench&sample_rate={rate}",
+            content=chunked(pcm), headers={"Content-Type": "audio/pcm"}),
+    }
+    
+    # The first evaluation pays librosa's one-off JIT compilation
+    warmup = child_recording(1, decoder.target_sample_rate, rng)
+    uploads["wav body"](encode_wav(warmup, decoder.target_sample_rate), None, None)
+    
+    print(f"{n_requests} requests per row, latency in ms")
+    print(f"{'rate':>6} {'secs':>5} {'upload':>14} {'p50':>8} {'p99':>8} {'decode p50':>11}")
+    
+    for sample_rate in (decoder.target_sample_rate, 16000):
+        for duration in (1, 2, 3, 4, 5):
+            audio = child_recording(duration, sample_rate, rng)
+            wav = encode_wav(audio, sample_rate)
+            pcm = (audio * 32767).astype('<i2').tobytes()
+            
+            decode_timings = []
+            for _ in range(n_requests):
+                start = time.perf_counter()
+                decoder.decode(wav)
+                decode_timings.append(time.perf_counter() - start)
+            decode_p50, _ = percentiles(decode_timings)
+            
+            for label, upload in uploads.items():
+                timings = []
+                for _ in range(n_requests):
+                    start = time.perf_counter()
+                    response = upload(wav, pcm, sample_rate)
+                    timings.append(time.perf_counter() - start)
+                    assert response.status_code == 200, response.text
+                
+                p50, p99 = percentiles(timings)
+                print(f"{sample_rate:>6} {duration:>5} {label:>14} {p50:>8.2f} {p99:>8.2f} {decode_p50:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
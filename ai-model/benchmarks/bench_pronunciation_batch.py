@@ -0,0 +1,79 @@
+"""
+Benchmark batch pronunciation scoring: one process vs a worker pool
+
+Scores a class of recordings (30 children, 1-5 seconds each) through
+KiswahiliInferenceEngine.evaluate_pronunciation_batch, serially and with
+pronunciation_workers set, and reports wall-clock time per batch. Worker
+start-up is timed separately since the pool is persistent.
+
+Usage:
+    python benchmarks/bench_pronunciation_batch.py [n_recordings] [n_batches]
+"""
+
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.dirname(__file__))
+
+from src.inference.inference_engine import KiswahiliInferenceEngine
+from bench_pronunciation_audio import child_recording
+
+WORDS = ['jambo', 'asante', 'rafiki', 'habari', 'karibu', 'simba', 'ndizi', 'chakula']
+
+
+def class_recordings(n_recordings: int, sample_rate: int = 22050):
+    rng = np.random.default_rng(9)
+    return [{
+        'request_id': f'child-{i}',
+        'word': WORDS[i % len(WORDS)],
+        'audio_data': child_recording(float(rng.uniform(1, 5)), sample_rate, rng),
+        'sample_rate': sample_rate
+    } for i in range(n_recordings)]
+
+
+def time_batches(engine, requests, n_batches: int) -> float:
+    timings = []
+    for _ in range(n_batches):
+        start = time.perf_counter()
+        results = engine.evaluate_pronunciation_batch(requests)
+        timings.append(time.perf_counter() - start)
+        
+        assert [r['request_id'] for r in results] == [r['request_id'] for r in requests]
+        assert not any('error' in r for r in results)
+    return float(np.median(timings))
+
+
+def main():
+    n_recordings = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    n_batches = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    requests = class_recordings(n_recordings)
+    audio_seconds = sum(len(r['audio_data']) for r in requests) / 22050
+    
+    print(f"{n_recordings} recordings ({audio_seconds:.0f} s of audio), {mp.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'start-up s':>11} {'batch s':>8} {'speedup':>8}")
+    
+    engine = KiswahiliInferenceEngine(model_dir=os.devnull)
+    engine.evaluate_pronunciation_batch(requests[:1])
+    serial = time_batches(engine, requests, n_batches)
+    print(f"{'serial':>8} {'-':>11} {serial:>8.3f} {1.0:>7.1f}x")
+    
+    for workers in sorted({2, 4, mp.cpu_count()}):
+        engine = KiswahiliInferenceEngine(model_dir=os.devnull, pronunciation_workers=workers)
+        start = time.perf_counter()
+        engine.pronunciation_pool.start()
+        startup = time.perf_counter() - start
+        
+        # One untimed batch so every worker has run the feature path once
+        engine.evaluate_pronunciation_batch(requests)
+        batch = time_batches(engine, requests, n_batches)
+        engine.close()
+        print(f"{workers:>8} {startup:>11.2f} {batch:>8.3f} {serial / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Reproducible benchmark of the pronunciation evaluator's public methods
+
+Times evaluate_pronunciation, get_practice_suggestions and
+create_pronunciation_report with a deterministic evaluator (and, for
+comparison, one driven by a seeded numpy Generator). Inputs are fixed and
+outputs are hashed; the script exits non-zero if two passes in one run give
+different digests, and two runs must print the same digests (the pytest
+suite in tests/test_pronunciation_evaluator.py asserts this, across
+processes too). Timings are the best of several repeats, which is what
+stays stable from run to run.
+
+Usage:
+    python benchmarks/bench_pronunciation_evaluator.py [repeats]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
+from bench_phoneme_segmenter import load_words
+from bench_pronunciation_audio import child_recording
+
+SAMPLE_RATE = 22050
+
+
+def digest(value) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=float).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def without_timings(result):
+    """Evaluation result without the measured (wall-clock) trim metadata"""
+    return {key: value for key, value in result.items() if key != 'metadata'}
+
+
+def run_workload(evaluator, words, clip, seed=None):
+    """One pass over every benchmarked method; returns the outputs"""
+    rng = np.random.default_rng(seed) if seed is not None else None
+    evaluations = [
+        without_timings(evaluator.evaluate_pronunciation(word, clip, SAMPLE_RATE, rng=rng))
+        for word in words
+    ]
+    suggestions = [evaluator.get_practice_suggestions(e['areas_for_improvement']) for e in evaluations]
+    report = evaluator.create_pronunciation_report(evaluations)
+    return evaluations, suggestions, report
+
+
+def best_ms(statement, repeats, number):
+    return min(timeit.repeat(statement, repeat=repeats, number=number)) / number * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    words = sorted(set(load_words()))[:20]
+    clip = child_recording(1.0, SAMPLE_RATE, np.random.default_rng(0))
+    
+    deterministic = KiswahiliPronunciationEvaluator(deterministic=True)
+    seeded = KiswahiliPronunciationEvaluator()
+    
+    print("Output digests (identical on every run):")
+    for name, evaluator, seed in [('deterministic', deterministic, None), ('seeded rng', seeded, 42)]:
+        first = run_workload(evaluator, words, clip, seed)
+        second = run_workload(evaluator, words, clip, seed)
+        if digest(first) != digest(second):
+            sys.exit(f"{name} outputs changed between runs: {digest(first)} != {digest(second)}")
+        print(f"  {name:>13}: evaluations {digest(first[0])}, suggestions {digest(first[1])}, "
+              f"report {digest(first[2])}")
+    
+    evaluations, _, _ = run_workload(deterministic, words, clip)
+    problems = sorted({area for e in evaluations for area in e['areas_for_improvement']}) or ['ng', 'mb', 'ny']
+    
+    cases = [
+        ('evaluate_pronunciation', lambda: deterministic.evaluate_pronunciation(words[0], clip, SAMPLE_RATE), 20),
+        ('get_practice_suggestions', lambda: deterministic.get_practice_suggestions(problems), 2000),
+        ('create_pronunciation_report', lambda: deterministic.create_pronunciation_report(evaluations), 2000),
+    ]
+    print(f"\nBest of {repeats} repeats, ms per call:")
+    for name, statement, number in cases:
+        print(f"  {name:>28}: {best_ms(statement, repeats, number):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Equivalence check and benchmark for the precomputed pronunciation references
+
+Builds the reference table for the dyslexia dataset vocabulary, saves and
+reloads it, and checks that evaluations with the table match evaluations
+without it exactly (same random seed). Then times the request-time work
+outside feature extraction (word analysis, scoring, feedback and practice
+suggestions) with and without the table.
+
+Usage:
+    python benchmarks/bench_pronunciation_reference.py [passes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
+from models.pronunciation_reference import PronunciationReferenceTable, load_vocabulary
+from bench_phoneme_segmenter import DATASET, load_words
+from bench_pronunciation_audio import child_recording
+from bench_pronunciation_evaluator import without_timings
+
+
+def score_requests(evaluator, words, features):
+    results = []
+    for word in words:
+        result = evaluator._evaluate_features(word, features)
+        result['practice_suggestions'] = evaluator.get_practice_suggestions(result['areas_for_improvement'])
+        results.append(result)
+    return results
+
+
+def main():
+    passes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    words = load_words()
+    
+    plain = KiswahiliPronunciationEvaluator()
+    table = plain.build_reference_table(load_vocabulary([DATASET]))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'pronunciation_reference.json')
+        table.save(path)
+        size = os.path.getsize(path)
+        referenced = KiswahiliPronunciationEvaluator(reference_table=PronunciationReferenceTable.load(path))
+    print(f"Reference table: {len(table)} words, {len(table.phonemes)} phonemes, {size} bytes")
+    
+    rng = np.random.default_rng(3)
+    audio = child_recording(1.0, 22050, rng)
+    features = plain._extract_audio_features(audio, 22050)
+    
+    np.random.seed(11)
+    expected = score_requests(plain, words, features)
+    np.random.seed(11)
+    actual = score_requests(referenced, words, features)
+    assert actual == expected, "Evaluations differ with the reference table"
+    np.random.seed(11)
+    expected = without_timings(plain.evaluate_pronunciation(words[0], audio))
+    np.random.seed(11)
+    assert without_timings(referenced.evaluate_pronunciation(words[0], audio)) == expected
+    print(f"{len(words)} dataset evaluations identical with and without the table")
+    
+    # Uncached segmentation shows the full per-request word analysis
+    plain.segmenter.cache_clear()
+    timings = {}
+    for name, evaluator in [('per request', plain), ('reference table', referenced)]:
+        start = time.perf_counter()
+        for _ in range(passes):
+            if evaluator is plain:
+                plain.segmenter.cache_clear()
+            score_requests(evaluator, words, features)
+        timings[name] = (time.perf_counter() - start) / (passes * len(words)) * 1e6
+    
+    start = time.perf_counter()
+    for _ in range(5):
+        plain._extract_audio_features(audio, 22050)
+    extraction = (time.perf_counter() - start) / 5 * 1e6
+    
+    print(f"\nNon-audio work per evaluation, us ({passes} passes over the dataset):")
+    for name, value in timings.items():
+        print(f"{name:>16} {value:>8.1f}")
+    print(f"(feature extraction of a 1 s clip: {extraction:.0f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark batched next-topic recommendations
+
+Trains the recommendation model on synthetic learners, then compares
+calling predict_next_topic once per learner against a single
+predict_next_topic_batch call, checking that both return the same
+recommendations.
+
+Usage:
+    python benchmarks/bench_recommendation_batch.py [n_learners ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.recommendation_engine import LearningRecommendationEngine
+
+
+def generate_learners(n_learners: int, seed: int = 3):
+    """Synthetic learner dicts with partially completed curricula"""
+    rng = np.random.default_rng(seed)
+    learners = []
+    
+    for i in range(n_learners):
+        n_completed = int(rng.integers(0, 11))
+        completed = sorted(int(t) for t in rng.choice(np.arange(1, 11), n_completed, replace=False))
+        learners.append({
+            'user_id': f"learner{i}",
+            'overall_accuracy': float(rng.uniform(0.2, 1.0)),
+            'avg_response_time': float(rng.uniform(1.0, 20.0)),
+            'completion_rate': float(rng.uniform(0.2, 1.0)),
+            'phonetic_errors': int(rng.integers(0, 10)),
+            'visual_confusion_errors': int(rng.integers(0, 6)),
+            'sequence_errors': int(rng.integers(0, 6)),
+            'session_duration': float(rng.uniform(5.0, 40.0)),
+            'retry_attempts': int(rng.integers(0, 8)),
+            'help_requests': int(rng.integers(0, 5)),
+            'topic_scores': {str(t): float(rng.uniform(0.3, 1.0)) for t in completed},
+            'completed_topics': completed
+        })
+    return learners
+
+
+def train_engine() -> LearningRecommendationEngine:
+    engine = LearningRecommendationEngine()
+    learners = generate_learners(2000, seed=17)
+    X = engine.extract_features_batch(learners)
+    y = np.random.default_rng(17).integers(1, 11, len(learners))
+    
+    engine.scaler.fit(X)
+    engine.model.fit(engine.scaler.transform(X), y)
+    engine.is_trained = True
+    return engine
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+    engine = train_engine()
+    
+    print(f"{'learners':>9} {'loop s':>8} {'batch s':>8} {'frame s':>8} {'speedup':>8}")
+    
+    for n_learners in sizes:
+        learners = generate_learners(n_learners)
+        
+        start = time.perf_counter()
+        expected = [engine.predict_next_topic(learner) for learner in learners]
+        loop_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        batch = engine.predict_next_topic_batch(learners)
+        batch_time = time.perf_counter() - start
+        
+        frame = pd.DataFrame(learners)
+        start = time.perf_counter()
+        from_frame = engine.predict_next_topic_batch(frame)
+        frame_time = time.perf_counter() - start
+        
+        assert batch == expected, "batch recommendations differ from predict_next_topic"
+        assert from_frame == expected, "DataFrame recommendations differ from predict_next_topic"
+        
+        print(f"{n_learners:>9} {loop_time:>8.2f} {batch_time:>8.3f} {frame_time:>8.3f} "
+              f"{loop_time / batch_time:>7.0f}x")
+    
+    # Untrained engines fall back to curriculum order for every learner
+    untrained = LearningRecommendationEngine()
+    learners = generate_learners(500)
+    assert untrained.predict_next_topic_batch(learners) == [
+        untrained.predict_next_topic(learner) for learner in learners
+    ]
+
+
+if __name__ == "__main__":
+    main()
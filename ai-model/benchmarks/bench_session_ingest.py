@@ -0,0 +1,116 @@
+"""
+Benchmark session ingestion throughput through the API
+
+Compares posting sessions one at a time to /api/session/record against
+posting them in bursts to /api/session/record/batch (JSON array and NDJSON),
+for both the in-memory tracker and one backed by the durable session log.
+
+Usage:
+    python benchmarks/bench_session_ingest.py [n_sessions] [batch_size]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import app as app_module
+from models.progress_tracker import ProgressTracker
+
+
+def generate_payloads(n_sessions: int):
+    """Session request bodies from an offline classroom tablet's backlog"""
+    rng = np.random.default_rng(5)
+    start = datetime(2025, 3, 1, 8, 0)
+    payloads = []
+    
+    for i in range(n_sessions):
+        session_start = start + timedelta(minutes=int(rng.integers(0, 60 * 24 * 14)))
+        payloads.append({
+            "session_id": f"session-{i}",
+            "user_id": f"learner{int(rng.integers(0, 30))}",
+            "topic_id": int(rng.integers(1, 11)),
+            "start_time": session_start.isoformat(),
+            "end_time": (session_start + timedelta(minutes=12)).isoformat(),
+            "activities_completed": int(rng.integers(2, 6)),
+            "total_activities": 5,
+            "accuracy_score": float(rng.uniform(0.3, 1.0)),
+            "pronunciation_score": float(rng.uniform(0.3, 1.0)),
+            "engagement_score": float(rng.uniform(0.3, 1.0)),
+            "errors": [{"type": "phoneme_errors"}]
+        })
+    return payloads
+
+
+def run_single(client: TestClient, payloads) -> float:
+    start = time.perf_counter()
+    for payload in payloads:
+        response = client.post("/api/session/record", json=payload)
+        assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+def run_batch(client: TestClient, payloads, batch_size: int, ndjson: bool) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(payloads), batch_size):
+        chunk = payloads[offset:offset + batch_size]
+        if ndjson:
+            body = "\n".join(json.dumps(payload) for payload in chunk)
+            headers = {"Content-Type": "application/x-ndjson"}
+        else:
+            body = json.dumps(chunk)
+            headers = {"Content-Type": "application/json"}
+        response = client.post("/api/session/record/batch", content=body, headers=headers)
+        assert response.status_code == 200 and response.json()["recorded"] == len(chunk)
+    return time.perf_counter() - start
+
+
+def measure(payloads, batch_size: int, storage_dir):
+    """Sessions/second for each ingestion path against a fresh tracker"""
+    client = TestClient(app_module.app)
+    modes = [
+        ("single", lambda: run_single(client, payloads)),
+        ("batch json", lambda: run_batch(client, payloads, batch_size, ndjson=False)),
+        ("batch ndjson", lambda: run_batch(client, payloads, batch_size, ndjson=True)),
+    ]
+    
+    rates = {}
+    for name, run in modes:
+        directory = tempfile.mkdtemp(prefix="kiswahili-ingest-") if storage_dir else None
+        try:
+            app_module.progress_tracker = ProgressTracker(storage_dir=directory)
+            rates[name] = len(payloads) / run()
+            assert len(app_module.progress_tracker.sessions_data) == len(payloads)
+        finally:
+            if directory:
+                app_module.progress_tracker._log.close()
+                shutil.rmtree(directory, ignore_errors=True)
+    return rates
+
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    payloads = generate_payloads(n_sessions)
+    
+    print(f"{n_sessions} sessions, batches of {batch_size}")
+    print(f"{'tracker':>10} {'single/s':>10} {'json/s':>10} {'ndjson/s':>10} {'speedup':>8}")
+    
+    for label, storage_dir in (("memory", False), ("log", True)):
+        rates = measure(payloads, batch_size, storage_dir)
+        speedup = rates["batch json"] / rates["single"]
+        print(f"{label:>10} {rates['single']:>10.0f} {rates['batch json']:>10.0f} "
+              f"{rates['batch ndjson']:>10.0f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure memory held per recorded learning session
+
+Compares a list of LearningSession dataclasses (plus the per-session
+performance_history dict ProgressTracker used to keep) with the columnar
+session store now backing ProgressTracker.
+
+Usage:
+    python benchmarks/bench_session_memory.py [n_sessions]
+"""
+
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.progress_tracker import ProgressTracker, LearningSession
+
+ERROR_TYPES = ['phoneme_errors', 'sound_confusion', 'letter_reversal', 'word_recognition', 'sequence_errors']
+
+
+def generate_sessions(n_sessions: int):
+    """Yield realistic sessions for ~n_sessions / 50 learners"""
+    rng = np.random.default_rng(7)
+    start = datetime(2025, 1, 1)
+    n_users = max(1, n_sessions // 50)
+    
+    for i in range(n_sessions):
+        session_start = start + timedelta(minutes=int(i))
+        yield LearningSession(
+            session_id=str(uuid.UUID(int=int(rng.integers(0, 2**62)))),
+            user_id=f"user_{int(rng.integers(0, n_users)):06d}",
+            topic_id=int(rng.integers(1, 11)),
+            start_time=session_start,
+            end_time=session_start + timedelta(minutes=int(rng.integers(5, 25))),
+            activities_completed=int(rng.integers(3, 6)),
+            total_activities=5,
+            accuracy_score=float(rng.uniform(0.3, 1.0)),
+            pronunciation_score=float(rng.uniform(0.3, 1.0)),
+            engagement_score=float(rng.uniform(0.3, 1.0)),
+            help_requests=int(rng.integers(0, 4)),
+            retry_attempts=int(rng.integers(0, 4)),
+            errors=[{'type': ERROR_TYPES[int(k)]} for k in rng.integers(0, 5, int(rng.integers(0, 4)))]
+        )
+
+
+def measure(build) -> int:
+    """Bytes still allocated by the object returned from build()"""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    allocated = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return allocated
+
+
+def build_dataclass_list(n_sessions: int):
+    """What ProgressTracker used to hold: dataclasses plus history dicts"""
+    sessions = []
+    history = []
+    for session in generate_sessions(n_sessions):
+        sessions.append(session)
+        history.append({
+            'date': session.end_time,
+            'topic_id': session.topic_id,
+            'accuracy': session.accuracy_score,
+            'pronunciation': session.pronunciation_score,
+            'engagement': session.engagement_score
+        })
+    return sessions, history
+
+
+def build_columnar_tracker(n_sessions: int):
+    """Current ProgressTracker with columnar storage"""
+    tracker = ProgressTracker()
+    for session in generate_sessions(n_sessions):
+        tracker.record_session(session)
+    return tracker
+
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    
+    before = measure(lambda: build_dataclass_list(n_sessions))
+    store_only = measure(lambda: build_columnar_tracker(n_sessions).sessions_data)
+    tracker = measure(lambda: build_columnar_tracker(n_sessions))
+    
+    print(f"Sessions: {n_sessions}")
+    print(f"Dataclass list + history dicts: {before / n_sessions:8.1f} bytes/session")
+    print(f"Columnar session store:         {store_only / n_sessions:8.1f} bytes/session")
+    print(f"Whole ProgressTracker:          {tracker / n_sessions:8.1f} bytes/session")
+
+
+if __name__ == "__main__":
+    main()
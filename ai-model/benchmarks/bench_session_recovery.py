@@ -0,0 +1,96 @@
+"""
+Benchmark ProgressTracker restart time with a durable session log
+
+Compares reloading from the latest snapshot (memory-mapped column files)
+against replaying every record of the SQLite session log.
+
+Usage:
+    python benchmarks/bench_session_recovery.py [n_sessions ...]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.progress_tracker import ProgressTracker, LearningSession
+
+BATCH_SIZE = 10_000
+
+
+def generate_sessions(n_sessions: int):
+    """Yield chronologically ordered sessions for ~n_sessions / 50 learners"""
+    rng = np.random.default_rng(11)
+    start = datetime(2025, 1, 1)
+    n_users = max(1, n_sessions // 50)
+    
+    for i in range(n_sessions):
+        session_start = start + timedelta(minutes=int(i))
+        yield LearningSession(
+            session_id=f"session-{i}",
+            user_id=f"user{int(rng.integers(0, n_users))}",
+            topic_id=int(rng.integers(1, 11)),
+            start_time=session_start,
+            end_time=session_start + timedelta(minutes=15),
+            activities_completed=5,
+            total_activities=5,
+            accuracy_score=float(rng.uniform(0.3, 1.0)),
+            pronunciation_score=float(rng.uniform(0.3, 1.0)),
+            engagement_score=float(rng.uniform(0.3, 1.0)),
+            help_requests=0,
+            retry_attempts=0,
+            errors=[{'type': 'phoneme_errors'}]
+        )
+
+
+def populate(storage_dir: str, n_sessions: int):
+    """Write n_sessions to the log in batches and snapshot the result"""
+    tracker = ProgressTracker(storage_dir=storage_dir, snapshot_interval=n_sessions + 1)
+    batch = []
+    for session in generate_sessions(n_sessions):
+        batch.append(session)
+        if len(batch) == BATCH_SIZE:
+            tracker._log.append(batch)
+            batch = []
+    if batch:
+        tracker._log.append(batch)
+    tracker.sync_from_log()
+    tracker.save_snapshot()
+
+
+def time_restart(storage_dir: str, n_sessions: int) -> float:
+    start = time.perf_counter()
+    tracker = ProgressTracker(storage_dir=storage_dir, snapshot_interval=n_sessions + 1)
+    elapsed = time.perf_counter() - start
+    assert len(tracker.sessions_data) == n_sessions
+    return elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    
+    print(f"{'sessions':>10} {'snapshot s':>11} {'replay s':>10}")
+    
+    for n_sessions in sizes:
+        storage_dir = tempfile.mkdtemp(prefix="kiswahili-sessions-")
+        try:
+            populate(storage_dir, n_sessions)
+            snapshot_time = time_restart(storage_dir, n_sessions)
+            
+            # Drop the snapshot so the restart has to replay the whole log
+            shutil.rmtree(os.path.join(storage_dir, 'snapshots'))
+            replay_time = time_restart(storage_dir, n_sessions)
+            
+            print(f"{n_sessions:>10} {snapshot_time:>11.2f} {replay_time:>10.2f}")
+        finally:
+            shutil.rmtree(storage_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
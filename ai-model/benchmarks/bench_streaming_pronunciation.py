@@ -0,0 +1,83 @@
+"""
+Benchmark incremental pronunciation feedback against re-analysing the buffer
+
+Streams synthetic child recordings in 20 ms PCM chunks through a
+StreamingPronunciationSession and, for comparison, re-extracts features from
+everything received so far on every chunk (what a request/response client
+polling for feedback would cost). Reports per-chunk latency percentiles and
+how far the streamed features end up from a whole-clip analysis.
+
+Usage:
+    python benchmarks/bench_streaming_pronunciation.py [seconds]
+"""
+
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
+from inference.streaming_pronunciation import StreamingPronunciationSession
+from bench_pronunciation_audio import child_recording, percentiles
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 0.02
+
+
+def pcm_chunks(audio):
+    pcm = (np.clip(audio, -1, 1) * 32767).astype('<i2').tobytes()
+    size = int(CHUNK_SECONDS * SAMPLE_RATE) * 2
+    return [pcm[start:start + size] for start in range(0, len(pcm), size)]
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    rng = np.random.default_rng(9)
+    audio = child_recording(seconds, SAMPLE_RATE, rng)
+    chunks = pcm_chunks(audio)
+    evaluator = KiswahiliPronunciationEvaluator()
+    evaluator.feature_extractor.extract(audio[:SAMPLE_RATE], SAMPLE_RATE)
+    
+    session = StreamingPronunciationSession(evaluator, 'kitabu', SAMPLE_RATE)
+    streaming, first_feedback = [], None
+    for index, chunk in enumerate(chunks):
+        start = time.perf_counter()
+        update = session.push_pcm(chunk)
+        streaming.append(time.perf_counter() - start)
+        if first_feedback is None and update and update['phoneme_scores']:
+            first_feedback = (index + 1) * CHUNK_SECONDS
+    result = session.finish()
+    
+    # The first chunks are shorter than one FFT window
+    warnings.filterwarnings('ignore', message='n_fft=')
+    received = np.empty(0, dtype=np.float32)
+    reanalysis = []
+    for chunk in chunks:
+        start = time.perf_counter()
+        samples = np.frombuffer(chunk, dtype='<i2').astype(np.float32) / 32768
+        received = np.concatenate([received, samples])
+        evaluator.feature_extractor.extract(received, SAMPLE_RATE)
+        reanalysis.append(time.perf_counter() - start)
+    
+    print(f"{seconds:g} s utterance in {len(chunks)} chunks of {CHUNK_SECONDS * 1000:.0f} ms:")
+    print(f"{'approach':>12} {'p50 ms':>8} {'p99 ms':>8} {'last ms':>8} {'total ms':>9}")
+    for name, timings in [('streaming', streaming), ('re-analysis', reanalysis)]:
+        p50, p99 = percentiles(timings)
+        print(f"{name:>12} {p50:>8.3f} {p99:>8.3f} {timings[-1] * 1000:>8.3f} {sum(timings) * 1000:>9.1f}")
+    print(f"First phoneme feedback after {first_feedback:.2f} s of audio")
+    
+    whole = evaluator.feature_extractor.extract(received, SAMPLE_RATE)
+    streamed = result['features']
+    print("\nStreamed vs whole-clip features:")
+    for key in ('spectral_centroid_mean', 'pitch_mean', 'energy'):
+        print(f"  {key:>24}: {streamed[key]:10.2f} vs {float(whole[key]):10.2f}")
+    mfcc_gap = np.max(np.abs(np.array(streamed['mfcc_mean']) - whole['mfcc_mean']))
+    print(f"  {'mfcc_mean max abs diff':>24}: {mfcc_gap:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
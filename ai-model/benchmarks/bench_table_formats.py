@@ -0,0 +1,158 @@
+"""
+Benchmark CSV, Parquet and Arrow IPC through the processing-to-training chain
+
+Runs process_vocabulary_dataset, process_user_interaction_data,
+create_training_dataset and KiswahiliModelTrainer.prepare_training_data
+with every file in each format, plus an audio feature table shaped like
+process_audio_data's output. Checks the training tables and the trainer's
+feature and label arrays are identical across formats, and that
+process_audio_data stores MFCC vectors as fixed-size list columns with the
+values the CSV holds as text. Then reports seconds per stage, the time to
+load the audio features back into arrays, and file sizes.
+
+Usage:
+    python benchmarks/bench_table_formats.py [n_words] [n_interactions] [n_audio]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.audio_corpus import FEATURE_NAMES, N_MFCC, VECTOR_FEATURES
+from preprocessing.data_processor import KiswahiliDataProcessor
+from preprocessing.record_stream import iter_json_records
+from preprocessing.table_io import read_table, write_table
+from training.model_trainer import KiswahiliModelTrainer
+from bench_audio_corpus import write_corpus
+from bench_chunked_processing import write_interactions
+from bench_vocabulary_processing import load_entries
+
+FORMATS = ('csv', 'parquet', 'arrow')
+
+
+def build_raw_vocabulary(n_words, rng) -> pd.DataFrame:
+    """Compound words with topics, so the training join has work to do"""
+    entries = load_entries()
+    words = np.array([word for word, _ in entries], dtype=object)
+    categories = np.array([category for _, category in entries], dtype=object)
+    picks = rng.integers(0, len(entries), n_words)
+    return pd.DataFrame({
+        'kiswahili': words[picks] + '-' + words[rng.integers(0, len(entries), n_words)],
+        'english': 'word',
+        'category': categories[picks],
+        'topic_id': rng.integers(1, 12, n_words)
+    })
+
+
+def build_audio_features(words, n_audio, rng) -> pd.DataFrame:
+    """A table like process_audio_data writes, for recordings of some of the words"""
+    named = np.asarray(words, dtype=object)[rng.integers(0, len(words), n_audio)]
+    features = {'filename': named + '_child' + rng.integers(1, 30, n_audio).astype(str) + '.wav'}
+    for name in FEATURE_NAMES:
+        if name in VECTOR_FEATURES:
+            features[name] = rng.normal(0, 20, (n_audio, N_MFCC)).tolist()
+        else:
+            features[name] = rng.random(n_audio) * 1000
+    return pd.DataFrame(features)
+
+
+def load_audio_vectors(path) -> np.ndarray:
+    """MFCC means of every recording as a 2-D array"""
+    column = read_table(path, columns=['mfcc_mean'])['mfcc_mean']
+    if path.endswith('.csv'):
+        return np.array([json.loads(vector) for vector in column])
+    return np.stack(column.to_numpy())
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def check_audio_columns(directory, processor):
+    """process_audio_data on a few recordings: vectors are fixed-size lists equal to the CSV text"""
+    corpus_dir = os.path.join(directory, 'corpus')
+    os.makedirs(corpus_dir)
+    write_corpus(corpus_dir, 20, np.random.default_rng(25))
+    expected = None
+    for file_format in FORMATS:
+        path = os.path.join(directory, f"audio_features.{file_format}")
+        processor.process_audio_data(corpus_dir, path, max_workers=1)
+        if file_format != 'csv':
+            if file_format == 'parquet':
+                schema = pq.read_schema(path)
+            else:
+                with pa.memory_map(path, 'r') as source:
+                    schema = pa.ipc.open_file(source).schema
+            for name in VECTOR_FEATURES:
+                assert schema.field(name).type == pa.list_(pa.float64(), N_MFCC), schema
+        vectors = load_audio_vectors(path)
+        assert expected is None or np.array_equal(vectors, expected), f"{file_format}: MFCC vectors differ"
+        expected = vectors
+
+
+def main():
+    n_words = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_interactions = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    n_audio = int(sys.argv[3]) if len(sys.argv) > 3 else 50000
+    rng = np.random.default_rng(25)
+    processor = KiswahiliDataProcessor()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        check_audio_columns(directory, processor)
+        print("process_audio_data: MFCC vectors stored as fixed-size lists, equal to the CSV values")
+        
+        raw_vocab = os.path.join(directory, 'raw_vocab.csv')
+        raw_interactions = os.path.join(directory, 'interactions.ndjson')
+        vocabulary = build_raw_vocabulary(n_words, rng)
+        vocabulary.to_csv(raw_vocab, index=False)
+        write_interactions(raw_interactions, n_interactions, rng, ndjson=True)
+        audio_features = build_audio_features(vocabulary['kiswahili'].str.lower().unique(), n_audio, rng)
+        
+        timings, sizes, outputs = {}, {}, {}
+        for file_format in FORMATS:
+            paths = {name: os.path.join(directory, f"{name}.{file_format}")
+                     for name in ('vocab', 'interactions', 'audio', 'training')}
+            stages = {}
+            _, stages['vocabulary'] = timed(processor.process_vocabulary_dataset, raw_vocab, paths['vocab'])
+            _, stages['interactions'] = timed(processor.process_user_interaction_data,
+                                              iter_json_records(raw_interactions), paths['interactions'])
+            _, stages['write audio'] = timed(write_table, audio_features, paths['audio'],
+                                             list_sizes={name: N_MFCC for name in VECTOR_FEATURES})
+            _, stages['training set'] = timed(processor.create_training_dataset, paths['vocab'], paths['audio'],
+                                              paths['interactions'], paths['training'])
+            (X, y), stages['prepare'] = timed(KiswahiliModelTrainer().prepare_training_data, paths['training'])
+            _, stages['load MFCCs'] = timed(load_audio_vectors, paths['audio'])
+            
+            timings[file_format] = stages
+            sizes[file_format] = {name: os.path.getsize(path) / 1e6 for name, path in paths.items()}
+            outputs[file_format] = (read_table(paths['training']), X, y)
+        
+        expected_table, expected_X, expected_y = outputs['csv']
+        for file_format in FORMATS[1:]:
+            table, X, y = outputs[file_format]
+            pd.testing.assert_frame_equal(expected_table, table)
+            assert np.array_equal(expected_X, X) and np.array_equal(expected_y, y), f"{file_format}: arrays differ"
+        print(f"Training tables and prepared arrays identical across {', '.join(FORMATS)}")
+        
+        print(f"\n{n_words} words, {n_interactions} interactions, {n_audio} audio rows")
+        print(f"{'seconds':>14}" + ''.join(f"{file_format:>10}" for file_format in FORMATS))
+        for stage in timings['csv']:
+            print(f"{stage:>14}" + ''.join(f"{timings[file_format][stage]:>10.3f}" for file_format in FORMATS))
+        print(f"{'MB':>14}" + ''.join(f"{file_format:>10}" for file_format in FORMATS))
+        for name in sizes['csv']:
+            print(f"{name:>14}" + ''.join(f"{sizes[file_format][name]:>10.1f}" for file_format in FORMATS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark for create_training_dataset
+
+Builds synthetic processed vocabulary, audio feature and interaction CSVs
+(filenames like kitabu_child3_2.wav, words that are substrings of other
+words, uncleaned words, missing values, tied error modes) and times the
+previous per-word scan next to the keyed joins as the tables grow.
+tests/test_training_dataset.py checks that both give the same training
+CSV.
+
+Usage:
+    python benchmarks/bench_training_dataset.py [scales]
+    
+    scales is a comma-separated list of multipliers for 1000 vocabulary
+    words, 5000 audio files and 20000 interactions (default 1,4)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.data_processor import KiswahiliDataProcessor
+from bench_phoneme_segmenter import load_words
+
+ERROR_TYPES = ['none', 'phonetic', 'visual_confusion', 'sequence']
+
+
+def reference_create_training_dataset(vocab_file, audio_features_file, interaction_file, output_file):
+    """KiswahiliDataProcessor.create_training_dataset before the keyed joins"""
+    vocab_df = pd.read_csv(vocab_file)
+    audio_df = pd.read_csv(audio_features_file)
+    interaction_df = pd.read_csv(interaction_file)
+    training_data = []
+    for _, vocab_row in vocab_df.iterrows():
+        word = vocab_row['kiswahili']
+        audio_features = audio_df[audio_df['filename'].str.contains(word, na=False)]
+        user_interactions = interaction_df[interaction_df['topic_id'] == vocab_row.get('topic_id', 0)]
+        training_data.append({
+            'word': word,
+            'difficulty': vocab_row['difficulty'],
+            'category': vocab_row['category'],
+            'phonetic_complexity': vocab_row['phonetic_complexity'],
+            'syllable_count': vocab_row['syllable_count'],
+            'word_length': vocab_row['word_length'],
+            'has_audio': len(audio_features) > 0,
+            'user_success_rate': user_interactions['accuracy'].mean() if not user_interactions.empty else 0.5,
+            'avg_response_time': user_interactions['response_time'].mean() if not user_interactions.empty else 0.0,
+            'common_errors': user_interactions['error_type'].mode().iloc[0] if not user_interactions.empty else 'none'
+        })
+    pd.DataFrame(training_data).to_csv(output_file, index=False)
+
+
+def build_tables(scale, rng, with_topics):
+    dataset_words = sorted(set(load_words()))
+    n_words, n_audio, n_interactions = 1000 * scale, 5000 * scale, 20000 * scale
+    
+    # Compounds keep the vocabulary growing with the scale; a few words
+    # fall back to pattern matching ("mama." matches any character after mama)
+    words = np.array(dataset_words, dtype=object)[rng.integers(0, len(dataset_words), n_words)]
+    compound = rng.random(n_words) < 0.5
+    words[compound] = words[compound] + '-' + np.array(dataset_words, dtype=object)[rng.integers(0, len(dataset_words), compound.sum())]
+    words[:4] = ["ng'ombe", 'mama.', 'ma', 'a+b']
+    vocab = pd.DataFrame({
+        'kiswahili': words,
+        'english': 'word',
+        'category': rng.choice(['animals', 'family', 'numbers', 'food'], n_words),
+        'difficulty': rng.integers(1, 4, n_words),
+        'syllable_count': rng.integers(1, 6, n_words),
+        'phonetic_complexity': rng.random(n_words).round(3),
+        'word_length': [len(word) for word in words],
+    })
+    if with_topics:
+        topics = rng.integers(0, 40, n_words).astype(float)
+        topics[rng.random(n_words) < 0.05] = np.nan
+        vocab['topic_id'] = topics
+    
+    # Audio for about two thirds of the words, under several naming schemes
+    speakers = rng.integers(1, 30, n_audio)
+    named = words[rng.integers(0, n_words, n_audio)]
+    distinct = sorted(set(words))
+    with_audio = set(np.array(distinct, dtype=object)[rng.random(len(distinct)) < 2 / 3])
+    recorded = np.array([word in with_audio for word in named])
+    schemes = rng.integers(0, 4, n_audio)
+    filenames = np.where(schemes == 0, 'child' + speakers.astype(str) + '-' + named.astype(str) + '.wav',
+                         named.astype(str) + '_child' + speakers.astype(str) + '_' + schemes.astype(str) + '.wav')
+    filenames = np.where(recorded, filenames, 'silence_' + speakers.astype(str) + '.wav').astype(object)
+    filenames[rng.random(n_audio) < 0.01] = None
+    audio = pd.DataFrame({'filename': filenames, 'duration': rng.uniform(0.5, 2.0, n_audio).round(3)})
+    
+    accuracy = rng.random(n_interactions).round(3)
+    accuracy[rng.random(n_interactions) < 0.02] = np.nan
+    interactions = pd.DataFrame({
+        'user_id': 'user_' + rng.integers(0, 500, n_interactions).astype(str),
+        'topic_id': rng.integers(0, 30, n_interactions),
+        'accuracy': accuracy,
+        'response_time': rng.gamma(2.0, 1.5, n_interactions).round(2),
+        'error_type': rng.choice(ERROR_TYPES, n_interactions),
+    })
+    return vocab, audio, interactions
+
+
+def write_tables(directory, tables):
+    paths = [os.path.join(directory, name) for name in ('vocab.csv', 'audio.csv', 'interactions.csv')]
+    for table, path in zip(tables, paths):
+        table.to_csv(path, index=False)
+    return paths
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    scales = [int(scale) for scale in sys.argv[1].split(',')] if len(sys.argv) > 1 else [1, 4]
+    rng = np.random.default_rng(23)
+    processor = KiswahiliDataProcessor()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        expected, actual = os.path.join(directory, 'expected.csv'), os.path.join(directory, 'actual.csv')
+        
+        print(f"{'words':>7} {'audio':>7} {'interactions':>13} {'per-word scan s':>16} {'keyed joins s':>14} {'speedup':>8}")
+        for scale in scales:
+            vocab, audio, interactions = tables = build_tables(scale, rng, with_topics=True)
+            paths = write_tables(directory, tables)
+            reference = timed(reference_create_training_dataset, *paths, expected)
+            keyed = timed(processor.create_training_dataset, *paths, actual)
+            print(f"{len(vocab):>7} {len(audio):>7} {len(interactions):>13} {reference:>16.2f} {keyed:>14.3f} "
+                  f"{reference / keyed:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Equivalence check and benchmark for column-wise vocabulary processing
+
+Builds raw vocabulary CSVs from the words of the 1000-entry dyslexia dataset,
+with the noise real spreadsheets have (capitals, punctuation, apostrophes,
+extra whitespace, accents, digits, blank and missing cells), and processes
+them with the previous iterrows loop over _process_single_word and with
+process_vocabulary_dataset. The output CSVs must be byte-for-byte identical.
+
+Timings cover a vocabulary that repeats the dataset's words (the column-wise
+path processes each distinct word pair once) and one where nearly every row
+is a distinct compound word.
+
+Usage:
+    python benchmarks/bench_vocabulary_processing.py [sizes] [reference_limit]
+    
+    sizes is a comma-separated list of row counts (default 10000,100000,1000000);
+    the row-by-row reference only runs up to reference_limit rows (default 100000)
+"""
+
+import filecmp
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.data_processor import KiswahiliDataProcessor
+from bench_phoneme_segmenter import DATASET
+
+ENGLISH = ['one', 'house', 'book', 'cow', 'ice-cream', "o'clock", 'Big  Dog', 'water\tmelon',
+           'café', 'year 2', 'snake_case', 'mother!', 'NA', '']
+
+
+def load_entries():
+    with open(DATASET, 'r', encoding='utf-8') as f:
+        return [(entry['word'], entry['semantic_category']) for entry in json.load(f)]
+
+
+def noisy(words, rng):
+    """Spreadsheet-style damage to a share of the words"""
+    words = words.astype(object)
+    edits = [
+        lambda w: w.upper(), lambda w: w.capitalize(), lambda w: w + '!', lambda w: '"' + w + '"',
+        lambda w: '  ' + w + ' ', lambda w: w.replace('a', 'a  ', 1), lambda w: w + '\tni',
+        lambda w: w.replace('e', 'é'), lambda w: w + '2', lambda w: "ng'" + w, lambda w: w + '-' + w,
+        lambda w: '...', lambda w: '', lambda w: None,
+    ]
+    choice = rng.integers(0, len(edits) * 3, len(words))
+    for index in np.flatnonzero(choice < len(edits)):
+        words[index] = edits[choice[index]](words[index])
+    return words
+
+
+def build_vocabulary(n_rows, rng, distinct=False):
+    entries = load_entries()
+    picks = rng.integers(0, len(entries), n_rows)
+    words = np.array([word for word, _ in entries], dtype=object)[picks]
+    categories = np.array([category for _, category in entries], dtype=object)[picks]
+    if distinct:
+        words = words + np.array([word for word, _ in entries], dtype=object)[rng.integers(0, len(entries), n_rows)]
+    return pd.DataFrame({
+        'kiswahili': noisy(words, rng),
+        'english': noisy(np.array(ENGLISH, dtype=object)[rng.integers(0, len(ENGLISH), n_rows)], rng),
+        'category': np.where(rng.random(n_rows) < 0.05, None, categories)
+    })
+
+
+def process_row_by_row(processor, input_file, output_file, target_age_group):
+    """process_vocabulary_dataset before the column-wise rewrite"""
+    raw_data = pd.read_csv(input_file)
+    processed_data = []
+    for _, row in raw_data.iterrows():
+        word_data = processor._process_single_word(row, target_age_group)
+        if word_data:
+            processed_data.append(word_data)
+    pd.DataFrame(processed_data).to_csv(output_file, index=False, encoding='utf-8')
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(',')] if len(sys.argv) > 1 else [10000, 100000, 1000000]
+    reference_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    rng = np.random.default_rng(21)
+    processor = KiswahiliDataProcessor()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        raw, expected, actual = (os.path.join(directory, name) for name in ('raw.csv', 'expected.csv', 'actual.csv'))
+        
+        build_vocabulary(5000, rng, distinct=True).to_csv(raw, index=False)
+        for age_group in (1, 2, 3):
+            process_row_by_row(processor, raw, expected, age_group)
+            processor.process_vocabulary_dataset(raw, actual, age_group)
+            assert filecmp.cmp(expected, actual, shallow=False), f"Output differs for age group {age_group}"
+        print("5000 noisy rows, age groups 1-3: output CSVs identical")
+        
+        print(f"\n{'vocabulary':>10} {'rows':>9} {'row-by-row s':>13} {'column-wise s':>14} {'speedup':>8}")
+        for n_rows in sizes:
+            for name, distinct in [('repeated', False), ('distinct', True)]:
+                build_vocabulary(n_rows, rng, distinct).to_csv(raw, index=False)
+                vectorized = timed(processor.process_vocabulary_dataset, raw, actual, 1)
+                if n_rows > reference_limit:
+                    print(f"{name:>10} {n_rows:>9} {'-':>13} {vectorized:>14.2f} {'-':>8}")
+                    continue
+                reference = timed(process_row_by_row, processor, raw, expected, 1)
+                assert filecmp.cmp(expected, actual, shallow=False), f"Output differs at {n_rows} {name} rows"
+                print(f"{name:>10} {n_rows:>9} {reference:>13.2f} {vectorized:>14.2f} {reference / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
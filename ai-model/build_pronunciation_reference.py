@@ -0,0 +1,41 @@
+"""
+Warm-up step for pronunciation scoring: precompute a reference entry for
+every vocabulary word and save the table the API and inference engine load
+at startup.
+
+Usage:
+    python build_pronunciation_reference.py [output] [vocabulary files...]
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
+from models.pronunciation_reference import load_vocabulary
+
+ROOT = Path(__file__).parent
+DEFAULT_OUTPUT = ROOT / "models" / "pronunciation_reference.json"
+DEFAULT_VOCABULARY = [
+    ROOT / "data" / "sample_vocabulary.csv",
+    ROOT.parent / "nextjs-app" / "data" / "dyslexia_dataset_1000.json",
+    ROOT.parent / "nextjs-app" / "data" / "flashcards.ts",
+]
+
+
+def main():
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_OUTPUT
+    sources = sys.argv[2:] or [str(path) for path in DEFAULT_VOCABULARY if path.exists()]
+    
+    words = load_vocabulary(sources)
+    table = KiswahiliPronunciationEvaluator().build_reference_table(words)
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    table.save(str(output))
+    print(f"Saved references for {len(table)} words ({len(table.phonemes)} phonemes) to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,9 @@ from pathlib import Path
 from ..models.recommendation_engine import LearningRecommendationEngine
 from ..models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
 from ..models.progress_tracker import ProgressTracker
+from .recommendation_cache import RecommendationCache
+from .pronunciation_pool import PronunciationWorkerPool
+from .streaming_pronunciation import StreamingPronunciationSession
 
 
 class KiswahiliInferenceEngine:
@@ -22,7 +25,19 @@ class KiswahiliInferenceEngine:
     Handles real-time predictions and recommendations
     """
     
-    def __init__(self, model_dir: str = "models"):
+    def __init__(self,
+                 model_dir: str = "models",
+                 cache_size: int = 10000,
+                 cache_ttl_seconds: float = 300.0,
+                 pronunciation_workers: int = 0):
+        """
+        Args:
+            model_dir: Directory with trained model artifacts
+            cache_size: Maximum cached base recommendations
+            cache_ttl_seconds: Seconds a cached recommendation stays valid
+            pronunciation_workers: Worker processes for batch pronunciation
+                scoring (0 scores batches in this process)
+        """
         self.model_dir = Path(model_dir)
         self.logger = self._setup_logging()
         
@@ -33,7 +48,18 @@ class KiswahiliInferenceEngine:
         
         # Model cache for performance
         self.model_cache = {}
-        self.feature_cache = {}
+        
+        # Base recommendations per learner, dropped when new sessions arrive
+        self.recommendation_cache = RecommendationCache(cache_size, cache_ttl_seconds)
+        self.progress_tracker.add_session_listener(self.recommendation_cache.invalidate_users)
+        
+        # Started on the first batch and kept for later ones
+        self.pronunciation_reference_path = self.model_dir / "pronunciation_reference.json"
+        self.pronunciation_pool = (
+            PronunciationWorkerPool(pronunciation_workers,
+                                    reference_path=str(self.pronunciation_reference_path))
+            if pronunciation_workers > 0 else None
+        )
         
         # Load models if available
         self._load_models()
@@ -62,6 +88,11 @@ class KiswahiliInferenceEngine:
                 self.recommendation_engine.load_model(str(rec_model_path))
                 self.logger.info("Recommendation model loaded successfully")
             
+            # Word references for pronunciation scoring
+            if self.pronunciation_reference_path.exists():
+                self.pronunciation_evaluator.load_reference_table(str(self.pronunciation_reference_path))
+                self.logger.info("Pronunciation references loaded successfully")
+            
             # Load other models as they become available
             # pronunciation_model_path = self.model_dir / "pronunciation_model.joblib"
             # if pronunciation_model_path.exists():
@@ -89,8 +120,16 @@ class KiswahiliInferenceEngine:
         start_time = datetime.now()
         
         try:
-            # Get base recommendation
-            recommendation = self.recommendation_engine.predict_next_topic(user_data)
+            # Get base recommendation, reusing it while the learner's stats
+            # and the model are unchanged
+            fingerprint = self.recommendation_engine.feature_fingerprint(user_data)
+            model_version = self.recommendation_engine.model_version
+            cached = self.recommendation_cache.get(user_id, fingerprint, model_version)
+            cache_hit = cached is not None
+            if not cache_hit:
+                cached = self.recommendation_engine.predict_next_topic(user_data)
+                self.recommendation_cache.put(user_id, fingerprint, model_version, cached)
+            recommendation = dict(cached)
             
             # Apply contextual adjustments
             if context:
@@ -104,7 +143,8 @@ class KiswahiliInferenceEngine:
                 'prediction_time': start_time.isoformat(),
                 'inference_time_ms': (datetime.now() - start_time).total_seconds() * 1000,
                 'model_version': '1.0',
-                'context_applied': context is not None
+                'context_applied': context is not None,
+                'cache_hit': cache_hit
             }
             
             # Log prediction
@@ -125,6 +165,9 @@ class KiswahiliInferenceEngine:
         """
         Batch pronunciation evaluation for efficiency
         
+        With pronunciation_workers set, recordings are scored in parallel
+        worker processes; results keep the order of the requests either way.
+        
         Args:
             pronunciation_requests: List of pronunciation evaluation requests
             
@@ -132,9 +175,9 @@ class KiswahiliInferenceEngine:
             List of evaluation results
         """
         
-        results = []
-        
-        for request in pronunciation_requests:
+        results: List[Optional[Dict]] = [None] * len(pronunciation_requests)
+        prepared, prepared_indices = [], []
+        for index, request in enumerate(pronunciation_requests):
             try:
                 word = request['word']
                 audio_data = request.get('audio_data')
@@ -145,24 +188,93 @@ class KiswahiliInferenceEngine:
                     duration = 2.0
                     audio_data = np.random.normal(0, 0.1, int(sample_rate * duration))
                 
-                result = self.pronunciation_evaluator.evaluate_pronunciation(
-                    word, audio_data, sample_rate
-                )
-                
-                result['request_id'] = request.get('request_id', '')
-                results.append(result)
-                
+                prepared.append({**request, 'word': word, 'audio_data': audio_data, 'sample_rate': sample_rate})
+                prepared_indices.append(index)
             except Exception as e:
-                self.logger.error(f"Pronunciation evaluation error: {e}")
-                results.append({
-                    'request_id': request.get('request_id', ''),
-                    'error': str(e),
-                    'word': request.get('word', ''),
-                    'overall_score': 0.0
-                })
+                results[index] = self._pronunciation_error(request, str(e))
+        
+        if self.pronunciation_pool is not None and len(prepared) > 1:
+            evaluations = self.pronunciation_pool.evaluate(prepared)
+        else:
+            evaluations = self._evaluate_pronunciations(prepared)
+        
+        for index, request, result in zip(prepared_indices, prepared, evaluations):
+            if 'error' in result:
+                result = self._pronunciation_error(request, result['error'])
+            else:
+                result['request_id'] = request.get('request_id', '')
+            results[index] = result
         
         return results
     
+    def _pronunciation_error(self, request: Dict, error: str) -> Dict:
+        """Result for a request that could not be evaluated"""
+        self.logger.error(f"Pronunciation evaluation error: {error}")
+        return {
+            'request_id': request.get('request_id', ''),
+            'error': error,
+            'word': request.get('word', ''),
+            'overall_score': 0.0
+        }
+    
+    def _evaluate_pronunciations(self, requests: List[Dict]) -> List[Dict]:
+        """Evaluate in this process, one evaluator batch call per sample rate"""
+        evaluations: List[Optional[Dict]] = [None] * len(requests)
+        
+        by_rate: Dict[int, List[int]] = {}
+        for index, request in enumerate(requests):
+            try:
+                by_rate.setdefault(request['sample_rate'], []).append(index)
+            except TypeError:
+                # Unhashable sample rate: score alone, which reports the error
+                evaluations[index] = self._evaluate_pronunciation(request)
+        
+        for sample_rate, indices in by_rate.items():
+            try:
+                batch = self.pronunciation_evaluator.evaluate_pronunciation_batch(
+                    [requests[i]['word'] for i in indices],
+                    [requests[i]['audio_data'] for i in indices],
+                    sample_rate
+                )
+            except Exception:
+                # Isolate the failing recording(s) by scoring one at a time
+                batch = [self._evaluate_pronunciation(requests[i]) for i in indices]
+            for index, evaluation in zip(indices, batch):
+                evaluations[index] = evaluation
+        
+        return evaluations
+    
+    def _evaluate_pronunciation(self, request: Dict) -> Dict:
+        try:
+            return self.pronunciation_evaluator.evaluate_pronunciation(
+                request['word'], request['audio_data'], request['sample_rate']
+            )
+        except Exception as e:
+            return {'error': str(e)}
+    
+    def start_pronunciation_stream(self,
+                                   target_word: str,
+                                   sample_rate: int = 22050) -> StreamingPronunciationSession:
+        """
+        Start scoring an utterance as it is recorded
+        
+        Feed audio with push (or push_pcm) as it arrives for partial
+        phoneme-level feedback, then call finish for the full evaluation.
+        
+        Args:
+            target_word: The word the learner should pronounce
+            sample_rate: Sample rate of the incoming audio
+            
+        Returns:
+            Streaming session for the utterance
+        """
+        return StreamingPronunciationSession(self.pronunciation_evaluator, target_word, sample_rate)
+    
+    def close(self):
+        """Stop background workers"""
+        if self.pronunciation_pool is not None:
+            self.pronunciation_pool.close()
+    
     def get_adaptive_content(self, 
                            user_id: str,
                            topic_id: int,
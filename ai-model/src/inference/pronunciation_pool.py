@@ -0,0 +1,186 @@
+"""
+Pronunciation Worker Pool
+Scores batches of recordings in parallel worker processes
+"""
+
+import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from ..models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
+except ImportError:
+    from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
+
+
+# Evaluator owned by each worker process
+_worker_evaluator: Optional[KiswahiliPronunciationEvaluator] = None
+
+
+def _init_worker(pitch_method: str, reference_path: Optional[str]):
+    global _worker_evaluator
+    _worker_evaluator = KiswahiliPronunciationEvaluator(pitch_method=pitch_method)
+    if reference_path and os.path.exists(reference_path):
+        _worker_evaluator.load_reference_table(reference_path)
+
+
+def _ready() -> bool:
+    return _worker_evaluator is not None
+
+
+def _score(block: shared_memory.SharedMemory, item: Dict) -> Dict:
+    # The audio is a view into shared memory; it must not outlive this call
+    audio_data = np.ndarray((item['length'],), dtype=np.dtype(item['dtype']),
+                            buffer=block.buf, offset=item['offset'])
+    try:
+        return _worker_evaluator.evaluate_pronunciation(item['word'], audio_data, item['sample_rate'])
+    except Exception as e:
+        return {'error': str(e), 'word': item['word'], 'overall_score': 0.0}
+
+
+def _evaluate_items(block_name: str, items: List[Dict]) -> List[Dict]:
+    """Worker task: score recordings stored in a shared memory block"""
+    # Workers share the parent's resource tracker, which unlinks the block
+    # only if the parent dies without doing so itself
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        return [_score(block, item) for item in items]
+    finally:
+        block.close()
+
+
+class PronunciationWorkerPool:
+    """
+    Persistent process pool for batch pronunciation scoring
+    
+    Feature extraction is CPU-bound and holds the GIL, so batches are spread
+    over worker processes, each with its own evaluator. The recordings of a
+    batch are copied once into a single shared memory block and workers read
+    them in place, so audio arrays are never pickled. Results come back in
+    request order, and an error while scoring one recording only fails its
+    own result.
+    """
+    
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 pitch_method: str = 'peaks',
+                 items_per_task: Optional[int] = None,
+                 reference_path: Optional[str] = None):
+        """
+        Args:
+            max_workers: Worker processes (defaults to the CPU count)
+            pitch_method: Pitch estimator used by the workers' evaluators
+            items_per_task: Recordings sent to a worker per task (by default
+                each worker gets about two tasks per batch)
+            reference_path: Pronunciation reference table for the workers'
+                evaluators, if it exists
+        """
+        self.max_workers = max_workers or mp.cpu_count()
+        self.pitch_method = pitch_method
+        self.items_per_task = items_per_task
+        self.reference_path = reference_path
+        self.logger = logging.getLogger("KiswahiliInference")
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a server process with live threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.pitch_method, self.reference_path)
+            )
+        return self._executor
+    
+    def start(self):
+        """Start the workers now instead of on the first batch"""
+        executor = self._get_executor()
+        for future in [executor.submit(_ready) for _ in range(self.max_workers)]:
+            future.result()
+    
+    def evaluate(self, requests: List[Dict]) -> List[Dict]:
+        """
+        Score a batch of recordings
+        
+        Args:
+            requests: Dicts with 'word', 'audio_data' (1-D array) and
+                optionally 'sample_rate' (default 22050)
+        
+        Returns:
+            One evaluation result (or error dict) per request, in order
+        """
+        results: List[Optional[Dict]] = [None] * len(requests)
+        items = []
+        total_bytes = 0
+        
+        for index, request in enumerate(requests):
+            try:
+                audio_data = np.ascontiguousarray(request['audio_data'])
+                if audio_data.ndim != 1:
+                    raise ValueError("audio_data must be one-dimensional")
+                items.append({
+                    'index': index,
+                    'word': request['word'],
+                    'sample_rate': request.get('sample_rate', 22050),
+                    'audio_data': audio_data,
+                    'offset': total_bytes,
+                    'length': len(audio_data),
+                    'dtype': audio_data.dtype.str
+                })
+                # Keep every array aligned to 8 bytes
+                total_bytes += -(-audio_data.nbytes // 8) * 8
+            except Exception as e:
+                results[index] = {'error': str(e), 'word': request.get('word', ''), 'overall_score': 0.0}
+        
+        if not items:
+            return results
+        
+        block = shared_memory.SharedMemory(create=True, size=max(total_bytes, 1))
+        try:
+            for item in items:
+                audio_data = item.pop('audio_data')
+                destination = np.ndarray(audio_data.shape, dtype=audio_data.dtype,
+                                         buffer=block.buf, offset=item['offset'])
+                destination[:] = audio_data
+                del destination
+            
+            executor = self._get_executor()
+            per_task = self.items_per_task or -(-len(items) // (2 * self.max_workers))
+            tasks = [items[start:start + per_task] for start in range(0, len(items), per_task)]
+            futures = [executor.submit(_evaluate_items, block.name, task) for task in tasks]
+            
+            for task, future in zip(tasks, futures):
+                try:
+                    task_results = future.result()
+                except Exception as e:
+                    # A crashed worker breaks the pool; restart it next batch
+                    if isinstance(e, BrokenProcessPool):
+                        self._discard_executor()
+                    self.logger.error(f"Pronunciation worker error: {e}")
+                    task_results = [{'error': str(e), 'word': item['word'], 'overall_score': 0.0}
+                                    for item in task]
+                for item, result in zip(task, task_results):
+                    results[item['index']] = result
+        finally:
+            block.close()
+            block.unlink()
+        
+        return results
+    
+    def _discard_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def close(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
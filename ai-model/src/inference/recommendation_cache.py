@@ -0,0 +1,136 @@
+"""
+Recommendation Cache
+Bounded LRU/TTL cache for per-learner recommendation results
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+class RecommendationCache:
+    """
+    Least-recently-used cache of recommendation results with expiry
+    
+    Entries are keyed on (user_id, feature fingerprint, model version), so a
+    learner whose stats change or a newly loaded model never hits a stale
+    entry. Entries for a user are dropped explicitly through invalidate_user
+    when new sessions are recorded for them.
+    """
+    
+    def __init__(self,
+                 max_size: int = 10000,
+                 ttl_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_size: Maximum number of cached entries
+            ttl_seconds: Seconds an entry stays valid (0 disables expiry)
+            clock: Time source, in seconds
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+        self._user_keys: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def get(self, user_id: str, fingerprint: str, model_version: str) -> Optional[Any]:
+        """
+        Look up a cached result
+        
+        Returns:
+            The cached value, or None on a miss. Values are returned as
+            stored, so callers must copy before mutating them.
+        """
+        key = (user_id, fingerprint, model_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, value = entry
+            if self.ttl_seconds and self.clock() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, user_id: str, fingerprint: str, model_version: str, value: Any):
+        """Store a result, evicting the least recently used entries if full"""
+        key = (user_id, fingerprint, model_version)
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+            
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Drop every cached entry for a user
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = self._user_keys.pop(user_id, ())
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            return len(keys)
+    
+    def invalidate_users(self, user_ids: Iterable[str]):
+        """Drop cached entries for several users"""
+        for user_id in user_ids:
+            self.invalidate_user(user_id)
+    
+    def clear(self):
+        """Drop all cached entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+    
+    def _remove(self, key: Tuple[str, str, str]):
+        del self._entries[key]
+        user_keys = self._user_keys.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[key[0]]
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,248 @@
+"""
+Streaming Pronunciation Analysis
+Scores a recording frame by frame while the child is still speaking
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from ..models.pronunciation_evaluator import KiswahiliPronunciationEvaluator, PhonemeScore
+    from ..models.progress_tracker import RunningStats
+except ImportError:
+    from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator, PhonemeScore
+    from models.progress_tracker import RunningStats
+
+
+class StreamingPronunciationSession:
+    """
+    Incremental pronunciation analysis of one utterance
+    
+    Audio arrives in small chunks. Each chunk only adds the STFT frames it
+    completes (frames are centered as in librosa.stft, with the zero padding
+    at the start applied up front and at the end on finish), and those
+    frames update running spectral centroid, MFCC, pitch and energy
+    statistics, so the cost of an update depends on the chunk, not on how
+    much has been said. The MFCC floor is top_db below the loudest level
+    heard so far, so running MFCC statistics can differ slightly from a
+    whole-clip analysis.
+    
+    Phonemes are scored as the voiced audio reaches the time they are
+    expected to take, and the final result is assembled from those scores.
+    """
+    
+    def __init__(self,
+                 evaluator: KiswahiliPronunciationEvaluator,
+                 target_word: str,
+                 sample_rate: int = 22050,
+                 max_duration_seconds: float = 30.0,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Args:
+            evaluator: Evaluator providing word references, feature
+                extraction settings and feedback
+            target_word: The word the child should pronounce
+            sample_rate: Sample rate of the incoming audio
+            max_duration_seconds: Longest utterance accepted
+            rng: Random generator for the utterance's simulated scores
+        """
+        if not target_word:
+            raise ValueError("Missing 'word'")
+        if sample_rate <= 0:
+            raise ValueError(f"Unsupported sample rate: {sample_rate}")
+        
+        self.evaluator = evaluator
+        self.extractor = evaluator.feature_extractor
+        self.target_word = target_word
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_duration_seconds * sample_rate)
+        self.reference = evaluator.word_reference(target_word)
+        self.rng = rng
+        
+        # Expected speaking time of each phoneme, from the middle of the
+        # evaluator's per-phoneme duration range
+        self.seconds_per_phoneme = sum(evaluator.PHONEME_SECONDS) / 2
+        
+        self._freqs, self._mel_basis = self.extractor.filterbank(sample_rate)
+        self._pending = np.zeros(self.extractor.n_fft // 2, dtype=np.float32)
+        self._carry = b''
+        self._finished = False
+        
+        self.samples_received = 0
+        self.energy = 0.0
+        self.centroid_stats = RunningStats()
+        self.pitch_stats = RunningStats()
+        n_mfcc = self.extractor.n_mfcc
+        self.mfcc_stats = RunningStats(0, np.zeros(n_mfcc), np.zeros(n_mfcc))
+        self._peak_db: Optional[float] = None
+        
+        # Voiced frames, judged against the quietest frame heard so far
+        detector = evaluator.voice_detector
+        self.margin_db = detector.margin_db if detector else 12.0
+        self.floor_db = detector.floor_db if detector else -60.0
+        self._noise_db: Optional[float] = None
+        self.voiced_frames = 0
+        
+        self.phoneme_scores: List[PhonemeScore] = []
+    
+    @property
+    def seconds_received(self) -> float:
+        return self.samples_received / self.sample_rate
+    
+    @property
+    def voiced_seconds(self) -> float:
+        return self.voiced_frames * self.extractor.hop_length / self.sample_rate
+    
+    def push_pcm(self, chunk: bytes) -> Optional[Dict]:
+        """Add 16-bit little-endian mono PCM; a split sample is carried over"""
+        if self._carry:
+            chunk = self._carry + chunk
+        usable = len(chunk) - len(chunk) % 2
+        self._carry = chunk[usable:]
+        samples = np.frombuffer(chunk, dtype='<i2', count=usable // 2).astype(np.float32)
+        samples *= 1.0 / 32768
+        return self.push(samples)
+    
+    def push(self, samples: np.ndarray) -> Optional[Dict]:
+        """
+        Add audio samples
+        
+        Returns:
+            A partial update if the samples completed any STFT frames,
+            otherwise None
+        """
+        if self._finished:
+            raise ValueError("Utterance already finished")
+        if self.samples_received + len(samples) > self.max_samples:
+            raise ValueError(f"Recording longer than {self.max_samples} samples")
+        
+        started = time.perf_counter()
+        samples = np.asarray(samples, dtype=np.float32)
+        self.samples_received += len(samples)
+        self.energy += float(np.dot(samples, samples))
+        self._pending = np.concatenate([self._pending, samples])
+        
+        new_scores = self._process_frames()
+        if new_scores is None:
+            return None
+        return self._partial_update(new_scores, time.perf_counter() - started)
+    
+    def finish(self) -> Dict:
+        """
+        End the utterance and return the full evaluation
+        
+        Returns:
+            The evaluator's result fields plus running 'features' and
+            streaming 'metadata'
+        """
+        if self._finished:
+            raise ValueError("Utterance already finished")
+        if not self.samples_received:
+            raise ValueError("Recording is empty")
+        
+        # Zero padding at the end, as librosa.stft centers the last frames
+        self._pending = np.concatenate([self._pending, np.zeros(self.extractor.n_fft // 2, dtype=np.float32)])
+        self._process_frames()
+        self._finished = True
+        
+        # Whatever was not reached while streaming is scored now
+        self._score_phonemes(len(self.reference.phonemes))
+        
+        result = self.evaluator.pronunciation_result(
+            self.target_word, self.evaluator.summarize_phoneme_scores(self.phoneme_scores), self.rng
+        )
+        result['features'] = self.features()
+        result['metadata'] = {
+            'streaming': {
+                'seconds_received': self.seconds_received,
+                'voiced_seconds': self.voiced_seconds
+            }
+        }
+        return result
+    
+    def features(self) -> Dict:
+        """Running feature summary"""
+        return {
+            'duration': self.seconds_received,
+            'energy': self.energy,
+            'spectral_centroid_mean': float(self.centroid_stats.mean),
+            'spectral_centroid_std': float(self.centroid_stats.std),
+            'pitch_mean': float(self.pitch_stats.mean),
+            'pitch_std': float(self.pitch_stats.std),
+            'mfcc_mean': self.mfcc_stats.mean.tolist(),
+            'mfcc_std': self.mfcc_stats.std.tolist()
+        }
+    
+    def _process_frames(self) -> Optional[List[PhonemeScore]]:
+        n_fft, hop_length = self.extractor.n_fft, self.extractor.hop_length
+        if len(self._pending) < n_fft:
+            return None
+        
+        n_frames = 1 + (len(self._pending) - n_fft) // hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(self._pending, n_fft)
+        frames = frames[:n_frames * hop_length:hop_length]
+        
+        # Only the new frames are transformed: shape (bins, n_frames)
+        magnitude = self.extractor.frame_magnitudes(frames).T
+        self._update_features(magnitude)
+        self._update_voicing(frames)
+        
+        self._pending = self._pending[n_frames * hop_length:].copy()
+        
+        # Phonemes the voiced audio has had time to reach
+        reached = int(self.voiced_seconds / self.seconds_per_phoneme)
+        return self._score_phonemes(min(reached, len(self.reference.phonemes)))
+    
+    def _update_features(self, magnitude: np.ndarray):
+        totals = magnitude.sum(axis=0)
+        totals[totals == 0] = 1.0
+        self.centroid_stats.push_batch((self._freqs @ magnitude) / totals)
+        
+        self.pitch_stats.push_batch(self.extractor.pitches(magnitude, self.sample_rate))
+        
+        # Flooring never raises the maximum, so the floored spectrogram's
+        # maximum is the loudest level heard so far
+        log_mel = self.extractor.log_mel(np.square(magnitude), self._mel_basis, self._peak_db)
+        self._peak_db = float(log_mel.max())
+        self.mfcc_stats.push_batch(self.extractor.cepstrum(log_mel))
+    
+    def _update_voicing(self, frames: np.ndarray):
+        # Each frame stands for the hop of audio at its centre; whole frames
+        # are too long to catch the quiet gaps between syllables
+        centre, half_hop = self.extractor.n_fft // 2, self.extractor.hop_length // 2
+        hops = frames[:, centre - half_hop:centre + half_hop]
+        level = 10.0 * np.log10(np.maximum(np.mean(np.square(hops, dtype=np.float64), axis=1), 1e-12))
+        quietest = float(level.min())
+        self._noise_db = quietest if self._noise_db is None else min(self._noise_db, quietest)
+        threshold = max(self._noise_db + self.margin_db, self.floor_db)
+        self.voiced_frames += int(np.count_nonzero(level >= threshold))
+    
+    def _score_phonemes(self, reached: int) -> List[PhonemeScore]:
+        new_scores = [
+            self.evaluator.score_phoneme(phoneme, weight, self.rng)
+            for phoneme, weight in zip(self.reference.phonemes[len(self.phoneme_scores):reached],
+                                       self.reference.challenge_weights[len(self.phoneme_scores):reached])
+        ]
+        self.phoneme_scores.extend(new_scores)
+        return new_scores
+    
+    def _partial_update(self, new_scores: List[PhonemeScore], elapsed: float) -> Dict:
+        scored = len(self.phoneme_scores)
+        total = len(self.reference.phonemes)
+        return {
+            'type': 'partial',
+            'word': self.target_word,
+            'seconds_received': self.seconds_received,
+            'voiced_seconds': self.voiced_seconds,
+            'phonemes_scored': scored,
+            'phonemes_total': total,
+            'phoneme_scores': [
+                {'phoneme': ps.phoneme, 'score': ps.score, 'feedback': ps.feedback}
+                for ps in new_scores
+            ],
+            'running_score': sum(ps.score for ps in self.phoneme_scores) / scored if scored else None,
+            'features': self.features(),
+            'processing_ms': elapsed * 1000
+        }
@@ -0,0 +1,197 @@
+"""
+Flat-Array Random Forest
+Read-only RandomForestClassifier stand-in that can be memory-mapped
+"""
+
+import numpy as np
+from typing import Dict, Optional
+
+
+class FlatForest:
+    """
+    RandomForestClassifier predictor backed by flat node arrays
+    
+    sklearn's tree objects copy their node arrays when unpickled, so every
+    worker process holds a private copy of the forest. A FlatForest keeps
+    all trees in a handful of plain NumPy arrays; saved with joblib (without
+    compression) and loaded with mmap_mode='r', those arrays are shared
+    read-only between processes through the page cache.
+    
+    Only prediction is supported; train with sklearn and convert with
+    from_sklearn.
+    """
+    
+    # Node arrays, all trees concatenated
+    ARRAY_NAMES = ('feature', 'threshold', 'children_left', 'children_right', 'value', 'roots')
+    
+    # Rows evaluated together in predict_proba
+    BATCH_ROWS = 1024
+    
+    # Traversal steps between dropping finished paths in apply
+    COMPACT_EVERY = 4
+    
+    def __init__(self,
+                 feature: np.ndarray,
+                 threshold: np.ndarray,
+                 children_left: np.ndarray,
+                 children_right: np.ndarray,
+                 value: np.ndarray,
+                 roots: np.ndarray,
+                 classes: np.ndarray,
+                 n_features: int,
+                 max_depth: Optional[int] = None,
+                 feature_importances: Optional[np.ndarray] = None):
+        """
+        Args:
+            feature: Split feature per node (negative for leaves)
+            threshold: Split threshold per node
+            children_left: Global index of the left child per node
+            children_right: Global index of the right child per node
+            value: Normalized class probabilities per node, shape (n_nodes, n_classes)
+            roots: Global index of each tree's root node
+            classes: Class labels, in probability column order
+            n_features: Number of input features
+            max_depth: Depth of the deepest tree (computed if omitted)
+            feature_importances: Impurity-based importance of each feature,
+                as the sklearn forest reported it
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+        self._max_depth = max_depth
+        if feature_importances is not None:
+            self.feature_importances_ = feature_importances
+    
+    @classmethod
+    def from_sklearn(cls, forest) -> 'FlatForest':
+        """Convert a fitted single-output RandomForestClassifier"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+            
+            # Leaves point at themselves, so stepping past a leaf is a no-op
+            node_ids = np.arange(offset, offset + tree.node_count)
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            features.append(np.where(is_leaf, -1, tree.feature))
+            thresholds.append(tree.threshold)
+            
+            # Recent sklearn stores class fractions; older releases store
+            # weighted counts and normalize inside predict_proba
+            value = tree.value[:, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            if not np.allclose(normalizer, 1.0):
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+            values.append(value)
+            
+            roots.append(offset)
+            offset += tree.node_count
+        
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children_left=np.concatenate(lefts).astype(np.int32),
+            children_right=np.concatenate(rights).astype(np.int32),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.array(roots, dtype=np.int32),
+            classes=np.asarray(forest.classes_),
+            n_features=int(forest.n_features_in_),
+            max_depth=max(estimator.tree_.max_depth for estimator in forest.estimators_),
+            feature_importances=np.asarray(forest.feature_importances_, dtype=np.float64)
+        )
+    
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+    
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """The node arrays by name"""
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+    
+    @property
+    def max_depth(self) -> int:
+        """Depth of the deepest tree, i.e. the traversal steps needed"""
+        if getattr(self, '_max_depth', None) is None:
+            depth = 0
+            frontier = np.asarray(self.roots)
+            while True:
+                frontier = frontier[self.feature[frontier] >= 0]
+                if not frontier.size:
+                    break
+                frontier = np.concatenate([self.children_left[frontier], self.children_right[frontier]])
+                depth += 1
+            self._max_depth = depth
+        return self._max_depth
+    
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Leaf index reached in every tree
+        
+        All (sample, tree) paths are walked together, one level per step,
+        with a single gather per node array. Paths are laid out tree by tree
+        so each step reads nearby nodes, and paths that reached a leaf are
+        dropped every COMPACT_EVERY steps.
+        
+        Returns:
+            Global node indices of shape (n_samples, n_estimators)
+        """
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        n_samples, n_features = X.shape
+        flat_X = X.ravel()
+        
+        current = np.repeat(np.asarray(self.roots, dtype=np.int32), n_samples)
+        row_offsets = np.tile(np.arange(0, n_samples * n_features, n_features), self.n_estimators)
+        positions = np.arange(current.size)
+        leaves = np.empty(current.size, dtype=np.int32)
+        
+        for step in range(self.max_depth):
+            feature = self.feature[current]
+            
+            if step % self.COMPACT_EVERY == 0:
+                internal = feature >= 0
+                if not internal.all():
+                    finished = ~internal
+                    leaves[positions[finished]] = current[finished]
+                    positions, current = positions[internal], current[internal]
+                    row_offsets, feature = row_offsets[internal], feature[internal]
+                    if not current.size:
+                        break
+            
+            # Leaves left in the batch have feature -1 and point at
+            # themselves, so whatever they compare they stay put
+            go_left = flat_X[row_offsets + feature] <= self.threshold[current]
+            current = np.where(go_left, self.children_left[current], self.children_right[current])
+        
+        leaves[positions] = current
+        return leaves.reshape(self.n_estimators, n_samples).T
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities, identical to RandomForestClassifier.predict_proba"""
+        X = np.atleast_2d(X)
+        proba = np.empty((X.shape[0], len(self.classes_)))
+        
+        # Chunked so the (rows, trees, classes) leaf values stay small
+        for start in range(0, X.shape[0], self.BATCH_ROWS):
+            chunk = slice(start, start + self.BATCH_ROWS)
+            leaf_values = self.value[self.apply(X[chunk])]
+            
+            # A running sum over trees in estimator order reproduces sklearn's
+            # accumulation exactly (a pairwise sum could differ in the last bit)
+            proba[chunk] = np.cumsum(leaf_values, axis=1)[:, -1]
+        
+        proba /= self.n_estimators
+        return proba
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Most probable class per sample"""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
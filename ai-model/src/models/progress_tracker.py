@@ -4,10 +4,26 @@ For monitoring learning progress of children with dyslexia
 """
 
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+from bisect import bisect_left, bisect_right
+from array import array
+import fcntl
 import json
+import logging
+import math
+import os
+import pickle
+import shutil
+
+from .session_store import (
+    ColumnarSessionStore, PerformanceHistory, SessionView,
+    to_micros, MICROSECONDS_PER_DAY, save_store, load_store
+)
+from .session_log import SessionLog
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -41,16 +57,233 @@ class ProgressMetrics:
     strengths: List[str]
 
 
+@dataclass
+class RunningStats:
+    """Running mean/variance using Welford's algorithm"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    
+    def push(self, value: float):
+        """Add a single observation"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def push_batch(self, values: np.ndarray, axis: int = -1):
+        """
+        Add a batch of observations along an axis
+        
+        The batch's own mean and squared deviations are merged in, so the
+        accumulator can track an array of statistics (e.g. one per MFCC
+        coefficient) when its mean and m2 start as arrays.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        count = values.shape[axis] if values.ndim else 1
+        if count == 0:
+            return
+        mean = values.mean(axis=axis)
+        m2 = np.square(values - np.expand_dims(mean, axis)).sum(axis=axis)
+        self.merge(RunningStats(count, mean, m2))
+    
+    def merge(self, other: 'RunningStats'):
+        """Combine another accumulator into this one (Chan et al.)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+        
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+    
+    @property
+    def variance(self) -> float:
+        """Population variance (matches np.var)"""
+        # m2 is zero until something is added, keeping the shape of array stats
+        return self.m2 / max(self.count, 1)
+    
+    @property
+    def std(self) -> float:
+        """Population standard deviation (matches np.std)"""
+        return np.sqrt(self.variance)
+
+
+@dataclass
+class RunningTrend:
+    """
+    Online least-squares accumulator for a linear trend y ~ x
+    
+    Keeps running means and centred co-moments rather than raw sums so
+    the slope stays accurate for large x (session ordinals).
+    """
+    count: int = 0
+    mean_x: float = 0.0
+    mean_y: float = 0.0
+    m2_x: float = 0.0
+    c_xy: float = 0.0
+    
+    def push(self, x: float, y: float):
+        """Add a single (x, y) point"""
+        self.count += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.count
+        self.mean_y += (y - self.mean_y) / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        self.c_xy += dx * (y - self.mean_y)
+    
+    def merge(self, other: 'RunningTrend'):
+        """Combine another accumulator into this one"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean_x, self.mean_y = other.count, other.mean_x, other.mean_y
+            self.m2_x, self.c_xy = other.m2_x, other.c_xy
+            return
+        
+        count = self.count + other.count
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.count * other.count / count
+        self.m2_x += other.m2_x + dx * dx * weight
+        self.c_xy += other.c_xy + dx * dy * weight
+        self.mean_x += dx * other.count / count
+        self.mean_y += dy * other.count / count
+        self.count = count
+    
+    def slope(self) -> float:
+        """Least-squares slope (matches np.polyfit(x, y, 1)[0])"""
+        if self.count < 2 or self.m2_x == 0:
+            return 0.0
+        return self.c_xy / self.m2_x
+
+
+@dataclass
+class SessionBucket:
+    """
+    Precomputed aggregates for a user's sessions starting on one day
+    
+    Gaps between consecutive sessions are attributed to the later session;
+    the gap into the first session of the bucket is kept apart as lead_gap
+    so that it can be dropped when the bucket opens a reporting window.
+    Buckets are stored between updates as flat rows of ROW_WIDTH floats.
+    """
+    count: int = 0
+    completed: int = 0
+    accuracy: RunningStats = field(default_factory=RunningStats)
+    pronunciation: RunningStats = field(default_factory=RunningStats)
+    engagement: RunningStats = field(default_factory=RunningStats)
+    completion_ratio: RunningStats = field(default_factory=RunningStats)
+    duration_minutes: RunningStats = field(default_factory=RunningStats)
+    total_minutes: float = 0.0
+    accuracy_trend: RunningTrend = field(default_factory=RunningTrend)
+    gaps: RunningStats = field(default_factory=RunningStats)
+    lead_gap: Optional[int] = None
+    
+    STATS = ('accuracy', 'pronunciation', 'engagement', 'completion_ratio', 'duration_minutes', 'gaps')
+    ROW_WIDTH = 4 + 3 * len(STATS) + 5
+    
+    def push(self, session: 'LearningSession', ordinal: int, gap: Optional[int]):
+        """Add a session given its position in the user's history and the gap to its predecessor"""
+        if self.count == 0:
+            self.lead_gap = gap
+        elif gap is not None:
+            self.gaps.push(gap)
+        
+        self.count += 1
+        if session.activities_completed == session.total_activities:
+            self.completed += 1
+        
+        self.accuracy.push(session.accuracy_score)
+        self.pronunciation.push(session.pronunciation_score)
+        self.engagement.push(session.engagement_score)
+        if session.total_activities > 0:
+            self.completion_ratio.push(session.activities_completed / session.total_activities)
+        minutes = (session.end_time - session.start_time).total_seconds() / 60
+        self.duration_minutes.push(minutes)
+        self.total_minutes += minutes
+        self.accuracy_trend.push(ordinal, session.accuracy_score)
+    
+    def merge(self, other: 'SessionBucket', include_lead_gap: bool = True):
+        """Append a later bucket to this one"""
+        if include_lead_gap and other.lead_gap is not None:
+            self.gaps.push(other.lead_gap)
+        
+        self.count += other.count
+        self.completed += other.completed
+        self.accuracy.merge(other.accuracy)
+        self.pronunciation.merge(other.pronunciation)
+        self.engagement.merge(other.engagement)
+        self.completion_ratio.merge(other.completion_ratio)
+        self.duration_minutes.merge(other.duration_minutes)
+        self.total_minutes += other.total_minutes
+        self.accuracy_trend.merge(other.accuracy_trend)
+        self.gaps.merge(other.gaps)
+    
+    def to_row(self) -> List[float]:
+        """Flatten into ROW_WIDTH floats"""
+        row = [self.count, self.completed, self.total_minutes,
+               float('nan') if self.lead_gap is None else self.lead_gap]
+        for name in self.STATS:
+            stats = getattr(self, name)
+            row.extend((stats.count, stats.mean, stats.m2))
+        trend = self.accuracy_trend
+        row.extend((trend.count, trend.mean_x, trend.mean_y, trend.m2_x, trend.c_xy))
+        return row
+    
+    @classmethod
+    def from_row(cls, row) -> 'SessionBucket':
+        """Rebuild a bucket from a row produced by to_row()"""
+        bucket = cls(count=int(row[0]), completed=int(row[1]), total_minutes=row[2],
+                     lead_gap=None if math.isnan(row[3]) else int(row[3]))
+        offset = 4
+        for name in cls.STATS:
+            setattr(bucket, name, RunningStats(int(row[offset]), row[offset + 1], row[offset + 2]))
+            offset += 3
+        bucket.accuracy_trend = RunningTrend(int(row[offset]), *row[offset + 1:offset + 5])
+        return bucket
+
+
+def _snapshot_seq(name: str) -> int:
+    """Log sequence number of a snapshot directory name ('<seq>-<pid>'), or -1"""
+    seq = name.split('-', 1)[0]
+    return int(seq) if seq.isdigit() else -1
+
+
 class ProgressTracker:
     """
     Comprehensive progress tracking system for dyslexic learners
     Monitors multiple dimensions of learning progress
     """
     
-    def __init__(self):
-        self.sessions_data = []
+    # Log records applied per batch when catching up from the durable log
+    SYNC_BATCH_SIZE = 10000
+    
+    def __init__(self, storage_dir: Optional[str] = None, snapshot_interval: int = 10000):
+        """
+        Args:
+            storage_dir: Directory for the durable session log and snapshots;
+                sessions are kept in memory only when None
+            snapshot_interval: Number of logged sessions between snapshots
+        """
+        # Sessions are held column-wise; iterating yields SessionView rows
+        self.sessions_data = ColumnarSessionStore()
         self.user_profiles = {}
         
+        # Per-user session index kept sorted by start_time so that a single
+        # learner's history can be sliced with bisect instead of scanning
+        # every recorded session: user_id -> (start_us, rows)
+        self._user_index = {}
+        
+        # Incremental per-user, per-day aggregates so metrics for a window
+        # are combined from buckets:
+        # user_id -> (bucket_days, bucket_rows, latest start per topic)
+        self._user_aggregates = {}
+        
         # Dyslexia-specific tracking categories
         self.dyslexia_indicators = {
             'phonetic_processing': ['phoneme_errors', 'sound_confusion'],
@@ -73,11 +306,296 @@ class ProgressTracker:
             9: {"name": "School Context", "skills": ["classroom_language", "instructions"]},
             10: {"name": "Basic Conversations", "skills": ["dialogue", "response_formation"]}
         }
+        
+        # Callbacks notified with the user ids of newly applied sessions
+        self._session_listeners: List[Callable[[Iterable[str]], None]] = []
+        
+        # Durable storage: append-only log plus periodic snapshots
+        self.storage_dir = storage_dir
+        self.snapshot_interval = snapshot_interval
+        self._log = None
+        self._log_seq = 0
+        self._snapshot_seq = 0
+        
+        if storage_dir:
+            os.makedirs(os.path.join(storage_dir, 'snapshots'), exist_ok=True)
+            self._log = SessionLog(os.path.join(storage_dir, 'sessions.db'))
+            self._load_snapshot()
+            self.sync_from_log()
+    
+    def add_session_listener(self, listener: Callable[[Iterable[str]], None]):
+        """
+        Register a callback for newly applied sessions
+        
+        The callback receives the ids of users whose sessions were applied,
+        including sessions recorded by other workers and picked up from the
+        durable log (e.g. to invalidate cached recommendations).
+        """
+        self._session_listeners.append(listener)
     
     def record_session(self, session: LearningSession):
         """Record a completed learning session"""
-        self.sessions_data.append(session)
-        self._update_user_profile(session)
+        self.record_sessions([session])
+    
+    def record_sessions(self, sessions: List[LearningSession]) -> int:
+        """
+        Record a batch of completed learning sessions
+        
+        The batch is written to the log in one transaction and each user's
+        aggregates are updated once for the whole batch.
+        
+        Args:
+            sessions: Sessions to record, in any order
+            
+        Returns:
+            Number of sessions recorded
+        """
+        # Apply in start_time order so offline backlogs append to the index
+        sessions = sorted(sessions, key=lambda session: to_micros(session.start_time))
+        
+        if self._log is None:
+            self._apply_sessions(sessions)
+            return len(sessions)
+        
+        # Write ahead, then apply everything logged since the last sync so
+        # that sessions from other workers are picked up in log order
+        self._log.append(sessions)
+        self.sync_from_log()
+        return len(sessions)
+    
+    def _apply_sessions(self, sessions: List[LearningSession]):
+        """Add sessions to the in-memory store, index, profiles and aggregates"""
+        # user_id -> ordinals to push onto the day buckets, or None when the
+        # user's aggregates have to be rebuilt
+        pending = {}
+        
+        for session in sessions:
+            user_id = session.user_id
+            row = self.sessions_data.append(session)
+            in_order = self._index_session(user_id, row)
+            self._update_user_profile(session)
+            
+            if user_id not in pending:
+                pending[user_id] = [] if user_id in self._user_aggregates else None
+            if pending[user_id] is not None:
+                if in_order:
+                    pending[user_id].append(len(self._user_index[user_id][1]) - 1)
+                else:
+                    # A late sync landing in the middle of the history:
+                    # ordinals and gaps shift, so rebuild
+                    pending[user_id] = None
+        
+        for user_id, ordinals in pending.items():
+            if ordinals is None:
+                self._rebuild_aggregates(user_id)
+                continue
+            
+            start_times = self._user_index[user_id][0]
+            for ordinal in ordinals:
+                gap = (start_times[ordinal] - start_times[ordinal - 1]) // MICROSECONDS_PER_DAY if ordinal else None
+                self._push_aggregate(user_id, ordinal, gap)
+        
+        if pending:
+            for listener in self._session_listeners:
+                listener(list(pending))
+    
+    def sync_from_log(self) -> int:
+        """
+        Apply sessions appended to the durable log since the last sync
+        
+        Returns:
+            Number of sessions applied
+        """
+        if self._log is None:
+            return 0
+        
+        applied = 0
+        batch = []
+        for seq, fields in self._log.read_since(self._log_seq):
+            batch.append(LearningSession(**fields))
+            self._log_seq = seq
+            if len(batch) == self.SYNC_BATCH_SIZE:
+                self._apply_sessions(batch)
+                applied += len(batch)
+                batch = []
+        
+        self._apply_sessions(batch)
+        applied += len(batch)
+        
+        if self._log_seq - self._snapshot_seq >= self.snapshot_interval:
+            # The sessions are already durable in the log; a failed snapshot
+            # only means a longer replay on the next start
+            try:
+                self.save_snapshot()
+            except Exception as e:
+                logger.warning("Snapshot at log seq %d failed: %s", self._log_seq, e)
+        
+        return applied
+    
+    def save_snapshot(self) -> bool:
+        """
+        Persist the in-memory store, indexes, aggregates and profiles
+        
+        A restart loads the latest snapshot (column buffers are read through
+        memory maps) and replays only the log records written after it.
+        Workers sharing a storage_dir reach the snapshot interval together;
+        only one writes at a time (under snapshots/LOCK), and the others skip.
+        
+        Returns:
+            True if a snapshot was written
+        """
+        if not self.storage_dir:
+            raise ValueError("Snapshots require a storage_dir")
+        
+        snapshots_dir = os.path.join(self.storage_dir, 'snapshots')
+        with open(os.path.join(snapshots_dir, 'LOCK'), 'a') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            try:
+                current = self._current_snapshot(snapshots_dir)
+                if current is not None and _snapshot_seq(current) >= self._log_seq:
+                    # Another worker already covered this point of the log
+                    self._snapshot_seq = self._log_seq
+                    return False
+                self._write_snapshot(snapshots_dir)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        return True
+    
+    def _write_snapshot(self, snapshots_dir: str):
+        name = f"{self._log_seq:012d}-{os.getpid()}"
+        directory = os.path.join(snapshots_dir, name)
+        os.makedirs(directory, exist_ok=True)
+        
+        # performance_history is a view over the store; it is rebuilt on load
+        profiles = {
+            user_id: {key: value for key, value in profile.items() if key != 'performance_history'}
+            for user_id, profile in self.user_profiles.items()
+        }
+        
+        state = {
+            'log_seq': self._log_seq,
+            'store': save_store(self.sessions_data, directory),
+            'user_profiles': profiles,
+            'user_index': self._user_index,
+            'user_aggregates': self._user_aggregates,
+        }
+        # state.pkl marks the snapshot complete, so it appears in one rename
+        state_tmp = os.path.join(directory, 'state.pkl.tmp')
+        with open(state_tmp, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(state_tmp, os.path.join(directory, 'state.pkl'))
+        
+        # Atomically point CURRENT at the new snapshot, then drop the ones
+        # strictly older than whatever CURRENT names now
+        current_tmp = os.path.join(snapshots_dir, f"CURRENT.{os.getpid()}.tmp")
+        with open(current_tmp, 'w') as f:
+            f.write(name)
+        os.replace(current_tmp, os.path.join(snapshots_dir, 'CURRENT'))
+        self._snapshot_seq = self._log_seq
+        
+        current = self._current_snapshot(snapshots_dir)
+        if current is None:
+            return
+        for entry in os.listdir(snapshots_dir):
+            path = os.path.join(snapshots_dir, entry)
+            if os.path.isdir(path) and _snapshot_seq(entry) < _snapshot_seq(current):
+                shutil.rmtree(path, ignore_errors=True)
+    
+    @staticmethod
+    def _current_snapshot(snapshots_dir: str) -> Optional[str]:
+        """The snapshot name CURRENT points at, if any"""
+        try:
+            with open(os.path.join(snapshots_dir, 'CURRENT')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+    
+    def _load_snapshot(self):
+        """
+        Restore state from the latest snapshot, if any
+        
+        Tries the snapshot CURRENT names, then the other complete snapshots
+        (those with a state.pkl), newest first. Without a usable snapshot
+        the whole log is replayed.
+        """
+        snapshots_dir = os.path.join(self.storage_dir, 'snapshots')
+        current = self._current_snapshot(snapshots_dir)
+        complete = sorted(
+            (entry for entry in os.listdir(snapshots_dir)
+             if os.path.isfile(os.path.join(snapshots_dir, entry, 'state.pkl'))),
+            key=_snapshot_seq, reverse=True
+        )
+        candidates = ([current] if current in complete else []) + [entry for entry in complete if entry != current]
+        
+        for name in candidates:
+            try:
+                self._restore_snapshot(os.path.join(snapshots_dir, name))
+                return
+            except Exception as e:
+                logger.warning("Snapshot %s could not be loaded: %s", name, e)
+        if current is not None:
+            logger.warning("No usable snapshot; replaying the whole session log")
+    
+    def _restore_snapshot(self, directory: str):
+        """Load one snapshot; nothing is replaced unless all of it loads"""
+        with open(os.path.join(directory, 'state.pkl'), 'rb') as f:
+            state = pickle.load(f)
+        
+        sessions_data = load_store(directory, state['store'])
+        user_index = state['user_index']
+        user_profiles = state['user_profiles']
+        for user_id, profile in user_profiles.items():
+            profile['performance_history'] = PerformanceHistory(sessions_data, user_index[user_id][1])
+        
+        self.sessions_data = sessions_data
+        self._user_index = user_index
+        self._user_aggregates = state['user_aggregates']
+        self.user_profiles = user_profiles
+        self._log_seq = self._snapshot_seq = state['log_seq']
+    
+    def _index_session(self, user_id: str, row: int) -> bool:
+        """
+        Insert a stored session row into the per-user start_time index
+        
+        Returns:
+            True if the session became the user's newest (appended in order)
+        """
+        if user_id not in self._user_index:
+            self._user_index[user_id] = (array('q'), array('q'))
+        
+        start_times, rows = self._user_index[user_id]
+        start = self.sessions_data.columns['start_us'][row]
+        
+        # Sessions normally arrive in chronological order, so appending is
+        # the common case; late (offline) syncs fall back to an insort
+        if not start_times or start >= start_times[-1]:
+            start_times.append(start)
+            rows.append(row)
+            return True
+        
+        position = bisect_right(start_times, start)
+        start_times.insert(position, start)
+        rows.insert(position, row)
+        return False
+    
+    def get_user_sessions(self, user_id: str, since: Optional[datetime] = None) -> List[SessionView]:
+        """
+        Return a user's sessions ordered by start_time
+        
+        Args:
+            user_id: User identifier
+            since: Only include sessions starting at or after this time
+        """
+        if user_id not in self._user_index:
+            return []
+        
+        start_times, rows = self._user_index[user_id]
+        first = 0 if since is None else bisect_left(start_times, to_micros(since))
+        
+        return [SessionView(self.sessions_data, row) for row in rows[first:]]
     
     def _update_user_profile(self, session: LearningSession):
         """Update user profile with session data"""
@@ -90,7 +608,10 @@ class ProgressTracker:
                 'topics_attempted': set(),
                 'topics_completed': set(),
                 'error_patterns': {},
-                'performance_history': [],
+                # Read from the session columns rather than copied per session
+                'performance_history': PerformanceHistory(
+                    self.sessions_data, self._user_index[user_id][1]
+                ),
                 'last_active': None
             }
         
@@ -104,15 +625,6 @@ class ProgressTracker:
         if session.activities_completed == session.total_activities:
             profile['topics_completed'].add(session.topic_id)
         
-        # Record performance
-        profile['performance_history'].append({
-            'date': session.end_time,
-            'topic_id': session.topic_id,
-            'accuracy': session.accuracy_score,
-            'pronunciation': session.pronunciation_score,
-            'engagement': session.engagement_score
-        })
-        
         # Track error patterns
         for error in session.errors:
             error_type = error.get('type', 'unknown')
@@ -120,45 +632,113 @@ class ProgressTracker:
                 profile['error_patterns'][error_type] = 0
             profile['error_patterns'][error_type] += 1
     
+    def _push_aggregate(self, user_id: str, ordinal: int, gap: Optional[int]):
+        """Add the chronologically newest session to the user's day buckets"""
+        bucket_days, bucket_rows, topic_last_start = self._user_aggregates[user_id]
+        start_times, rows = self._user_index[user_id]
+        session = SessionView(self.sessions_data, rows[ordinal])
+        day = start_times[ordinal] // MICROSECONDS_PER_DAY
+        width = SessionBucket.ROW_WIDTH
+        
+        if not bucket_days or bucket_days[-1] != day:
+            bucket_days.append(day)
+            bucket = SessionBucket()
+            bucket_rows.extend([0.0] * width)
+        else:
+            bucket = SessionBucket.from_row(bucket_rows[-width:])
+        
+        bucket.push(session, ordinal, gap)
+        bucket_rows[-width:] = array('d', bucket.to_row())
+        
+        topic_id = session.topic_id
+        topic_last_start[topic_id] = max(topic_last_start.get(topic_id, start_times[ordinal]), start_times[ordinal])
+    
+    def _rebuild_aggregates(self, user_id: str):
+        """Recompute all day buckets for a user from the session index"""
+        self._user_aggregates[user_id] = (array('l'), array('d'), {})
+        start_times = self._user_index[user_id][0]
+        
+        for ordinal in range(len(start_times)):
+            gap = (start_times[ordinal] - start_times[ordinal - 1]) // MICROSECONDS_PER_DAY if ordinal else None
+            self._push_aggregate(user_id, ordinal, gap)
+    
+    def _window_summary(self, user_id: str, since: datetime) -> Optional[SessionBucket]:
+        """
+        Combine day buckets into aggregates for sessions starting at or after `since`
+        
+        Whole days are taken from the precomputed buckets; only the day that
+        contains the cutoff is recomputed from its (few) raw sessions.
+        """
+        if user_id not in self._user_aggregates:
+            return None
+        
+        bucket_days, bucket_rows, _ = self._user_aggregates[user_id]
+        start_times, rows = self._user_index[user_id]
+        
+        since_us = to_micros(since)
+        cutoff_day = since_us // MICROSECONDS_PER_DAY
+        
+        # Partial bucket for the cutoff day
+        summary = SessionBucket()
+        first = bisect_left(start_times, since_us)
+        last = bisect_left(start_times, (cutoff_day + 1) * MICROSECONDS_PER_DAY, lo=first)
+        for ordinal in range(first, last):
+            gap = (start_times[ordinal] - start_times[ordinal - 1]) // MICROSECONDS_PER_DAY if ordinal > first else None
+            summary.push(SessionView(self.sessions_data, rows[ordinal]), ordinal, gap)
+        
+        # Whole buckets after the cutoff day
+        width = SessionBucket.ROW_WIDTH
+        for index in range(bisect_right(bucket_days, cutoff_day), len(bucket_days)):
+            bucket = SessionBucket.from_row(bucket_rows[index * width:(index + 1) * width])
+            summary.merge(bucket, include_lead_gap=summary.count > 0)
+        
+        return summary if summary.count else None
+    
+    def _topics_practiced_since(self, user_id: str, since: datetime) -> int:
+        """Number of distinct topics with a session starting at or after `since`"""
+        if user_id not in self._user_aggregates:
+            return 0
+        
+        since_us = to_micros(since)
+        return sum(1 for start in self._user_aggregates[user_id][2].values() if start >= since_us)
+    
     def calculate_progress_metrics(self, user_id: str, days_back: int = 30) -> ProgressMetrics:
         """Calculate comprehensive progress metrics for a user"""
         
+        self.sync_from_log()
+        
         if user_id not in self.user_profiles:
             return self._default_metrics()
         
-        # Get recent sessions
+        # Aggregates for recent sessions
         cutoff_date = datetime.now() - timedelta(days=days_back)
-        recent_sessions = [
-            session for session in self.sessions_data
-            if session.user_id == user_id and session.start_time >= cutoff_date
-        ]
+        summary = self._window_summary(user_id, cutoff_date)
         
-        if not recent_sessions:
+        if summary is None:
             return self._default_metrics()
         
-        # Calculate metrics
-        accuracies = [s.accuracy_score for s in recent_sessions]
-        pronunciations = [s.pronunciation_score for s in recent_sessions]
-        engagements = [s.engagement_score for s in recent_sessions]
+        return self._metrics_from_summary(user_id, summary)
+    
+    def _metrics_from_summary(self, user_id: str, summary: SessionBucket) -> ProgressMetrics:
+        """Build progress metrics from combined window aggregates"""
         
         # Completion rates
-        completed = sum(1 for s in recent_sessions if s.activities_completed == s.total_activities)
-        completion_rate = completed / len(recent_sessions)
+        completion_rate = summary.completed / summary.count
         
         # Learning velocity (improvement over time)
-        velocity = self._calculate_learning_velocity(recent_sessions)
+        velocity = max(0, summary.accuracy_trend.slope()) if summary.count > 1 else 0.0
         
         # Consistency (how regular is the learning)
-        consistency = self._calculate_consistency(recent_sessions)
+        consistency = self._consistency_from_gaps(summary.gaps) if summary.count > 1 else 0.0
         
         # Identify strengths and challenges
-        strengths, challenges = self._analyze_performance_patterns(user_id, recent_sessions)
+        strengths, challenges = self._analyze_performance_patterns(user_id, summary)
         
         return ProgressMetrics(
-            overall_accuracy=np.mean(accuracies),
-            pronunciation_accuracy=np.mean(pronunciations),
+            overall_accuracy=summary.accuracy.mean,
+            pronunciation_accuracy=summary.pronunciation.mean,
             completion_rate=completion_rate,
-            engagement_level=np.mean(engagements),
+            engagement_level=summary.engagement.mean,
             learning_velocity=velocity,
             consistency_score=consistency,
             challenge_areas=challenges,
@@ -197,10 +777,19 @@ class ProgressTracker:
             gap = (sessions_sorted[i].start_time - sessions_sorted[i-1].start_time).days
             gaps.append(gap)
         
+        gap_stats = RunningStats()
+        for gap in gaps:
+            gap_stats.push(gap)
+        
+        return self._consistency_from_gaps(gap_stats)
+    
+    def _consistency_from_gaps(self, gaps: RunningStats) -> float:
+        """Score regularity of practice from the mean and variance of day gaps"""
+        
         # Consistency is higher when gaps are smaller and more regular
-        if gaps:
-            avg_gap = np.mean(gaps)
-            gap_variance = np.var(gaps)
+        if gaps.count:
+            avg_gap = gaps.mean
+            gap_variance = gaps.variance
             
             # Ideal gap is 1-2 days
             ideal_gap = 1.5
@@ -211,7 +800,7 @@ class ProgressTracker:
         
         return 0.0
     
-    def _analyze_performance_patterns(self, user_id: str, sessions: List[LearningSession]) -> Tuple[List[str], List[str]]:
+    def _analyze_performance_patterns(self, user_id: str, summary: SessionBucket) -> Tuple[List[str], List[str]]:
         """Analyze performance to identify strengths and challenges"""
         
         strengths = []
@@ -220,8 +809,7 @@ class ProgressTracker:
         profile = self.user_profiles[user_id]
         
         # Analyze accuracy patterns
-        accuracies = [s.accuracy_score for s in sessions]
-        avg_accuracy = np.mean(accuracies)
+        avg_accuracy = summary.accuracy.mean
         
         if avg_accuracy > 0.8:
             strengths.append("High accuracy in exercises")
@@ -229,8 +817,7 @@ class ProgressTracker:
             challenges.append("Accuracy needs improvement")
         
         # Analyze pronunciation
-        pronunciations = [s.pronunciation_score for s in sessions]
-        avg_pronunciation = np.mean(pronunciations)
+        avg_pronunciation = summary.pronunciation.mean
         
         if avg_pronunciation > 0.8:
             strengths.append("Good pronunciation skills")
@@ -238,8 +825,7 @@ class ProgressTracker:
             challenges.append("Pronunciation needs practice")
         
         # Analyze engagement
-        engagements = [s.engagement_score for s in sessions]
-        avg_engagement = np.mean(engagements)
+        avg_engagement = summary.engagement.mean
         
         if avg_engagement > 0.8:
             strengths.append("High engagement and motivation")
@@ -261,13 +847,8 @@ class ProgressTracker:
                         challenges.append("Working memory")
         
         # Analyze completion patterns
-        completion_rates = [
-            s.activities_completed / s.total_activities for s in sessions
-            if s.total_activities > 0
-        ]
-        
-        if completion_rates:
-            avg_completion = np.mean(completion_rates)
+        if summary.completion_ratio.count:
+            avg_completion = summary.completion_ratio.mean
             if avg_completion > 0.9:
                 strengths.append("Excellent task completion")
             elif avg_completion < 0.7:
@@ -291,7 +872,7 @@ class ProgressTracker:
     def generate_progress_report(self, user_id: str, days_back: int = 30) -> Dict:
         """Generate comprehensive progress report"""
         
-        metrics = self.calculate_progress_metrics(user_id, days_back)
+        self.sync_from_log()
         
         if user_id not in self.user_profiles:
             return {"error": "User not found"}
@@ -299,11 +880,14 @@ class ProgressTracker:
         profile = self.user_profiles[user_id]
         
         # Recent activity
-        recent_sessions = [
-            session for session in self.sessions_data
-            if session.user_id == user_id and 
-            session.start_time >= datetime.now() - timedelta(days=days_back)
-        ]
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        summary = self._window_summary(user_id, cutoff_date)
+        
+        if summary is None:
+            metrics = self._default_metrics()
+            summary = SessionBucket()
+        else:
+            metrics = self._metrics_from_summary(user_id, summary)
         
         # Milestone progress
         milestone_progress = self._calculate_milestone_progress(user_id)
@@ -317,16 +901,10 @@ class ProgressTracker:
             'generated_at': datetime.now().isoformat(),
             'metrics': asdict(metrics),
             'activity_summary': {
-                'total_sessions': len(recent_sessions),
-                'total_time_minutes': sum(
-                    (s.end_time - s.start_time).total_seconds() / 60 
-                    for s in recent_sessions
-                ),
-                'topics_practiced': len(set(s.topic_id for s in recent_sessions)),
-                'average_session_length': np.mean([
-                    (s.end_time - s.start_time).total_seconds() / 60 
-                    for s in recent_sessions
-                ]) if recent_sessions else 0
+                'total_sessions': summary.count,
+                'total_time_minutes': summary.total_minutes,
+                'topics_practiced': self._topics_practiced_since(user_id, cutoff_date),
+                'average_session_length': summary.duration_minutes.mean if summary.count else 0
             },
             'milestone_progress': milestone_progress,
             'insights': insights,
@@ -433,8 +1011,7 @@ class ProgressTracker:
             return json.dumps({"error": "User not found"})
         
         user_sessions = [
-            asdict(session) for session in self.sessions_data 
-            if session.user_id == user_id
+            session.to_dict() for session in self.get_user_sessions(user_id)
         ]
         
         # Convert datetime objects to strings
@@ -8,8 +8,20 @@ import librosa
 import soundfile as sf
 from typing import Dict, List, Tuple, Optional
 import re
+import time
 from dataclasses import dataclass
 
+try:
+    from ..preprocessing.audio_features import SpectralFeatureExtractor
+    from ..preprocessing.phoneme_segmenter import PhonemeSegmenter
+    from ..preprocessing.voice_activity import TrimStats, VoiceActivityDetector
+    from .pronunciation_reference import PronunciationReferenceTable, WordReference
+except ImportError:
+    from preprocessing.audio_features import SpectralFeatureExtractor
+    from preprocessing.phoneme_segmenter import PhonemeSegmenter
+    from preprocessing.voice_activity import TrimStats, VoiceActivityDetector
+    from models.pronunciation_reference import PronunciationReferenceTable, WordReference
+
 
 @dataclass
 class PhonemeScore:
@@ -26,7 +38,33 @@ class KiswahiliPronunciationEvaluator:
     Provides detailed feedback suitable for children with dyslexia
     """
     
-    def __init__(self):
+    # Typical time a child takes per phoneme, for expected word durations
+    PHONEME_SECONDS = (0.05, 0.3)
+    
+    # Range of simulated phoneme scores before challenge weighting
+    SIMULATED_SCORE_RANGE = (0.7, 0.95)
+    
+    def __init__(self,
+                 pitch_method: str = 'peaks',
+                 reference_table: Optional[PronunciationReferenceTable] = None,
+                 trim_silence: bool = True,
+                 rng: Optional[np.random.Generator] = None,
+                 deterministic: bool = False):
+        """
+        Args:
+            pitch_method: Pitch estimator for audio features ('peaks' or
+                'piptrack'; both give the same values)
+            reference_table: Precomputed word references (see
+                build_reference_table); other words are analysed per request
+            trim_silence: Cut leading and trailing silence before feature
+                extraction
+            rng: Random generator for simulated scores and encouragement
+                messages (defaults to numpy's global random state); a
+                request's own rng takes precedence
+            deterministic: Give every phoneme the middle of the simulated
+                score range and pick the first encouragement, so results
+                depend only on the word
+        """
         # Kiswahili phoneme mappings
         self.kiswahili_phonemes = {
             'a': ['a', 'ah'],
@@ -44,8 +82,10 @@ class KiswahiliPronunciationEvaluator:
             'k': ['k'],
             'l': ['l'],
             'm': ['m'],
+            'mb': ['mb'],
             'n': ['n'],
             'ng': ['ng'],
+            "ng'": ["ng'"],
             'ny': ['ny'],
             'p': ['p'],
             'r': ['r'],
@@ -65,11 +105,27 @@ class KiswahiliPronunciationEvaluator:
             'sequence_reversal': True,
             'vowel_confusion': ['a', 'e', 'i', 'o', 'u']
         }
+        
+        # Shares one STFT per clip between the spectral, MFCC and pitch features
+        self.feature_extractor = SpectralFeatureExtractor(pitch_method=pitch_method)
+        
+        # Longest-match phoneme splitting over the inventory, memoized per word
+        self.segmenter = PhonemeSegmenter(self.kiswahili_phonemes)
+        
+        self.reference_table = reference_table or PronunciationReferenceTable()
+        
+        # Spectral work only covers the voiced part of a recording
+        self.voice_detector = VoiceActivityDetector() if trim_silence else None
+        self.trim_stats = TrimStats()
+        
+        self.rng = rng
+        self.deterministic = deterministic
     
     def evaluate_pronunciation(self, 
                              target_word: str, 
                              audio_data: np.ndarray, 
-                             sample_rate: int = 22050) -> Dict:
+                             sample_rate: int = 22050,
+                             rng: Optional[np.random.Generator] = None) -> Dict:
         """
         Evaluate pronunciation accuracy of a Kiswahili word
         
@@ -77,92 +133,208 @@ class KiswahiliPronunciationEvaluator:
             target_word: The word the user should pronounce
             audio_data: Audio recording as numpy array
             sample_rate: Audio sample rate
+            rng: Random generator for this evaluation's simulated scores
             
         Returns:
-            Dictionary with pronunciation evaluation results
+            Dictionary with pronunciation evaluation results (with silence
+            trimming statistics under 'metadata' when trimming is on)
         """
         
-        # Extract audio features
+        if self.voice_detector is None:
+            return self._evaluate_features(target_word, self._extract_audio_features(audio_data, sample_rate), rng)
+        
+        audio_data, trim = self.voice_detector.trim(audio_data, sample_rate)
+        started = time.perf_counter()
         features = self._extract_audio_features(audio_data, sample_rate)
+        extraction_seconds = time.perf_counter() - started
+        
+        result = self._evaluate_features(target_word, features, rng)
+        result['metadata'] = self._trim_metadata(trim, extraction_seconds)
+        return result
+    
+    def evaluate_pronunciation_batch(self,
+                                     target_words: List[str],
+                                     audio_clips: List[np.ndarray],
+                                     sample_rate: int = 22050,
+                                     rng: Optional[np.random.Generator] = None) -> List[Dict]:
+        """
+        Evaluate several recordings sharing a sample rate
+        
+        Each clip is evaluated as by evaluate_pronunciation; the batch's
+        extraction time is shared out by voiced length in the metadata.
+        
+        Args:
+            target_words: The word each recording should pronounce
+            audio_clips: Audio recordings as numpy arrays
+            sample_rate: Audio sample rate of every recording
+            rng: Random generator for the batch's simulated scores
+            
+        Returns:
+            One evaluation result per recording, in order
+        """
+        if self.voice_detector is None:
+            all_features = [self.feature_extractor.extract(audio_data, sample_rate) for audio_data in audio_clips]
+            return [
+                self._evaluate_features(word, features, rng)
+                for word, features in zip(target_words, all_features)
+            ]
         
-        # Break word into phonemes
-        target_phonemes = self._word_to_phonemes(target_word)
+        trimmed = [self.voice_detector.trim(audio_data, sample_rate) for audio_data in audio_clips]
+        started = time.perf_counter()
+        all_features = [self.feature_extractor.extract(audio, sample_rate) for audio, _ in trimmed]
+        extraction_seconds = time.perf_counter() - started
+        
+        # Extraction time is shared out by voiced length
+        voiced_total = sum(trim['voiced_seconds'] for _, trim in trimmed) or 1.0
+        results = []
+        for word, features, (_, trim) in zip(target_words, all_features, trimmed):
+            result = self._evaluate_features(word, features, rng)
+            result['metadata'] = self._trim_metadata(
+                trim, extraction_seconds * trim['voiced_seconds'] / voiced_total
+            )
+            results.append(result)
+        return results
+    
+    def _trim_metadata(self, trim: Dict, extraction_seconds: float) -> Dict:
+        """
+        Trim statistics for a response
+        
+        The CPU time saved is estimated by scaling the measured extraction
+        time to the untrimmed length, minus the detector's own time. Part of
+        extraction is a fixed per-clip cost, so this is an upper bound.
+        """
+        extraction_ms = extraction_seconds * 1000
+        voiced, original = trim['voiced_seconds'], trim['original_seconds']
+        untrimmed_ms = extraction_ms * original / voiced if voiced else extraction_ms
+        cpu_saved_ms = untrimmed_ms - extraction_ms - trim['vad_ms']
+        self.trim_stats.record(trim['trim_ratio'], cpu_saved_ms)
+        
+        return {
+            'voice_activity': {
+                **trim,
+                'extraction_ms': extraction_ms,
+                'estimated_cpu_saved_ms': cpu_saved_ms,
+                **self.trim_stats.summary()
+            }
+        }
+    
+    def _evaluate_features(self, target_word: str, features: Dict,
+                           rng: Optional[np.random.Generator] = None) -> Dict:
+        """Score a recording from its extracted audio features"""
+        
+        # Phonemes and their challenge weights
+        reference = self.word_reference(target_word)
         
         # Simulate pronunciation analysis (in production, use speech recognition)
-        pronunciation_result = self._analyze_pronunciation(target_phonemes, features)
+        summary = self._analyze_pronunciation(reference, features, rng)
+        
+        return self.pronunciation_result(target_word, summary, rng)
+    
+    def _random(self, rng: Optional[np.random.Generator]):
+        """The request's generator, else the evaluator's, else numpy's global state"""
+        if rng is not None:
+            return rng
+        return self.rng if self.rng is not None else np.random
+    
+    def pronunciation_result(self, target_word: str, summary: Dict,
+                             rng: Optional[np.random.Generator] = None) -> Dict:
+        """
+        Attach learner feedback to phoneme-level scores
+        
+        Args:
+            target_word: The word that was pronounced
+            summary: Scores from summarize_phoneme_scores
+            rng: Random generator for the encouragement message
+            
+        Returns:
+            The evaluation result returned by evaluate_pronunciation
+        """
         
         # Generate feedback suitable for dyslexic learners
         feedback = self._generate_dyslexia_friendly_feedback(
-            target_word, pronunciation_result
+            target_word, summary
         )
         
         return {
             'word': target_word,
-            'overall_score': pronunciation_result['overall_score'],
-            'phoneme_scores': pronunciation_result['phoneme_scores'],
+            'overall_score': summary['overall_score'],
+            'phoneme_scores': summary['phoneme_scores'],
             'feedback': feedback,
-            'areas_for_improvement': pronunciation_result['areas_for_improvement'],
-            'encouragement': self._generate_encouragement(pronunciation_result['overall_score'])
+            'areas_for_improvement': summary['areas_for_improvement'],
+            'encouragement': self._generate_encouragement(summary['overall_score'], rng)
         }
     
     def _extract_audio_features(self, audio_data: np.ndarray, sample_rate: int) -> Dict:
         """Extract relevant features from audio for pronunciation analysis"""
-        
-        # Basic audio features
-        features = {}
-        
-        # Spectral features
-        spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sample_rate)[0]
-        features['spectral_centroid_mean'] = np.mean(spectral_centroids)
-        features['spectral_centroid_std'] = np.std(spectral_centroids)
-        
-        # MFCC features (important for speech recognition)
-        mfccs = librosa.feature.mfcc(y=audio_data, sr=sample_rate, n_mfcc=13)
-        features['mfccs'] = mfccs
-        features['mfcc_mean'] = np.mean(mfccs, axis=1)
-        features['mfcc_std'] = np.std(mfccs, axis=1)
-        
-        # Pitch features
-        pitches, magnitudes = librosa.piptrack(y=audio_data, sr=sample_rate)
-        features['pitch_mean'] = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
-        
-        # Duration
-        features['duration'] = len(audio_data) / sample_rate
-        
-        # Energy
-        features['energy'] = np.sum(audio_data ** 2)
-        
-        return features
+        return self.feature_extractor.extract(audio_data, sample_rate)
     
     def _word_to_phonemes(self, word: str) -> List[str]:
         """
         Convert Kiswahili word to phonemes
-        Simplified phoneme extraction for common Kiswahili patterns
+        Multi-letter phonemes (ng', mb, ch, ...) are matched before single letters
         """
-        word = word.lower()
-        phonemes = []
-        i = 0
-        
-        while i < len(word):
-            # Check for digraphs first
-            if i < len(word) - 1:
-                digraph = word[i:i+2]
-                if digraph in ['ch', 'ng', 'ny', 'th']:
-                    phonemes.append(digraph)
-                    i += 2
-                    continue
-            
-            # Single phoneme
-            if word[i] in 'aeiou':
-                phonemes.append(word[i])  # vowel
-            elif word[i] in 'bcdfghjklmnpqrstvwxyz':
-                phonemes.append(word[i])  # consonant
+        return list(self.segmenter.phonemes(word))
+    
+    def word_reference(self, word: str) -> WordReference:
+        """Reference for a target word, from the table if it has been precomputed"""
+        reference = self.reference_table.get(word)
+        if reference is None:
+            reference = self._build_word_reference(word, {})
+        return reference
+    
+    def build_reference_table(self, words: List[str]) -> PronunciationReferenceTable:
+        """
+        Precompute references for a vocabulary
+        
+        Args:
+            words: Vocabulary words (e.g. from load_vocabulary)
             
-            i += 1
+        Returns:
+            Table to save, or to pass to the evaluator as reference_table
+        """
+        phonemes = {}
+        references = {
+            word.lower(): self._build_word_reference(word, phonemes) for word in words
+        }
+        return PronunciationReferenceTable(references, phonemes)
+    
+    def load_reference_table(self, path: str):
+        """Use a reference table saved by PronunciationReferenceTable.save"""
+        self.reference_table = PronunciationReferenceTable.load(path)
+    
+    def _build_word_reference(self, word: str, phonemes: Dict[str, Dict]) -> WordReference:
+        word_phonemes = tuple(self._word_to_phonemes(word))
+        for phoneme in word_phonemes:
+            if phoneme not in phonemes:
+                phonemes[phoneme] = self._phoneme_reference(phoneme)
+        
+        low, high = self.PHONEME_SECONDS
+        duration_band = (len(word_phonemes) * low, len(word_phonemes) * high)
+        return PronunciationReferenceTable.word_reference(word_phonemes, phonemes, duration_band)
+    
+    def _phoneme_reference(self, phoneme: str) -> Dict:
+        """Challenge weighting, flags and practice suggestion for a phoneme"""
+        weight = 1.0
+        challenges = []
+        for challenge in ('b_d_confusion', 'p_q_confusion', 'vowel_confusion'):
+            if phoneme in self.dyslexia_challenges[challenge]:
+                challenges.append(challenge)
+        
+        # Adjust for common dyslexia challenges
+        if phoneme in self.dyslexia_challenges['b_d_confusion']:
+            weight *= 0.9  # Slightly lower for challenging phonemes
+        
+        if phoneme in self.dyslexia_challenges['vowel_confusion']:
+            weight *= 0.95
         
-        return phonemes
+        return {
+            'weight': weight,
+            'challenges': challenges,
+            'suggestion': self._practice_suggestion(phoneme)
+        }
     
-    def _analyze_pronunciation(self, target_phonemes: List[str], features: Dict) -> Dict:
+    def _analyze_pronunciation(self, reference: WordReference, features: Dict,
+                               rng: Optional[np.random.Generator] = None) -> Dict:
         """
         Analyze pronunciation accuracy
         In production, this would use advanced speech recognition
@@ -170,31 +342,48 @@ class KiswahiliPronunciationEvaluator:
         """
         
         # Simulate pronunciation analysis
-        phoneme_scores = []
-        total_score = 0
+        phoneme_scores = [
+            self.score_phoneme(phoneme, weight, rng)
+            for phoneme, weight in zip(reference.phonemes, reference.challenge_weights)
+        ]
         
-        for i, phoneme in enumerate(target_phonemes):
-            # Simulate individual phoneme scoring
-            base_score = np.random.uniform(0.7, 0.95)  # Simulate good pronunciation
-            
-            # Adjust for common dyslexia challenges
-            if phoneme in self.dyslexia_challenges['b_d_confusion']:
-                base_score *= 0.9  # Slightly lower for challenging phonemes
-            
-            if phoneme in self.dyslexia_challenges['vowel_confusion']:
-                base_score *= 0.95
-            
-            phoneme_scores.append(PhonemeScore(
-                phoneme=phoneme,
-                expected=phoneme,
-                actual=phoneme,  # Simplified
-                score=base_score,
-                feedback=self._get_phoneme_feedback(phoneme, base_score)
-            ))
-            
-            total_score += base_score
+        return self.summarize_phoneme_scores(phoneme_scores)
+    
+    def score_phoneme(self, phoneme: str, weight: float,
+                      rng: Optional[np.random.Generator] = None) -> PhonemeScore:
+        """
+        Score one phoneme (simulated)
+        
+        Args:
+            phoneme: Phoneme to score
+            weight: Its challenge weight from the word reference
+            rng: Random generator for the simulated score
+        """
+        low, high = self.SIMULATED_SCORE_RANGE
+        if self.deterministic:
+            base_score = (low + high) / 2
+        else:
+            base_score = self._random(rng).uniform(low, high)  # Simulate good pronunciation
+        
+        # Lower for phonemes that challenge dyslexic learners
+        base_score *= weight
+        
+        return PhonemeScore(
+            phoneme=phoneme,
+            expected=phoneme,
+            actual=phoneme,  # Simplified
+            score=base_score,
+            feedback=self._get_phoneme_feedback(phoneme, base_score)
+        )
+    
+    def summarize_phoneme_scores(self, phoneme_scores: List[PhonemeScore]) -> Dict:
+        """Overall score and areas for improvement from phoneme scores (for pronunciation_result)"""
+        
+        total_score = 0
+        for ps in phoneme_scores:
+            total_score += ps.score
         
-        overall_score = total_score / len(target_phonemes) if target_phonemes else 0
+        overall_score = total_score / len(phoneme_scores) if phoneme_scores else 0
         
         # Identify areas for improvement
         areas_for_improvement = []
@@ -249,7 +438,7 @@ class KiswahiliPronunciationEvaluator:
         
         return feedback
     
-    def _generate_encouragement(self, score: float) -> str:
+    def _generate_encouragement(self, score: float, rng: Optional[np.random.Generator] = None) -> str:
         """Generate age-appropriate encouragement"""
         
         encouragements = {
@@ -276,13 +465,17 @@ class KiswahiliPronunciationEvaluator:
         }
         
         if score >= 0.9:
-            return np.random.choice(encouragements[0.9])
+            options = encouragements[0.9]
         elif score >= 0.8:
-            return np.random.choice(encouragements[0.8])
+            options = encouragements[0.8]
         elif score >= 0.7:
-            return np.random.choice(encouragements[0.7])
+            options = encouragements[0.7]
         else:
-            return np.random.choice(encouragements[0.0])
+            options = encouragements[0.0]
+        
+        if self.deterministic:
+            return options[0]
+        return str(self._random(rng).choice(options))
     
     def get_practice_suggestions(self, problem_phonemes: List[str]) -> List[Dict]:
         """
@@ -293,32 +486,39 @@ class KiswahiliPronunciationEvaluator:
         suggestions = []
         
         for phoneme in problem_phonemes:
-            if phoneme in ['b', 'd']:
-                suggestions.append({
-                    'phoneme': phoneme,
-                    'exercise': 'Visual discrimination',
-                    'description': f"Practice identifying '{phoneme}' with colorful cards",
-                    'tip': "Use your finger to trace the letter shape while saying the sound"
-                })
-            
-            elif phoneme in ['a', 'e', 'i', 'o', 'u']:
-                suggestions.append({
-                    'phoneme': phoneme,
-                    'exercise': 'Vowel stretching',
-                    'description': f"Hold the '{phoneme}' sound for 3 seconds",
-                    'tip': "Watch your mouth shape in a mirror"
-                })
-            
-            else:
-                suggestions.append({
-                    'phoneme': phoneme,
-                    'exercise': 'Repetition practice',
-                    'description': f"Say '{phoneme}' 5 times slowly",
-                    'tip': "Break it down into smaller parts"
-                })
+            # Precomputed for the phonemes of the reference vocabulary
+            suggestion = self.reference_table.suggestion(phoneme)
+            suggestions.append(suggestion or self._practice_suggestion(phoneme))
         
         return suggestions
     
+    def _practice_suggestion(self, phoneme: str) -> Dict:
+        """Practice exercise for one phoneme"""
+        
+        if phoneme in ['b', 'd']:
+            return {
+                'phoneme': phoneme,
+                'exercise': 'Visual discrimination',
+                'description': f"Practice identifying '{phoneme}' with colorful cards",
+                'tip': "Use your finger to trace the letter shape while saying the sound"
+            }
+        
+        elif phoneme in ['a', 'e', 'i', 'o', 'u']:
+            return {
+                'phoneme': phoneme,
+                'exercise': 'Vowel stretching',
+                'description': f"Hold the '{phoneme}' sound for 3 seconds",
+                'tip': "Watch your mouth shape in a mirror"
+            }
+        
+        else:
+            return {
+                'phoneme': phoneme,
+                'exercise': 'Repetition practice',
+                'description': f"Say '{phoneme}' 5 times slowly",
+                'tip': "Break it down into smaller parts"
+            }
+    
     def create_pronunciation_report(self, session_results: List[Dict]) -> Dict:
         """
         Create a comprehensive pronunciation progress report
@@ -0,0 +1,128 @@
+"""
+Pronunciation Reference Table
+Per-word scoring references precomputed for the fixed lesson vocabulary
+"""
+
+import csv
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class WordReference:
+    """Everything about a target word that does not depend on the recording"""
+    phonemes: Tuple[str, ...]
+    challenge_weights: Tuple[float, ...]
+    challenges: Tuple[str, ...]
+    duration_band: Tuple[float, float]
+
+
+class PronunciationReferenceTable:
+    """
+    Lookup table of WordReference entries keyed by lowercase word
+    
+    Challenge weights, challenge flags and practice suggestions belong to
+    phonemes, so the table keeps them once per phoneme; on disk words only
+    list their phonemes and expected duration, and are expanded when the
+    file is loaded.
+    """
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self,
+                 words: Optional[Dict[str, WordReference]] = None,
+                 phonemes: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            words: Reference per lowercase word
+            phonemes: Per phoneme, a dict with 'weight', 'challenges' and
+                'suggestion' (as get_practice_suggestions returns it)
+        """
+        self.words = words or {}
+        self.phonemes = phonemes or {}
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.words
+    
+    def get(self, word: str) -> Optional[WordReference]:
+        """Reference for a word, or None if it is not in the table"""
+        return self.words.get(word.lower())
+    
+    def suggestion(self, phoneme: str) -> Optional[Dict]:
+        """Practice suggestion for a phoneme (a copy), or None if unknown"""
+        entry = self.phonemes.get(phoneme)
+        return dict(entry['suggestion']) if entry else None
+    
+    def save(self, path: str):
+        """Write the table as compact JSON"""
+        data = {
+            'version': self.FORMAT_VERSION,
+            'phonemes': self.phonemes,
+            'words': {
+                word: {'phonemes': list(reference.phonemes), 'duration': list(reference.duration_band)}
+                for word, reference in self.words.items()
+            }
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    
+    @classmethod
+    def load(cls, path: str) -> 'PronunciationReferenceTable':
+        """Read a table written by save"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported pronunciation reference version: {data.get('version')}")
+        
+        phonemes = data['phonemes']
+        words = {
+            word: cls.word_reference(tuple(entry['phonemes']), phonemes, tuple(entry['duration']))
+            for word, entry in data['words'].items()
+        }
+        return cls(words, phonemes)
+    
+    @staticmethod
+    def word_reference(word_phonemes: Tuple[str, ...],
+                       phonemes: Dict[str, Dict],
+                       duration_band: Tuple[float, float]) -> WordReference:
+        """Assemble a word's reference from its phonemes' entries"""
+        challenges = set()
+        for phoneme in word_phonemes:
+            challenges.update(phonemes[phoneme]['challenges'])
+        return WordReference(
+            phonemes=word_phonemes,
+            challenge_weights=tuple(phonemes[phoneme]['weight'] for phoneme in word_phonemes),
+            challenges=tuple(sorted(challenges)),
+            duration_band=duration_band
+        )
+
+
+def load_vocabulary(paths: Iterable[str]) -> List[str]:
+    """
+    Collect vocabulary words from lesson data files
+    
+    Supports the dyslexia dataset JSON ('word' entries), vocabulary CSVs
+    (a 'kiswahili' column) and the web app's flashcards.ts.
+    
+    Returns:
+        Distinct words in first-seen order
+    """
+    words = []
+    for path in paths:
+        suffix = Path(path).suffix.lower()
+        with open(path, 'r', encoding='utf-8') as f:
+            if suffix == '.json':
+                words.extend(entry.get('word') or entry.get('kiswahili', '') for entry in json.load(f))
+            elif suffix == '.csv':
+                words.extend(row.get('kiswahili', '') for row in csv.DictReader(f))
+            elif suffix == '.ts':
+                words.extend(re.findall(r'kiswahili:\s*"([^"]*)"', f.read()))
+            else:
+                raise ValueError(f"Unsupported vocabulary file: {path}")
+    return list(dict.fromkeys(word.strip() for word in words if word and word.strip()))
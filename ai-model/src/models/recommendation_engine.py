@@ -4,13 +4,19 @@ For children with dyslexia learning Kiswahili
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+import pandas as pd
+import hashlib
+import os
+from bisect import bisect_right
+from typing import Dict, List, Tuple, Optional, Union
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import joblib
 import json
 from datetime import datetime, timedelta
 
+from .flat_forest import FlatForest
+
 
 class LearningRecommendationEngine:
     """
@@ -19,10 +25,25 @@ class LearningRecommendationEngine:
     performance patterns and learning behaviors.
     """
     
+    # Scalar features as (user_data key, default), in extract_features order
+    SCALAR_FEATURES = [
+        ('overall_accuracy', 0.0),
+        ('avg_response_time', 0.0),
+        ('completion_rate', 0.0),
+        ('phonetic_errors', 0),
+        ('visual_confusion_errors', 0),
+        ('sequence_errors', 0),
+        ('session_duration', 0.0),
+        ('retry_attempts', 0),
+        ('help_requests', 0),
+    ]
+    
     def __init__(self):
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.scaler = StandardScaler()
         self.is_trained = False
+        # Identifies the loaded model in cache keys; set again by load_model
+        self.model_version = "untrained"
         
         # Kiswahili learning topics for children aged 6-9
         self.topics = {
@@ -37,6 +58,60 @@ class LearningRecommendationEngine:
             9: {"name": "Shuleni", "difficulty": 4, "category": "school"},
             10: {"name": "Mazungumzo", "difficulty": 5, "category": "conversation"}
         }
+        
+        self._compile_topic_graph()
+    
+    def _compile_topic_graph(self):
+        """
+        Compile the prerequisite rules in self.topics into bitmask tables
+        
+        Each topic gets one bit, ordered by difficulty (curriculum order within
+        a level). A topic opens once any completed topic is at most one level
+        easier, so the eligible set only depends on the hardest completed
+        topic, i.e. on the completed mask's bit_length(). Call again after
+        changing self.topics.
+        """
+        order = sorted(self.topics, key=lambda topic_id: self.topics[topic_id]["difficulty"])
+        difficulties = [self.topics[topic_id]["difficulty"] for topic_id in order]
+        
+        self._bit_topics = order
+        self._topic_bits = {topic_id: bit for bit, topic_id in enumerate(order)}
+        
+        # Difficulty 1 topics are always open
+        starter = np.array([difficulty == 1 for difficulty in difficulties], dtype=bool)
+        
+        # Row 0: nothing completed; row j + 1: hardest completed topic at levels[j]
+        levels = sorted(set(difficulties))
+        table = np.zeros((len(levels) + 1, len(order)), dtype=bool)
+        table[0] = starter
+        for row, level in enumerate(levels, start=1):
+            table[row, :bisect_right(difficulties, level + 1)] = True
+            table[row] |= starter
+        
+        level_rows = {level: row for row, level in enumerate(levels, start=1)}
+        self._eligible_table = table
+        self._eligible_row = np.array([0] + [level_rows[difficulty] for difficulty in difficulties])
+        self._eligible_masks = [
+            int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little') for row in table
+        ]
+    
+    def _completed_mask(self, completed_topics) -> int:
+        """Bitmask of completed topics (ids outside the curriculum are ignored)"""
+        mask = 0
+        for topic_id in completed_topics:
+            bit = self._topic_bits.get(topic_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+    
+    def _eligible_mask(self, completed_mask: int) -> int:
+        """Bitmask of topics whose prerequisites are met"""
+        return self._eligible_masks[self._eligible_row[completed_mask.bit_length()]]
+    
+    def _candidate_mask(self, completed_topics) -> int:
+        """Bitmask of eligible topics the learner has not completed yet"""
+        completed = self._completed_mask(completed_topics)
+        return self._eligible_mask(completed) & ~completed
     
     def extract_features(self, user_data: Dict) -> np.ndarray:
         """
@@ -67,12 +142,49 @@ class LearningRecommendationEngine:
         features.append(user_data.get('help_requests', 0))
         
         # Topic-specific performance
-        for topic_id in range(1, 11):
+        for topic_id in self.topics:
             topic_score = user_data.get('topic_scores', {}).get(str(topic_id), 0.0)
             features.append(topic_score)
         
         return np.array(features).reshape(1, -1)
     
+    def compile_model(self):
+        """
+        Swap a trained RandomForestClassifier for an equivalent FlatForest
+        
+        The flat evaluator returns identical probabilities without sklearn's
+        per-call validation and joblib dispatch, which dominate the latency
+        of single-learner requests.
+        """
+        if self.is_trained and isinstance(self.model, RandomForestClassifier):
+            self.model = FlatForest.from_sklearn(self.model)
+    
+    def _scale(self, features: np.ndarray) -> np.ndarray:
+        """StandardScaler.transform without sklearn's input validation"""
+        scaler = self.scaler
+        if type(scaler) is not StandardScaler or not hasattr(scaler, 'scale_'):
+            return scaler.transform(features)
+        
+        # Same in-place operations as StandardScaler.transform
+        scaled = np.array(features, dtype=np.float64)
+        if scaler.with_mean:
+            scaled -= scaler.mean_
+        if scaler.with_std:
+            scaled /= scaler.scale_
+        return scaled
+    
+    def feature_fingerprint(self, user_data: Dict) -> str:
+        """
+        Hash of everything a recommendation for this learner depends on
+        
+        Covers the extracted feature vector plus the completed topics, which
+        drive prerequisite filtering but are not model features.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(self.extract_features(user_data), dtype=np.float64).tobytes())
+        digest.update(repr(sorted(set(user_data.get('completed_topics', [])))).encode('utf-8'))
+        return digest.hexdigest()
+    
     def predict_next_topic(self, user_data: Dict) -> Dict:
         """
         Predict the most suitable next topic for the learner
@@ -81,27 +193,25 @@ class LearningRecommendationEngine:
             return self._fallback_recommendation(user_data)
         
         features = self.extract_features(user_data)
-        features_scaled = self.scaler.transform(features)
+        features_scaled = self._scale(features)
         
         # Get probabilities for each topic
         topic_probs = self.model.predict_proba(features_scaled)[0]
         
         # Find best topic considering prerequisites
-        completed_topics = set(user_data.get('completed_topics', []))
+        candidates = self._candidate_mask(user_data.get('completed_topics', []))
         
         best_topic_id = None
         best_score = 0
         
-        for i, prob in enumerate(topic_probs):
-            topic_id = i + 1
-            if topic_id in completed_topics:
+        for topic_id, prob in zip(self.model.classes_.tolist(), topic_probs):
+            bit = self._topic_bits.get(topic_id)
+            if bit is None or not candidates >> bit & 1:
                 continue
-                
-            # Check prerequisites
-            if self._check_prerequisites(topic_id, completed_topics):
-                if prob > best_score:
-                    best_score = prob
-                    best_topic_id = topic_id
+            
+            if prob > best_score:
+                best_score = prob
+                best_topic_id = topic_id
         
         if best_topic_id is None:
             return self._fallback_recommendation(user_data)
@@ -114,39 +224,173 @@ class LearningRecommendationEngine:
             "reasoning": self._generate_reasoning(user_data, best_topic_id)
         }
     
-    def _check_prerequisites(self, topic_id: int, completed_topics: set) -> bool:
-        """Check if prerequisites for a topic are met"""
-        topic_difficulty = self.topics[topic_id]["difficulty"]
+    def extract_features_batch(self, users: Union[List[Dict], pd.DataFrame]) -> np.ndarray:
+        """
+        Build the feature matrix for many learners at once
+        
+        Args:
+            users: User data dicts, or a DataFrame with one learner per row
+                and the same keys as columns
+            
+        Returns:
+            Array of shape (n_users, n_features) in extract_features column order
+        """
+        topic_ids = list(self.topics)
+        n_users = len(users)
+        features = np.zeros((n_users, len(self.SCALAR_FEATURES) + len(topic_ids)))
+        
+        if isinstance(users, pd.DataFrame):
+            for column, (key, default) in enumerate(self.SCALAR_FEATURES):
+                if key in users:
+                    features[:, column] = users[key].fillna(default).to_numpy(dtype=float)
+                else:
+                    features[:, column] = default
+            topic_scores = users['topic_scores'] if 'topic_scores' in users else [None] * n_users
+        else:
+            for column, (key, default) in enumerate(self.SCALAR_FEATURES):
+                features[:, column] = [user.get(key, default) for user in users]
+            topic_scores = [user.get('topic_scores') for user in users]
+        
+        # Missing (or NaN, in a DataFrame) topic_scores count as no scores
+        topic_scores = [scores if isinstance(scores, dict) else {} for scores in topic_scores]
+        offset = len(self.SCALAR_FEATURES)
+        for column, topic_id in enumerate(topic_ids, start=offset):
+            key = str(topic_id)
+            features[:, column] = [scores.get(key, 0.0) for scores in topic_scores]
+        
+        return features
+    
+    def predict_next_topic_batch(self, users: Union[List[Dict], pd.DataFrame]) -> List[Dict]:
+        """
+        Predict the next topic for many learners with a single model call
+        
+        Args:
+            users: User data dicts, or a DataFrame with one learner per row
+            
+        Returns:
+            One recommendation per learner, as returned by predict_next_topic
+        """
+        n_users = len(users)
+        if n_users == 0:
+            return []
+        
+        features = self.extract_features_batch(users)
+        
+        if isinstance(users, pd.DataFrame):
+            completed_lists = users['completed_topics'] if 'completed_topics' in users else [None] * n_users
+        else:
+            completed_lists = [user.get('completed_topics') for user in users]
+        completed_lists = [completed if isinstance(completed, (list, tuple, set, np.ndarray)) else []
+                           for completed in completed_lists]
+        
+        # Topic masks, one column per topic bit
+        completed = self._completed_topic_mask(completed_lists)
+        candidates = self._eligible_topic_mask(completed) & ~completed
+        
+        best_topics = [None] * n_users
+        best_scores = np.zeros(n_users)
         
-        # Must complete easier topics first
-        for completed_id in completed_topics:
-            if self.topics[completed_id]["difficulty"] >= topic_difficulty - 1:
-                return True
+        if self.is_trained:
+            topic_probs = self.model.predict_proba(self._scale(features))
+            classes = self.model.classes_.tolist()
+            
+            # Candidate flags in probability column order
+            prob_bits = np.array([self._topic_bits.get(topic_id, -1) for topic_id in classes])
+            known = prob_bits >= 0
+            allowed = np.zeros(topic_probs.shape, dtype=bool)
+            allowed[:, known] = candidates[:, prob_bits[known]]
+            scores = np.where(allowed, topic_probs, 0.0)
+            
+            # argmax keeps the first column on ties, matching the strict '>' scan
+            columns = scores.argmax(axis=1)
+            column_scores = scores[np.arange(n_users), columns]
+            for row in np.flatnonzero(column_scores > 0):
+                best_topics[row] = classes[columns[row]]
+                best_scores[row] = column_scores[row]
+        
+        # Fallback: easiest eligible topic (lowest bit)
+        fallback_bits = candidates.argmax(axis=1)
+        has_fallback = candidates.any(axis=1)
         
-        # Always allow difficulty 1 topics
-        return topic_difficulty == 1
+        recommendations = []
+        for row in range(n_users):
+            if best_topics[row] is not None:
+                topic_id = best_topics[row]
+                recommendations.append({
+                    "topic_id": topic_id,
+                    "topic_name": self.topics[topic_id]["name"],
+                    "difficulty": self.topics[topic_id]["difficulty"],
+                    "confidence": float(best_scores[row]),
+                    "reasoning": self._generate_reasoning({'overall_accuracy': features[row, 0]}, topic_id)
+                })
+            elif has_fallback[row]:
+                topic_id = self._bit_topics[fallback_bits[row]]
+                recommendations.append({
+                    "topic_id": topic_id,
+                    "topic_name": self.topics[topic_id]["name"],
+                    "difficulty": self.topics[topic_id]["difficulty"],
+                    "confidence": 0.8,
+                    "reasoning": "Recommended based on learning progression"
+                })
+            else:
+                topic_id = self._bit_topics[0]
+                recommendations.append({
+                    "topic_id": topic_id,
+                    "topic_name": self.topics[topic_id]["name"],
+                    "difficulty": self.topics[topic_id]["difficulty"],
+                    "confidence": 0.9,
+                    "reasoning": "Starting with basic greetings"
+                })
+        
+        return recommendations
+    
+    def _completed_topic_mask(self, completed_lists: List) -> np.ndarray:
+        """Boolean (n_users, n_topics) matrix of completed topics, by topic bit"""
+        rows, bits = [], []
+        for row, completed_topics in enumerate(completed_lists):
+            for topic_id in completed_topics:
+                bit = self._topic_bits.get(topic_id)
+                if bit is not None:
+                    rows.append(row)
+                    bits.append(bit)
+        
+        mask = np.zeros((len(completed_lists), len(self._bit_topics)), dtype=bool)
+        mask[rows, bits] = True
+        return mask
+    
+    def _eligible_topic_mask(self, completed: np.ndarray) -> np.ndarray:
+        """Vectorized _eligible_mask: one table lookup per learner"""
+        # Column-wise bit_length() of each learner's completed mask
+        bit_lengths = np.where(completed, np.arange(1, completed.shape[1] + 1), 0).max(axis=1, initial=0)
+        return self._eligible_table[self._eligible_row[bit_lengths]]
+    
+    def _check_prerequisites(self, topic_id: int, completed_topics: set) -> bool:
+        """Check if prerequisites for a topic are met"""
+        eligible = self._eligible_mask(self._completed_mask(completed_topics))
+        return bool(eligible >> self._topic_bits[topic_id] & 1)
     
     def _fallback_recommendation(self, user_data: Dict) -> Dict:
         """Fallback recommendation when ML model isn't trained"""
-        completed_topics = set(user_data.get('completed_topics', []))
-        
-        # Find next logical topic
-        for topic_id, topic_info in self.topics.items():
-            if topic_id not in completed_topics:
-                if self._check_prerequisites(topic_id, completed_topics):
-                    return {
-                        "topic_id": topic_id,
-                        "topic_name": topic_info["name"],
-                        "difficulty": topic_info["difficulty"],
-                        "confidence": 0.8,
-                        "reasoning": "Recommended based on learning progression"
-                    }
+        candidates = self._candidate_mask(user_data.get('completed_topics', []))
+        
+        # Next logical topic: the easiest eligible one (lowest set bit)
+        if candidates:
+            topic_id = self._bit_topics[(candidates & -candidates).bit_length() - 1]
+            topic_info = self.topics[topic_id]
+            return {
+                "topic_id": topic_id,
+                "topic_name": topic_info["name"],
+                "difficulty": topic_info["difficulty"],
+                "confidence": 0.8,
+                "reasoning": "Recommended based on learning progression"
+            }
         
         # Default to first topic
+        topic_id = self._bit_topics[0]
         return {
-            "topic_id": 1,
-            "topic_name": self.topics[1]["name"],
-            "difficulty": 1,
+            "topic_id": topic_id,
+            "topic_name": self.topics[topic_id]["name"],
+            "difficulty": self.topics[topic_id]["difficulty"],
             "confidence": 0.9,
             "reasoning": "Starting with basic greetings"
         }
@@ -228,23 +472,36 @@ class LearningRecommendationEngine:
         return insights
     
     def save_model(self, filepath: str):
-        """Save trained model to file"""
+        """Save trained model to file (forests as memory-mappable FlatForest arrays)"""
         if self.is_trained:
+            model = self.model
+            if isinstance(model, RandomForestClassifier):
+                model = FlatForest.from_sklearn(model)
+            
             model_data = {
-                'model': self.model,
+                'model': model,
                 'scaler': self.scaler,
                 'topics': self.topics
             }
             joblib.dump(model_data, filepath)
     
-    def load_model(self, filepath: str):
-        """Load trained model from file"""
+    def load_model(self, filepath: str, mmap_mode: Optional[str] = 'r'):
+        """
+        Load trained model from file
+        
+        With mmap_mode='r' the tree arrays of a FlatForest artifact stay in
+        the page cache and are shared by every worker that loads the file.
+        """
         try:
-            model_data = joblib.load(filepath)
+            model_data = joblib.load(filepath, mmap_mode=mmap_mode)
             self.model = model_data['model']
             self.scaler = model_data['scaler']
             self.topics = model_data['topics']
+            self._compile_topic_graph()
             self.is_trained = True
+            # Older artifacts hold a pickled sklearn forest
+            self.compile_model()
+            self.model_version = f"{os.path.basename(filepath)}@{os.stat(filepath).st_mtime_ns}"
             return True
         except Exception as e:
             print(f"Error loading model: {e}")
@@ -0,0 +1,109 @@
+"""
+Durable Session Log
+Append-only SQLite (WAL mode) log of recorded learning sessions
+"""
+
+import json
+import sqlite3
+from typing import Iterable, Iterator, Tuple
+
+from .session_store import to_micros, from_micros
+
+
+class SessionLog:
+    """
+    Append-only, durable log of learning sessions
+    
+    Every worker process appends to the same SQLite database in WAL mode;
+    the monotonically increasing `seq` column lets each worker (and a
+    restarted process) replay only the records it has not applied yet.
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # Let SQLite serve reads from a memory map of the database file
+        self.connection.execute("PRAGMA mmap_size=268435456")
+        
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                topic_id INTEGER NOT NULL,
+                start_us INTEGER NOT NULL,
+                end_us INTEGER NOT NULL,
+                activities_completed INTEGER NOT NULL,
+                total_activities INTEGER NOT NULL,
+                accuracy_score REAL NOT NULL,
+                pronunciation_score REAL NOT NULL,
+                engagement_score REAL NOT NULL,
+                help_requests INTEGER NOT NULL,
+                retry_attempts INTEGER NOT NULL,
+                errors TEXT NOT NULL
+            )
+        """)
+        self.connection.commit()
+    
+    @staticmethod
+    def _to_row(session) -> Tuple:
+        return (
+            session.session_id,
+            session.user_id,
+            session.topic_id,
+            to_micros(session.start_time),
+            to_micros(session.end_time),
+            session.activities_completed,
+            session.total_activities,
+            session.accuracy_score,
+            session.pronunciation_score,
+            session.engagement_score,
+            session.help_requests,
+            session.retry_attempts,
+            json.dumps(session.errors)
+        )
+    
+    def append(self, sessions: Iterable):
+        """Durably append sessions in a single transaction"""
+        with self.connection:
+            self.connection.executemany(
+                """INSERT INTO sessions (
+                    session_id, user_id, topic_id, start_us, end_us,
+                    activities_completed, total_activities, accuracy_score,
+                    pronunciation_score, engagement_score, help_requests,
+                    retry_attempts, errors
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [self._to_row(session) for session in sessions]
+            )
+    
+    def read_since(self, seq: int) -> Iterator[Tuple[int, dict]]:
+        """Yield (seq, LearningSession fields) for records after `seq`"""
+        cursor = self.connection.execute(
+            "SELECT * FROM sessions WHERE seq > ? ORDER BY seq", (seq,)
+        )
+        for row in cursor:
+            yield row[0], {
+                'session_id': row[1],
+                'user_id': row[2],
+                'topic_id': row[3],
+                'start_time': from_micros(row[4]),
+                'end_time': from_micros(row[5]),
+                'activities_completed': row[6],
+                'total_activities': row[7],
+                'accuracy_score': row[8],
+                'pronunciation_score': row[9],
+                'engagement_score': row[10],
+                'help_requests': row[11],
+                'retry_attempts': row[12],
+                'errors': json.loads(row[13])
+            }
+    
+    def last_seq(self) -> int:
+        """Highest sequence number written so far"""
+        return self.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM sessions").fetchone()[0]
+    
+    def close(self):
+        self.connection.close()
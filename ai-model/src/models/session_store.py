@@ -0,0 +1,347 @@
+"""
+Columnar Session Storage
+Compact, array-backed storage for learning sessions
+"""
+
+import mmap
+import os
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+# Naive datetimes are stored as integer microseconds from this epoch so that
+# round-tripping is exact and independent of the server's timezone
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def to_micros(moment: datetime) -> int:
+    """Convert a datetime to microseconds since EPOCH (aware values become local time)"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    """Convert microseconds since EPOCH back to a naive datetime"""
+    return EPOCH + timedelta(microseconds=micros)
+
+
+class StringTable:
+    """Interns strings to small integer codes"""
+    
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+    
+    def intern(self, value: str) -> int:
+        """Return the code for a value, adding it if needed"""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+    
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ColumnarSessionStore:
+    """
+    Append-only columnar storage for LearningSession records
+    
+    Each field lives in its own typed array; user ids and error types are
+    interned to integer codes and session ids are packed into one UTF-8
+    buffer. Rows are addressed by their insertion index and exposed as
+    lightweight SessionView objects.
+    """
+    
+    # Typed numeric columns: name -> array typecode
+    NUMERIC_COLUMNS = {
+        'user_code': 'l',
+        'topic_id': 'l',
+        'start_us': 'q',
+        'end_us': 'q',
+        'activities_completed': 'l',
+        'total_activities': 'l',
+        'accuracy_score': 'd',
+        'pronunciation_score': 'd',
+        'engagement_score': 'd',
+        'help_requests': 'l',
+        'retry_attempts': 'l',
+    }
+    
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in self.NUMERIC_COLUMNS.items()}
+        
+        self.users = StringTable()
+        self.error_types = StringTable()
+        
+        # Session ids packed into a single buffer with row offsets
+        self.session_id_bytes = bytearray()
+        self.session_id_offsets = array('q', [0])
+        
+        # Errors as interned type codes with row offsets; sessions whose
+        # errors carry more than a 'type' key are kept verbatim instead
+        self.error_codes = array('l')
+        self.error_offsets = array('q', [0])
+        self.error_extras: Dict[int, List[Dict]] = {}
+    
+    def append(self, session) -> int:
+        """Store a LearningSession and return its row number"""
+        row = len(self)
+        columns = self.columns
+        
+        columns['user_code'].append(self.users.intern(session.user_id))
+        columns['topic_id'].append(session.topic_id)
+        columns['start_us'].append(to_micros(session.start_time))
+        columns['end_us'].append(to_micros(session.end_time))
+        columns['activities_completed'].append(session.activities_completed)
+        columns['total_activities'].append(session.total_activities)
+        columns['accuracy_score'].append(session.accuracy_score)
+        columns['pronunciation_score'].append(session.pronunciation_score)
+        columns['engagement_score'].append(session.engagement_score)
+        columns['help_requests'].append(session.help_requests)
+        columns['retry_attempts'].append(session.retry_attempts)
+        
+        self.session_id_bytes += session.session_id.encode('utf-8')
+        self.session_id_offsets.append(len(self.session_id_bytes))
+        
+        if all(set(error) == {'type'} and isinstance(error['type'], str) for error in session.errors):
+            for error in session.errors:
+                self.error_codes.append(self.error_types.intern(error['type']))
+        else:
+            self.error_extras[row] = [dict(error) for error in session.errors]
+        self.error_offsets.append(len(self.error_codes))
+        
+        return row
+    
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy NumPy view of a numeric column"""
+        values = self.columns[name]
+        return np.frombuffer(values, dtype=values.typecode) if len(values) else np.array([], dtype=values.typecode)
+    
+    def session_id(self, row: int) -> str:
+        """Decode the session id stored at a row"""
+        start, end = self.session_id_offsets[row], self.session_id_offsets[row + 1]
+        return self.session_id_bytes[start:end].decode('utf-8')
+    
+    def errors(self, row: int) -> List[Dict]:
+        """Rebuild the error list stored at a row"""
+        if row in self.error_extras:
+            return [dict(error) for error in self.error_extras[row]]
+        
+        start, end = self.error_offsets[row], self.error_offsets[row + 1]
+        return [{'type': self.error_types.values[code]} for code in self.error_codes[start:end]]
+    
+    def __len__(self) -> int:
+        return len(self.columns['start_us'])
+    
+    def __getitem__(self, row: int) -> 'SessionView':
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("session row out of range")
+        return SessionView(self, row)
+    
+    def __iter__(self) -> Iterator['SessionView']:
+        for row in range(len(self)):
+            yield SessionView(self, row)
+    
+    def nbytes(self) -> int:
+        """Approximate memory held by the column buffers"""
+        total = sum(values.itemsize * len(values) for values in self.columns.values())
+        total += len(self.session_id_bytes)
+        total += self.session_id_offsets.itemsize * len(self.session_id_offsets)
+        total += self.error_codes.itemsize * len(self.error_codes)
+        total += self.error_offsets.itemsize * len(self.error_offsets)
+        return total
+
+
+class SessionView:
+    """
+    Read-only, per-row view over a ColumnarSessionStore
+    Exposes the same attributes as LearningSession
+    """
+    
+    __slots__ = ('_store', 'row')
+    
+    def __init__(self, store: ColumnarSessionStore, row: int):
+        self._store = store
+        self.row = row
+    
+    @property
+    def session_id(self) -> str:
+        return self._store.session_id(self.row)
+    
+    @property
+    def user_id(self) -> str:
+        return self._store.users.values[self._store.columns['user_code'][self.row]]
+    
+    @property
+    def topic_id(self) -> int:
+        return self._store.columns['topic_id'][self.row]
+    
+    @property
+    def start_time(self) -> datetime:
+        return from_micros(self._store.columns['start_us'][self.row])
+    
+    @property
+    def end_time(self) -> datetime:
+        return from_micros(self._store.columns['end_us'][self.row])
+    
+    @property
+    def activities_completed(self) -> int:
+        return self._store.columns['activities_completed'][self.row]
+    
+    @property
+    def total_activities(self) -> int:
+        return self._store.columns['total_activities'][self.row]
+    
+    @property
+    def accuracy_score(self) -> float:
+        return self._store.columns['accuracy_score'][self.row]
+    
+    @property
+    def pronunciation_score(self) -> float:
+        return self._store.columns['pronunciation_score'][self.row]
+    
+    @property
+    def engagement_score(self) -> float:
+        return self._store.columns['engagement_score'][self.row]
+    
+    @property
+    def help_requests(self) -> int:
+        return self._store.columns['help_requests'][self.row]
+    
+    @property
+    def retry_attempts(self) -> int:
+        return self._store.columns['retry_attempts'][self.row]
+    
+    @property
+    def errors(self) -> List[Dict]:
+        return self._store.errors(self.row)
+    
+    def to_dict(self) -> Dict:
+        """Field dictionary equivalent to dataclasses.asdict(LearningSession)"""
+        return {
+            'session_id': self.session_id,
+            'user_id': self.user_id,
+            'topic_id': self.topic_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'activities_completed': self.activities_completed,
+            'total_activities': self.total_activities,
+            'accuracy_score': self.accuracy_score,
+            'pronunciation_score': self.pronunciation_score,
+            'engagement_score': self.engagement_score,
+            'help_requests': self.help_requests,
+            'retry_attempts': self.retry_attempts,
+            'errors': self.errors
+        }
+    
+    def __repr__(self) -> str:
+        return f"SessionView(row={self.row}, session_id={self.session_id!r}, user_id={self.user_id!r})"
+
+
+class PerformanceHistory:
+    """
+    Sequence of per-session performance records for one user, derived from
+    the session store on access instead of being held as one dict per session
+    """
+    
+    __slots__ = ('_store', '_rows')
+    
+    def __init__(self, store: ColumnarSessionStore, rows: array):
+        self._store = store
+        self._rows = rows
+    
+    def _record(self, row: int) -> Dict:
+        columns = self._store.columns
+        return {
+            'date': from_micros(columns['end_us'][row]),
+            'topic_id': columns['topic_id'][row],
+            'accuracy': columns['accuracy_score'][row],
+            'pronunciation': columns['pronunciation_score'][row],
+            'engagement': columns['engagement_score'][row]
+        }
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __getitem__(self, index: int) -> Dict:
+        return self._record(self._rows[index])
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for row in self._rows:
+            yield self._record(row)
+
+
+def save_store(store: ColumnarSessionStore, directory: str) -> Dict:
+    """
+    Write a store's column buffers as raw files under `directory`
+    
+    Returns the small metadata (string tables, extras) that must be saved
+    alongside the buffers to reload the store.
+    """
+    buffers = dict(store.columns)
+    buffers.update({
+        'session_id_offsets': store.session_id_offsets,
+        'error_codes': store.error_codes,
+        'error_offsets': store.error_offsets,
+    })
+    
+    for name, values in buffers.items():
+        with open(os.path.join(directory, f"{name}.bin"), 'wb') as f:
+            values.tofile(f)
+    
+    with open(os.path.join(directory, "session_ids.bin"), 'wb') as f:
+        f.write(store.session_id_bytes)
+    
+    return {
+        'typecodes': {name: values.typecode for name, values in buffers.items()},
+        'users': store.users.values,
+        'error_types': store.error_types.values,
+        'error_extras': store.error_extras,
+    }
+
+
+def _read_mapped(path: str) -> memoryview:
+    """Memory-map a file read-only (empty files map to an empty buffer)"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def load_store(directory: str, metadata: Dict) -> ColumnarSessionStore:
+    """Reload a store written by save_store, copying buffers straight from memory-mapped files"""
+    store = ColumnarSessionStore()
+    
+    for name, typecode in metadata['typecodes'].items():
+        values = array(typecode)
+        mapped = _read_mapped(os.path.join(directory, f"{name}.bin"))
+        values.frombytes(mapped)
+        mapped.release()
+        
+        if name in store.columns:
+            store.columns[name] = values
+        else:
+            setattr(store, name, values)
+    
+    mapped = _read_mapped(os.path.join(directory, "session_ids.bin"))
+    store.session_id_bytes = bytearray(mapped)
+    mapped.release()
+    
+    for value in metadata['users']:
+        store.users.intern(value)
+    for value in metadata['error_types']:
+        store.error_types.intern(value)
+    store.error_extras = metadata['error_extras']
+    
+    return store
@@ -0,0 +1,284 @@
+"""
+Audio Corpus Feature Extraction
+Extracts training features for many recordings in worker processes, caching them on disk
+"""
+
+import glob
+import hashlib
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import librosa
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from tqdm import tqdm
+
+try:
+    from .table_io import read_table, write_table
+except ImportError:
+    from preprocessing.table_io import read_table, write_table
+
+
+# Bump when extract_audio_file_features changes, so old cache entries are not reused
+FEATURE_VERSION = 1
+N_MFCC = 13
+
+# In the order extract_audio_file_features returns them
+FEATURE_NAMES = ('duration', 'spectral_centroid_mean', 'spectral_centroid_std', 'spectral_rolloff_mean',
+                 'mfcc_mean', 'mfcc_std', 'zcr_mean', 'pitch_mean', 'pitch_std', 'energy')
+VECTOR_FEATURES = ('mfcc_mean', 'mfcc_std')
+
+# Columns of a cache shard
+SHARD_SCHEMA = pa.schema(
+    [('content_hash', pa.string())] +
+    [(name, pa.list_(pa.float64(), N_MFCC) if name in VECTOR_FEATURES else pa.float64()) for name in FEATURE_NAMES]
+)
+
+
+def extract_audio_file_features(audio_file: str, target_sr: int) -> Dict:
+    """
+    Training features of one recording
+    
+    The spectral centroid, rolloff, MFCCs and pitch are derived from a single
+    STFT (librosa's defaults, which each of those extractors would otherwise
+    recompute). Values are plain floats so cached and fresh rows agree.
+    """
+    # Load audio
+    audio_data, sr = librosa.load(audio_file, sr=target_sr)
+    magnitude = np.abs(librosa.stft(audio_data))
+    
+    # Spectral features
+    spectral_centroids = librosa.feature.spectral_centroid(S=magnitude, sr=sr)[0]
+    spectral_rolloff = librosa.feature.spectral_rolloff(S=magnitude, sr=sr)[0]
+    
+    # MFCC features (important for speech)
+    mel = librosa.feature.melspectrogram(S=magnitude ** 2, sr=sr)
+    mfccs = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=N_MFCC)
+    
+    # Zero crossing rate (useful for speech/silence detection)
+    zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
+    
+    # Pitch features
+    pitches, _ = librosa.piptrack(S=magnitude, sr=sr)
+    pitch_values = pitches[pitches > 0]
+    
+    return {
+        'duration': len(audio_data) / sr,
+        'spectral_centroid_mean': float(np.mean(spectral_centroids)),
+        'spectral_centroid_std': float(np.std(spectral_centroids)),
+        'spectral_rolloff_mean': float(np.mean(spectral_rolloff)),
+        'mfcc_mean': np.mean(mfccs, axis=1).astype(float).tolist(),
+        'mfcc_std': np.std(mfccs, axis=1).astype(float).tolist(),
+        'zcr_mean': float(np.mean(zcr)),
+        'pitch_mean': float(np.mean(pitch_values)) if len(pitch_values) > 0 else 0.0,
+        'pitch_std': float(np.std(pitch_values)) if len(pitch_values) > 0 else 0.0,
+        'energy': float(np.sum(audio_data ** 2))
+    }
+
+
+def _extract_task(audio_file: str, target_sr: int) -> Tuple[Optional[Dict], Optional[str]]:
+    """Worker task: features of one file, or the error it raised"""
+    try:
+        return extract_audio_file_features(audio_file, target_sr), None
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+
+
+def content_hash(path: str) -> str:
+    """SHA-256 of a file's bytes"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+class AudioFeatureCache:
+    """
+    Extracted features keyed by the content hash of the recording
+    
+    Entries live in a directory per sample rate and feature version, as
+    shards: Parquet files with a row per recording, in the same layout as
+    process_audio_data's columnar output (MFCC vectors as fixed-size list
+    columns), written and read with table_io. Each flush
+    writes the entries added since the last one as a new shard, via a
+    temporary file and a rename, so a run that is killed leaves only
+    complete shards and loses at most flush_every entries. compact merges
+    the shards into one.
+    """
+    
+    def __init__(self, cache_dir: str, target_sr: int, flush_every: int = 200):
+        """
+        Args:
+            cache_dir: Root directory of the cache
+            target_sr: Sample rate the features were extracted at
+            flush_every: Entries added between automatic flushes
+        """
+        self.directory = os.path.join(cache_dir, f"sr{target_sr}-v{FEATURE_VERSION}")
+        self.flush_every = flush_every
+        os.makedirs(self.directory, exist_ok=True)
+        self._entries: Dict[str, Dict] = {}
+        self._pending: Dict[str, Dict] = {}
+        self._load()
+    
+    def _shards(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, 'shard-*.parquet')))
+    
+    def _load(self):
+        for shard in self._shards():
+            table = read_table(shard)
+            values = {
+                name: [vector.tolist() for vector in table[name]] if name in VECTOR_FEATURES else table[name].tolist()
+                for name in FEATURE_NAMES
+            }
+            for row, key in enumerate(table['content_hash'].tolist()):
+                self._entries[key] = {name: values[name][row] for name in FEATURE_NAMES}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def get(self, key: str) -> Optional[Dict]:
+        return self._entries.get(key)
+    
+    def add(self, key: str, features: Dict):
+        self._entries[key] = features
+        self._pending[key] = features
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+    
+    def flush(self):
+        """Write the entries added since the last flush as a new shard"""
+        if self._pending:
+            self._write_shard(self._pending)
+            self._pending = {}
+    
+    def compact(self):
+        """Merge all shards into one"""
+        self.flush()
+        old_shards = self._shards()
+        if len(old_shards) > 1:
+            merged = self._write_shard(self._entries)
+            for shard in old_shards:
+                if shard != merged:
+                    os.remove(shard)
+    
+    def _write_shard(self, entries: Dict[str, Dict]) -> str:
+        columns = {'content_hash': list(entries)}
+        for name in FEATURE_NAMES:
+            columns[name] = [features[name] for features in entries.values()]
+        
+        # The temporary name keeps the extension, which picks the format
+        shard_name = f"shard-{time.time_ns()}-{os.getpid()}.parquet"
+        path = os.path.join(self.directory, shard_name)
+        temporary = os.path.join(self.directory, f"tmp-{shard_name}")
+        write_table(pd.DataFrame(columns), temporary, list_sizes={name: N_MFCC for name in VECTOR_FEATURES},
+                    schema=SHARD_SCHEMA)
+        os.replace(temporary, path)
+        return path
+
+
+class AudioCorpusExtractor:
+    """
+    Extracts features for a corpus of recordings in parallel
+    
+    Files are hashed first; recordings already in the cache (under any
+    name) are not decoded again. The rest are spread over worker processes
+    and added to the cache as they complete, and the cache is flushed every
+    flush_every files, so an interrupted run resumes where it stopped.
+    """
+    
+    def __init__(self,
+                 target_sample_rate: int = 22050,
+                 max_workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None,
+                 flush_every: int = 200,
+                 show_progress: bool = False):
+        """
+        Args:
+            target_sample_rate: Sample rate recordings are resampled to
+            max_workers: Worker processes (defaults to the CPU count; with
+                one, files are processed in this process)
+            cache_dir: Feature cache directory; no cache if None
+            flush_every: Extracted files between cache flushes
+            show_progress: Show a progress bar
+        """
+        self.target_sample_rate = target_sample_rate
+        self.max_workers = max_workers or mp.cpu_count()
+        self.cache = AudioFeatureCache(cache_dir, target_sample_rate, flush_every) if cache_dir else None
+        self.show_progress = show_progress
+    
+    def extract(self, audio_files: List[str]) -> Tuple[List[Optional[Dict]], Dict]:
+        """
+        Extract features for every file
+        
+        Returns:
+            One feature dictionary per file in input order (None where
+            extraction failed), and run statistics
+        """
+        started = time.perf_counter()
+        results: List[Optional[Dict]] = [None] * len(audio_files)
+        errors: Dict[str, str] = {}
+        
+        # Files to extract, grouped by content so duplicates are done once
+        to_extract: Dict[str, List[int]] = {}
+        cached = 0
+        for index, audio_file in enumerate(audio_files):
+            key = content_hash(audio_file) if self.cache is not None else audio_file
+            features = self.cache.get(key) if self.cache is not None else None
+            if features is not None:
+                results[index] = features
+                cached += 1
+            else:
+                to_extract.setdefault(key, []).append(index)
+        
+        progress = tqdm(total=len(audio_files), initial=cached, unit='file', disable=not self.show_progress)
+        try:
+            for key, (features, error) in self._run(audio_files, to_extract):
+                indices = to_extract[key]
+                if features is None:
+                    errors[audio_files[indices[0]]] = error
+                else:
+                    for index in indices:
+                        results[index] = features
+                    if self.cache is not None:
+                        self.cache.add(key, features)
+                progress.update(len(indices))
+        finally:
+            progress.close()
+            if self.cache is not None:
+                self.cache.flush()
+        
+        elapsed = time.perf_counter() - started
+        return results, {
+            'extracted_files': sum(len(indices) for indices in to_extract.values()) - len(errors),
+            'cached_files': cached,
+            'failed_files': len(errors),
+            'errors': errors,
+            'seconds': elapsed,
+            'files_per_second': len(audio_files) / elapsed if elapsed > 0 else 0.0
+        }
+    
+    def _run(self, audio_files: List[str], to_extract: Dict[str, List[int]]):
+        """Yield (key, (features, error)) as extractions complete"""
+        if self.max_workers <= 1 or len(to_extract) <= 1:
+            for key, indices in to_extract.items():
+                yield key, _extract_task(audio_files[indices[0]], self.target_sample_rate)
+            return
+        
+        # spawn: forking a server process with live threads is unsafe
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(_extract_task, audio_files[indices[0]], self.target_sample_rate): key
+                for key, indices in to_extract.items()
+            }
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            except BaseException:
+                # Interrupted: drop the queued files, keep what is done
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
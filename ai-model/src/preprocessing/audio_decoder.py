@@ -0,0 +1,164 @@
+"""
+Audio Decoding for Pronunciation Evaluation
+Turns uploaded recordings (WAV or raw PCM) into mono float32 arrays in memory
+"""
+
+import io
+import numpy as np
+import librosa
+import soundfile as sf
+from typing import Optional, Tuple
+
+
+class PCMBuffer:
+    """
+    Collects 16-bit little-endian PCM chunks into a preallocated float32 buffer
+    
+    Chunks are converted as they arrive, so a streamed request body is never
+    held as bytes. A chunk may split a sample; the odd byte is carried over to
+    the next chunk.
+    """
+    
+    def __init__(self, max_samples: int, expected_samples: Optional[int] = None):
+        """
+        Args:
+            max_samples: Largest recording accepted, in samples
+            expected_samples: Size hint (e.g. from Content-Length) for the
+                initial allocation
+        """
+        self.max_samples = max_samples
+        capacity = expected_samples if expected_samples else 16384
+        self._buffer = np.empty(min(max(capacity, 1), max_samples), dtype=np.float32)
+        self._size = 0
+        self._carry = b''
+    
+    def write(self, chunk: bytes):
+        """Append a chunk of PCM bytes"""
+        if self._carry:
+            chunk = self._carry + chunk
+        usable = len(chunk) - len(chunk) % 2
+        self._carry = chunk[usable:]
+        if not usable:
+            return
+        
+        samples = np.frombuffer(chunk, dtype='<i2', count=usable // 2)
+        end = self._size + len(samples)
+        if end > len(self._buffer):
+            if end > self.max_samples:
+                raise ValueError(f"Recording longer than {self.max_samples} samples")
+            grown = np.empty(min(max(end, 2 * len(self._buffer)), self.max_samples), dtype=np.float32)
+            grown[:self._size] = self._buffer[:self._size]
+            self._buffer = grown
+        
+        # Assigning converts int16 to float32 without a float64 temporary
+        target = self._buffer[self._size:end]
+        target[:] = samples
+        target *= 1.0 / 32768
+        self._size = end
+    
+    def samples(self) -> np.ndarray:
+        """The decoded samples (a view into the buffer)"""
+        return self._buffer[:self._size]
+
+
+class AudioDecoder:
+    """
+    Decodes pronunciation recordings for KiswahiliPronunciationEvaluator
+    
+    Container formats supported by libsndfile (WAV, FLAC, OGG) are read from
+    memory straight into a float32 array sized from the header; raw 16-bit
+    PCM needs its sample rate from the caller. Multi-channel audio is mixed
+    down to mono, and audio is resampled only when its rate differs from the
+    target rate.
+    """
+    
+    # Raw PCM content types (16-bit little-endian, mono)
+    PCM_CONTENT_TYPES = ('audio/pcm', 'audio/l16', 'audio/x-raw', 'application/octet-stream')
+    
+    # Upper bound on encoded size per second of audio (48 kHz stereo float32)
+    MAX_BYTES_PER_SECOND = 48000 * 2 * 4
+    
+    def __init__(self,
+                 target_sample_rate: int = 22050,
+                 max_duration_seconds: float = 30.0):
+        """
+        Args:
+            target_sample_rate: Sample rate handed to the evaluator
+            max_duration_seconds: Longest recording accepted
+        """
+        self.target_sample_rate = target_sample_rate
+        self.max_duration_seconds = max_duration_seconds
+    
+    @classmethod
+    def is_pcm(cls, content_type: Optional[str]) -> bool:
+        """Whether a Content-Type header denotes raw PCM"""
+        if not content_type:
+            return False
+        return content_type.split(';')[0].strip().lower() in cls.PCM_CONTENT_TYPES
+    
+    def max_samples(self, sample_rate: int) -> int:
+        return int(self.max_duration_seconds * sample_rate)
+    
+    @property
+    def max_encoded_bytes(self) -> int:
+        """Largest encoded upload accepted"""
+        return int(self.max_duration_seconds * self.MAX_BYTES_PER_SECOND) + 4096
+    
+    def pcm_buffer(self, sample_rate: int, content_length: Optional[int] = None) -> PCMBuffer:
+        """A buffer for streaming raw PCM at the given sample rate"""
+        self.check_sample_rate(sample_rate)
+        expected = content_length // 2 if content_length else None
+        return PCMBuffer(self.max_samples(sample_rate), expected)
+    
+    def decode(self, data: bytes, pcm_sample_rate: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        Decode an in-memory recording
+        
+        Args:
+            data: Encoded audio (WAV/FLAC/OGG), or raw PCM if pcm_sample_rate is given
+            pcm_sample_rate: Sample rate of raw 16-bit PCM data
+        
+        Returns:
+            Mono float32 samples at the target rate and that rate
+        """
+        if pcm_sample_rate is not None:
+            buffer = self.pcm_buffer(pcm_sample_rate, len(data))
+            buffer.write(data)
+            return self.finish(buffer.samples(), pcm_sample_rate)
+        
+        try:
+            with sf.SoundFile(io.BytesIO(data)) as audio_file:
+                sample_rate = audio_file.samplerate
+                frames = audio_file.frames
+                if frames > self.max_samples(sample_rate):
+                    raise ValueError(f"Recording longer than {self.max_duration_seconds:g} seconds")
+                
+                if audio_file.channels == 1:
+                    audio = np.empty(frames, dtype=np.float32)
+                    read = audio_file.read(frames, dtype='float32', out=audio)
+                else:
+                    channels = np.empty((frames, audio_file.channels), dtype=np.float32)
+                    read = audio_file.read(frames, dtype='float32', out=channels)
+                    audio = channels.mean(axis=1, dtype=np.float32)
+                audio = audio[:len(read)]
+        except (RuntimeError, TypeError):
+            # libsndfile errors derive from RuntimeError
+            raise ValueError("Unreadable or unsupported audio format")
+        
+        return self.finish(audio, sample_rate)
+    
+    def finish(self, audio: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, int]:
+        """Validate decoded samples and resample them if needed"""
+        if not len(audio):
+            raise ValueError("Recording is empty")
+        
+        if sample_rate != self.target_sample_rate:
+            audio = librosa.resample(audio, orig_sr=sample_rate, target_sr=self.target_sample_rate)
+            sample_rate = self.target_sample_rate
+        
+        return audio, sample_rate
+    
+    def check_sample_rate(self, sample_rate: int):
+        """Reject sample rates outside 1-192 kHz"""
+        if not 1000 <= sample_rate <= 192000:
+            raise ValueError(f"Unsupported sample rate: {sample_rate}")
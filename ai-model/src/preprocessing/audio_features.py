@@ -0,0 +1,217 @@
+"""
+Spectral Feature Extraction for Pronunciation Analysis
+Derives centroid, MFCC and pitch features from a single spectrogram per clip
+"""
+
+import numpy as np
+import librosa
+import scipy.fft
+from typing import Dict, Optional, Tuple
+
+
+class SpectralFeatureExtractor:
+    """
+    Computes speech features from one magnitude spectrogram
+    
+    librosa's spectral_centroid, mfcc and piptrack each run their own STFT of
+    the same signal. This extractor runs the STFT once with the same
+    parameters (Hann window, centered with zero padding) and derives all
+    three from it. The mel filterbank, DCT matrix and bin frequencies depend
+    only on the sample rate, so they are built once and cached.
+    """
+    
+    # 'piptrack' runs librosa.piptrack; 'peaks' finds the same spectral
+    # peaks only inside the pitch band, without full-size pitch/magnitude
+    # matrices
+    PITCH_METHODS = ('piptrack', 'peaks')
+    
+    # piptrack's defaults
+    PITCH_FMIN = 150.0
+    PITCH_FMAX = 4000.0
+    PITCH_THRESHOLD = 0.1
+    
+    def __init__(self,
+                 n_fft: int = 2048,
+                 hop_length: int = 512,
+                 n_mels: int = 128,
+                 n_mfcc: int = 13,
+                 top_db: float = 80.0,
+                 pitch_method: str = 'peaks'):
+        """
+        Args:
+            n_fft: FFT window size
+            hop_length: Samples between frames
+            n_mels: Mel bands used for MFCCs
+            n_mfcc: Number of MFCCs
+            top_db: Dynamic range kept in the log-mel spectrogram
+            pitch_method: Pitch estimator, one of PITCH_METHODS
+        """
+        if pitch_method not in self.PITCH_METHODS:
+            raise ValueError(f"Unknown pitch method '{pitch_method}', expected one of {self.PITCH_METHODS}")
+        
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+        self.top_db = top_db
+        self.pitch_method = pitch_method
+        
+        # sample_rate -> (bin frequencies, mel filterbank)
+        self._filterbanks: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._dct = self._dct_matrix(n_mfcc, n_mels)
+        
+        # The Hann window librosa.stft applies, in the float64 it uses
+        self._window = librosa.filters.get_window('hann', n_fft, fftbins=True)
+    
+    @staticmethod
+    def _dct_matrix(n_out: int, n_in: int) -> np.ndarray:
+        """Orthonormal DCT-II basis, first n_out rows"""
+        basis = np.cos(np.pi / n_in * (np.arange(n_in) + 0.5) * np.arange(n_out)[:, np.newaxis])
+        basis *= np.sqrt(2.0 / n_in)
+        basis[0] /= np.sqrt(2.0)
+        return basis
+    
+    def filterbank(self, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Bin frequencies and mel filterbank for a sample rate (cached)"""
+        if sample_rate not in self._filterbanks:
+            freqs = librosa.fft_frequencies(sr=sample_rate, n_fft=self.n_fft)
+            mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=self.n_fft, n_mels=self.n_mels)
+            self._filterbanks[sample_rate] = (freqs, mel_basis)
+        return self._filterbanks[sample_rate]
+    
+    def spectrogram(self, audio_data: np.ndarray) -> np.ndarray:
+        """Magnitude spectrogram, shape (1 + n_fft // 2, n_frames)"""
+        return np.abs(librosa.stft(audio_data, n_fft=self.n_fft, hop_length=self.hop_length))
+    
+    def extract(self, audio_data: np.ndarray, sample_rate: int) -> Dict:
+        """
+        Extract pronunciation features from a clip
+        
+        Args:
+            audio_data: Mono audio samples
+            sample_rate: Audio sample rate
+        
+        Returns:
+            Dictionary with spectral centroid, MFCC, pitch, duration and
+            energy features
+        """
+        freqs, mel_basis = self.filterbank(sample_rate)
+        magnitude = self.spectrogram(audio_data)
+        return self._clip_features(audio_data, sample_rate, magnitude, freqs,
+                                   lambda: self.mfcc(np.square(magnitude, out=magnitude), mel_basis))
+    
+    def frame_magnitudes(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Magnitude spectra of frames, windowed and transformed as librosa.stft does
+        
+        Args:
+            frames: Array of shape (..., n_fft)
+        
+        Returns:
+            Array of shape (..., 1 + n_fft // 2)
+        """
+        # librosa windows in float64 and stores complex64 for float32 audio
+        spectrum = scipy.fft.rfft(frames * self._window, axis=-1)
+        spectrum = spectrum.astype(np.result_type(frames.dtype, np.complex64), copy=False)
+        return np.abs(spectrum)
+    
+    def _clip_features(self, audio_data: np.ndarray, sample_rate: int, magnitude: np.ndarray,
+                       freqs: np.ndarray, compute_mfccs) -> Dict:
+        features = {}
+        
+        # Spectral features; silent frames have a centroid of 0
+        totals = magnitude.sum(axis=0)
+        totals[totals == 0] = 1.0
+        spectral_centroids = (freqs @ magnitude) / totals
+        features['spectral_centroid_mean'] = np.mean(spectral_centroids)
+        features['spectral_centroid_std'] = np.std(spectral_centroids)
+        
+        # Pitch features (before mfcc, which may square the spectrogram in place)
+        pitches = self.pitches(magnitude, sample_rate)
+        pitch_mean = np.mean(pitches) if pitches.size else 0
+        pitch_std = np.std(pitches) if pitches.size else 0
+        del pitches
+        
+        # MFCC features (important for speech recognition)
+        mfccs = compute_mfccs()
+        features['mfccs'] = mfccs
+        features['mfcc_mean'] = np.mean(mfccs, axis=1)
+        features['mfcc_std'] = np.std(mfccs, axis=1)
+        
+        features['pitch_mean'] = pitch_mean
+        features['pitch_std'] = pitch_std
+        
+        # Duration
+        features['duration'] = len(audio_data) / sample_rate
+        
+        # Energy
+        features['energy'] = np.sum(audio_data ** 2)
+        
+        return features
+    
+    def pitches(self, magnitude: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Interpolated frequencies of the spectral peaks piptrack reports
+        
+        Returns:
+            Peak frequencies in Hz, ordered by bin then frame (the order of
+            piptrack's positive pitches)
+        """
+        if self.pitch_method == 'piptrack':
+            pitches, _ = librosa.piptrack(S=magnitude, sr=sample_rate, n_fft=self.n_fft,
+                                          hop_length=self.hop_length)
+            return pitches[pitches > 0]
+        
+        # Bins inside [fmin, fmax), plus one neighbour on each side
+        freqs, _ = self.filterbank(sample_rate)
+        band = np.flatnonzero((freqs >= self.PITCH_FMIN) & (freqs < min(self.PITCH_FMAX, sample_rate / 2)))
+        if not band.size:
+            return np.empty(0, dtype=magnitude.dtype)
+        low, high = max(band[0], 1), min(band[-1] + 1, len(freqs) - 1)
+        if low >= high:
+            return np.empty(0, dtype=magnitude.dtype)
+        window = magnitude[low - 1:high + 1]
+        
+        # Local maxima along frequency after zeroing bins below a tenth of
+        # the frame's peak magnitude
+        floor = self.PITCH_THRESHOLD * magnitude.max(axis=0)
+        kept = window * (window > floor)
+        is_peak = (kept[1:-1] > kept[:-2]) & (kept[1:-1] >= kept[2:])
+        rows, frames = np.nonzero(is_peak)
+        
+        # Parabolic interpolation of the peak position, as piptrack does it
+        centre = magnitude[rows + low, frames]
+        above = magnitude[rows + low + 1, frames]
+        below = magnitude[rows + low - 1, frames]
+        curvature = above + below - 2 * centre
+        slope = (above - below) / 2
+        interpolable = np.abs(slope) < np.abs(curvature)
+        shift = np.zeros_like(slope)
+        np.divide(-slope, curvature, out=shift, where=interpolable)
+        
+        pitches = ((rows + low) + shift) * float(sample_rate) / self.n_fft
+        return pitches.astype(magnitude.dtype, copy=False)
+    
+    def mfcc(self, power: np.ndarray, mel_basis: np.ndarray,
+             peak_db: Optional[float] = None) -> np.ndarray:
+        """MFCCs from a power spectrogram, as librosa.feature.mfcc computes them"""
+        return self.cepstrum(self.log_mel(power, mel_basis, peak_db))
+    
+    def cepstrum(self, log_mel: np.ndarray) -> np.ndarray:
+        """MFCCs from a log-mel spectrogram (orthonormal DCT-II)"""
+        return self._dct.astype(log_mel.dtype, copy=False) @ log_mel
+    
+    def log_mel(self, power: np.ndarray, mel_basis: np.ndarray,
+                peak_db: Optional[float] = None) -> np.ndarray:
+        """
+        Log-mel spectrogram in dB, as librosa.power_to_db with ref=1.0 and amin=1e-10
+        
+        Levels are floored top_db below the spectrogram's maximum, or below
+        peak_db if that is louder (for spectrograms built frame by frame,
+        peak_db is the loudest level of the earlier frames).
+        """
+        mel = mel_basis @ power
+        log_mel = 10.0 * np.log10(np.maximum(mel, 1e-10))
+        peak = log_mel.max() if peak_db is None else max(log_mel.max(), peak_db)
+        np.maximum(log_mel, peak - self.top_db, out=log_mel)
+        return log_mel
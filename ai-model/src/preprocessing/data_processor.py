@@ -7,7 +7,8 @@ import pandas as pd
 import numpy as np
 import re
 import json
-from typing import Dict, List, Tuple, Optional
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple, Optional
 from pathlib import Path
 import librosa
 import soundfile as sf
@@ -16,6 +17,17 @@ import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 
+try:
+    from .audio_corpus import N_MFCC, VECTOR_FEATURES, AudioCorpusExtractor
+    from .phoneme_segmenter import PhonemeSegmenter
+    from .record_stream import iter_chunks, iter_json_records
+    from .table_io import TableWriter, read_table, write_table
+except ImportError:
+    from preprocessing.audio_corpus import N_MFCC, VECTOR_FEATURES, AudioCorpusExtractor
+    from preprocessing.phoneme_segmenter import PhonemeSegmenter
+    from preprocessing.record_stream import iter_chunks, iter_json_records
+    from preprocessing.table_io import TableWriter, read_table, write_table
+
 
 class KiswahiliDataProcessor:
     """
@@ -33,6 +45,16 @@ class KiswahiliDataProcessor:
         self.kiswahili_alphabet = 'abcdefghijklmnopqrstuvwxyz'
         self.kiswahili_vowels = 'aeiou'
         self.kiswahili_consonants = 'bcdfghjklmnpqrstvwxyz'
+        self.segmenter = PhonemeSegmenter(vowels=self.kiswahili_vowels,
+                                          consonants=self.kiswahili_consonants)
+        
+        # Precompiled patterns for processing whole vocabulary columns
+        self._punctuation_pattern = re.compile(r'[^\w\s-]')
+        self._whitespace_pattern = re.compile(r'\s+')
+        self._non_kiswahili_pattern = re.compile(f'[^{self.kiswahili_alphabet} -]')
+        self._syllable_end_pattern = re.compile(f'([{self.kiswahili_vowels}])(?=[{self.kiswahili_consonants}])')
+        self._vowel_pattern = re.compile(f'[{self.kiswahili_vowels}]')
+        self._word_run_pattern = re.compile(r"(?:[^\W\d_]|[ '-])+")
         
         # Common Kiswahili prefixes and suffixes for morphological analysis
         self.prefixes = ['a-', 'wa-', 'u-', 'i-', 'ki-', 'vi-', 'li-', 'ya-', 'zi-', 'ku-']
@@ -54,42 +76,190 @@ class KiswahiliDataProcessor:
     def process_vocabulary_dataset(self, 
                                  input_file: str, 
                                  output_file: str,
-                                 target_age_group: int = 1) -> Dict:
+                                 target_age_group: int = 1,
+                                 chunksize: Optional[int] = None) -> Dict:
         """
         Process raw Kiswahili vocabulary data into structured learning content
         
         Args:
-            input_file: Path to raw vocabulary file (CSV/JSON)
-            output_file: Path to save processed data
+            input_file: Path to raw vocabulary file (CSV/JSON/NDJSON)
+            output_file: Path to save processed data (.csv, or .parquet or
+                .arrow for a columnar file)
             target_age_group: Age group (1=6-7, 2=7-8, 3=8-9 years)
+            chunksize: Rows to read, process and append to the output at a
+                time, keeping memory flat for large files; by default the
+                whole file is loaded at once
         """
         
         # Load raw data
+        if chunksize is None:
+            raw_chunks = [self._load_vocabulary(input_file)]
+        else:
+            raw_chunks = self._iter_vocabulary_chunks(input_file, chunksize)
+        
+        total_words = 0
+        categories, difficulty_levels = Counter(), Counter()
+        with TableWriter(output_file) as writer:
+            for raw_data in raw_chunks:
+                processed_df = self._process_vocabulary_frame(raw_data, target_age_group)
+                
+                # Save processed data, appending every chunk after the first
+                writer.write(processed_df)
+                
+                total_words += len(processed_df)
+                categories.update(processed_df['category'].value_counts().to_dict())
+                difficulty_levels.update(processed_df['difficulty'].value_counts().to_dict())
+            
+            if not writer.chunks_written:
+                # An input without any rows still gets a header
+                writer.write(self._process_vocabulary_frame(pd.DataFrame(), target_age_group))
+        
+        return {
+            'total_words': total_words,
+            'categories': dict(categories.most_common()),
+            'difficulty_levels': dict(difficulty_levels.most_common()),
+            'output_file': output_file
+        }
+    
+    def _load_vocabulary(self, input_file: str) -> pd.DataFrame:
+        """Read a whole raw vocabulary file"""
         if input_file.endswith('.csv'):
-            raw_data = pd.read_csv(input_file)
+            return pd.read_csv(input_file)
         elif input_file.endswith('.json'):
             with open(input_file, 'r', encoding='utf-8') as f:
-                raw_data = pd.DataFrame(json.load(f))
+                return pd.DataFrame(json.load(f))
+        elif input_file.endswith(('.ndjson', '.jsonl')):
+            return pd.DataFrame(list(iter_json_records(input_file)))
         else:
-            raise ValueError("Unsupported file format. Use CSV or JSON.")
+            raise ValueError("Unsupported file format. Use CSV, JSON or NDJSON.")
+    
+    def _iter_vocabulary_chunks(self, input_file: str, chunksize: int):
+        """
+        Read a raw vocabulary file chunksize rows at a time
         
-        processed_data = []
+        CSV columns are read as text, so that every chunk parses a column
+        the same way whatever values it happens to hold.
+        """
+        if input_file.endswith('.csv'):
+            yield from pd.read_csv(input_file, chunksize=chunksize, dtype=str)
+        elif input_file.endswith(('.json', '.ndjson', '.jsonl')):
+            for records in iter_chunks(iter_json_records(input_file), chunksize):
+                yield pd.DataFrame(records)
+        else:
+            raise ValueError("Unsupported file format. Use CSV, JSON or NDJSON.")
+    
+    def _process_vocabulary_frame(self, raw_data: pd.DataFrame, target_age_group: int) -> pd.DataFrame:
+        """
+        Process every vocabulary row at once
         
-        for _, row in raw_data.iterrows():
-            word_data = self._process_single_word(row, target_age_group)
-            if word_data:
-                processed_data.append(word_data)
+        Gives the same rows as _process_single_word applied to each row.
+        Vocabulary files repeat the same words many times, so each distinct
+        (Kiswahili, English) pair is processed once and the results are
+        spread back over the rows.
+        """
+        kiswahili_codes, kiswahili_words = self._text_codes(raw_data, 'kiswahili', '')
+        english_codes, english_words = self._text_codes(raw_data, 'english', '')
+        category_codes, categories = self._text_codes(raw_data, 'category', 'general')
+        
+        keep = ((kiswahili_words.str.len().to_numpy() > 0)[kiswahili_codes]
+                & (english_words.str.len().to_numpy() > 0)[english_codes])
+        
+        pair_codes = kiswahili_codes[keep].astype(np.int64) * len(english_words) + english_codes[keep]
+        pairs, pair_rows = np.unique(pair_codes, return_inverse=True)
+        processed = self._process_vocabulary_pairs(
+            kiswahili_words.take(pairs // len(english_words)).reset_index(drop=True),
+            english_words.take(pairs % len(english_words)).reset_index(drop=True),
+            target_age_group
+        )
+        
+        processed = processed.take(pair_rows.ravel()).reset_index(drop=True)
+        processed.insert(2, 'category', categories.to_numpy()[category_codes[keep]])
+        return processed
+    
+    def _process_vocabulary_pairs(self,
+                                  kiswahili_word: pd.Series,
+                                  english_word: pd.Series,
+                                  target_age_group: int) -> pd.DataFrame:
+        """
+        Clean and score stripped, lowercased word pairs as whole columns
         
-        # Save processed data
-        processed_df = pd.DataFrame(processed_data)
-        processed_df.to_csv(output_file, index=False, encoding='utf-8')
+        List fields (difficult sounds, learning hints) are built directly as
+        the text to_csv writes for a list.
+        """
+        # Clean the words
+        kiswahili = self._clean_text_column(kiswahili_word).str.replace(self._non_kiswahili_pattern, '', regex=True)
+        english = self._clean_text_column(english_word)
+        
+        # A syllable ends at each vowel followed by a consonant, and a word
+        # without one is a single syllable
+        word_length = kiswahili.str.len()
+        syllable_count = kiswahili.str.count(self._syllable_end_pattern) + 1
+        has_b_d = kiswahili.str.contains('[bd]')
+        has_p_q = kiswahili.str.contains('[pq]')
+        has_complex = kiswahili.str.contains('ng|ny|ch')
+        
+        # Difficulty as in _calculate_word_difficulty
+        difficulty = (1 + np.where(word_length > 8, 2, np.where(word_length > 5, 1, 0))
+                      + (syllable_count > 3) + (has_complex | kiswahili.str.contains('th')))
+        max_difficulty = {1: 2, 2: 3}.get(target_age_group, 5)
+        difficulty = difficulty.clip(1, max_difficulty)
+        
+        # Phonetic features as in _extract_phonetic_features
+        sound_names = ['b_d_confusion', 'p_q_confusion', 'complex_consonants']
+        sound_lists = np.array([str([name for bit, name in enumerate(sound_names) if code >> bit & 1])
+                                for code in range(2 ** len(sound_names))], dtype=object)
+        sound_codes = has_b_d.astype(int) + 2 * has_p_q + 4 * has_complex
+        difficult_count = has_b_d.astype(int) + has_p_q + has_complex
+        complexity = (word_length * 0.1 + syllable_count * 0.3 + difficult_count * 0.2).clip(upper=1.0)
+        vowel_ratio = (kiswahili.str.count(self._vowel_pattern) / word_length).fillna(0.0)
+        
+        # Learning hints as in _generate_learning_hints. Cleaned text has no
+        # quotes or backslashes, so each hint's repr is the hint in quotes
+        hints = (
+            self._hint_column("Break it down: " + kiswahili.str.replace(self._syllable_end_pattern, r'\1-', regex=True),
+                              syllable_count > 1)
+            + self._hint_column("Remember: " + kiswahili + " means " + english, english.str.len() > 0)
+            + self._hint_column("Watch out for b and d - use finger tracing!", has_b_d)
+            + self._hint_column("Special sound combination - listen carefully!", has_complex)
+        )
+        
+        return pd.DataFrame({
+            'kiswahili': kiswahili,
+            'english': english,
+            'difficulty': difficulty,
+            'syllable_count': syllable_count,
+            'phonetic_complexity': complexity,
+            'has_difficult_sounds': sound_lists[sound_codes.to_numpy()],
+            'learning_hints': '[' + hints.str[:-2] + ']',
+            'age_appropriate': target_age_group,
+            'word_length': word_length,
+            'vowel_ratio': vowel_ratio
+        })
+    
+    def _text_codes(self, raw_data: pd.DataFrame, column: str, default: str) -> Tuple[np.ndarray, pd.Series]:
+        """
+        Factorize a raw column as the str() of each value
         
-        return {
-            'total_words': len(processed_data),
-            'categories': processed_df['category'].value_counts().to_dict(),
-            'difficulty_levels': processed_df['difficulty'].value_counts().to_dict(),
-            'output_file': output_file
-        }
+        Returns:
+            Per-row codes and the distinct values, stripped and lowercased
+        """
+        if column not in raw_data.columns:
+            values = pd.Series(default, index=raw_data.index, dtype=object)
+        else:
+            values = raw_data[column].astype(object).map(str)
+        codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+        # Object dtype keeps Python re semantics for the string methods
+        return codes, pd.Series(uniques, dtype=object).str.strip().str.lower()
+    
+    def _clean_text_column(self, text: pd.Series) -> pd.Series:
+        """_clean_english_text applied to a whole column"""
+        text = text.str.replace(self._punctuation_pattern, '', regex=True)
+        return text.str.replace(self._whitespace_pattern, ' ', regex=True).str.strip()
+    
+    def _hint_column(self, hint, present: pd.Series) -> pd.Series:
+        """A quoted hint and list separator where present, otherwise empty"""
+        quoted = "'" + pd.Series(hint, index=present.index, dtype=object) + "', "
+        return quoted.where(present, '')
     
     def _process_single_word(self, word_row: pd.Series, target_age_group: int) -> Optional[Dict]:
         """Process a single vocabulary word"""
@@ -182,30 +352,16 @@ class KiswahiliDataProcessor:
     
     def _syllabify(self, word: str) -> List[str]:
         """Simple syllabification for Kiswahili words"""
-        # Kiswahili syllables typically follow CV (consonant-vowel) patterns
-        syllables = []
-        current_syllable = ""
-        
-        for i, char in enumerate(word):
-            current_syllable += char
-            
-            # If current char is vowel and next is consonant (or end), end syllable
-            if char in self.kiswahili_vowels:
-                if i == len(word) - 1 or word[i + 1] in self.kiswahili_consonants:
-                    syllables.append(current_syllable)
-                    current_syllable = ""
-        
-        # Add any remaining characters
-        if current_syllable:
-            syllables.append(current_syllable)
-        
-        return syllables if syllables else [word]
+        # Kiswahili syllables typically follow CV (consonant-vowel) patterns:
+        # a syllable ends at a vowel followed by a consonant (or the word end)
+        return list(self.segmenter.syllables(word))
     
     def _extract_phonetic_features(self, word: str) -> Dict:
         """Extract phonetic features relevant for dyslexic learners"""
         
-        vowel_count = sum(1 for c in word if c in self.kiswahili_vowels)
-        consonant_count = sum(1 for c in word if c in self.kiswahili_consonants)
+        segmentation = self.segmenter.segment(word)
+        vowel_count = segmentation.vowel_count
+        consonant_count = segmentation.consonant_count
         
         # Identify potentially difficult sounds for dyslexic learners
         difficult_sounds = []
@@ -217,7 +373,7 @@ class KiswahiliDataProcessor:
             difficult_sounds.append('complex_consonants')
         
         # Calculate complexity score
-        complexity = len(word) * 0.1 + len(self._syllabify(word)) * 0.3
+        complexity = len(word) * 0.1 + len(segmentation.syllables) * 0.3
         if difficult_sounds:
             complexity += len(difficult_sounds) * 0.2
         
@@ -255,108 +411,105 @@ class KiswahiliDataProcessor:
     def process_audio_data(self, 
                           audio_dir: str, 
                           output_file: str,
-                          target_sample_rate: int = 22050) -> Dict:
+                          target_sample_rate: int = 22050,
+                          max_workers: Optional[int] = None,
+                          cache_dir: Optional[str] = None,
+                          show_progress: bool = False) -> Dict:
         """
         Process audio files for pronunciation training
         
         Args:
             audio_dir: Directory containing audio files
-            output_file: Path to save processed audio features
+            output_file: Path to save processed audio features (.csv, or
+                .parquet or .arrow for a columnar file with the MFCC
+                vectors as fixed-size list columns)
             target_sample_rate: Target sample rate for audio
+            max_workers: Worker processes for feature extraction (defaults
+                to the CPU count)
+            cache_dir: Directory caching features by file content, so
+                unchanged recordings are not re-extracted on later runs
+            show_progress: Show a progress bar
         """
         
-        audio_features = []
-        audio_path = Path(audio_dir)
+        audio_files = [str(audio_file) for audio_file in Path(audio_dir).glob("*.wav")]
+        extractor = AudioCorpusExtractor(target_sample_rate, max_workers=max_workers,
+                                         cache_dir=cache_dir, show_progress=show_progress)
+        results, stats = extractor.extract(audio_files)
+        for audio_file, error in stats['errors'].items():
+            print(f"Error extracting features from {audio_file}: {error}")
         
-        for audio_file in audio_path.glob("*.wav"):
-            try:
-                features = self._extract_audio_features(str(audio_file), target_sample_rate)
-                if features:
-                    audio_features.append(features)
-            except Exception as e:
-                print(f"Error processing {audio_file}: {e}")
+        audio_features = [
+            {'filename': Path(audio_file).name, **features}
+            for audio_file, features in zip(audio_files, results) if features is not None
+        ]
         
         # Save features
         features_df = pd.DataFrame(audio_features)
-        features_df.to_csv(output_file, index=False)
+        write_table(features_df, output_file, list_sizes={name: N_MFCC for name in VECTOR_FEATURES})
         
         return {
             'total_files': len(audio_features),
-            'average_duration': np.mean([f['duration'] for f in audio_features]),
+            'average_duration': float(np.mean([f['duration'] for f in audio_features])) if audio_features else 0.0,
             'sample_rate': target_sample_rate,
-            'output_file': output_file
+            'output_file': output_file,
+            'cached_files': stats['cached_files'],
+            'failed_files': stats['failed_files'],
+            'files_per_second': stats['files_per_second']
         }
     
-    def _extract_audio_features(self, audio_file: str, target_sr: int) -> Optional[Dict]:
-        """Extract features from a single audio file"""
-        
-        try:
-            # Load audio
-            audio_data, sr = librosa.load(audio_file, sr=target_sr)
-            
-            # Basic features
-            duration = len(audio_data) / sr
-            
-            # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=audio_data, sr=sr)[0]
-            
-            # MFCC features (important for speech)
-            mfccs = librosa.feature.mfcc(y=audio_data, sr=sr, n_mfcc=13)
-            
-            # Zero crossing rate (useful for speech/silence detection)
-            zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
-            
-            # Pitch features
-            pitches, magnitudes = librosa.piptrack(y=audio_data, sr=sr)
-            pitch_values = pitches[pitches > 0]
-            
-            return {
-                'filename': Path(audio_file).name,
-                'duration': duration,
-                'spectral_centroid_mean': np.mean(spectral_centroids),
-                'spectral_centroid_std': np.std(spectral_centroids),
-                'spectral_rolloff_mean': np.mean(spectral_rolloff),
-                'mfcc_mean': np.mean(mfccs, axis=1).tolist(),
-                'mfcc_std': np.std(mfccs, axis=1).tolist(),
-                'zcr_mean': np.mean(zcr),
-                'pitch_mean': np.mean(pitch_values) if len(pitch_values) > 0 else 0,
-                'pitch_std': np.std(pitch_values) if len(pitch_values) > 0 else 0,
-                'energy': np.sum(audio_data ** 2)
-            }
-            
-        except Exception as e:
-            print(f"Error extracting features from {audio_file}: {e}")
-            return None
-    
     def process_user_interaction_data(self, 
-                                    interaction_logs: List[Dict],
-                                    output_file: str) -> Dict:
+                                    interaction_logs: Iterable[Dict],
+                                    output_file: str,
+                                    chunksize: Optional[int] = None) -> Dict:
         """
         Process user interaction data for personalization
         
         Args:
-            interaction_logs: List of user interaction dictionaries
-            output_file: Path to save processed data
+            interaction_logs: User interaction dictionaries; any iterable,
+                e.g. iter_json_records over an exported JSON or NDJSON file
+            output_file: Path to save processed data (.csv, .parquet or
+                .arrow)
+            chunksize: Logs to process and append to the output at a time,
+                so that only one chunk is held in memory; by default all
+                logs are processed at once
         """
         
-        processed_interactions = []
-        
-        for log in interaction_logs:
-            processed_log = self._process_interaction_log(log)
-            if processed_log:
-                processed_interactions.append(processed_log)
-        
-        # Create DataFrame and save
-        interactions_df = pd.DataFrame(processed_interactions)
-        interactions_df.to_csv(output_file, index=False)
+        if chunksize is None:
+            log_chunks = [interaction_logs]
+        else:
+            log_chunks = iter_chunks(interaction_logs, chunksize)
+        
+        total_interactions = 0
+        unique_users = set()
+        accuracy_total = 0.0
+        error_types = Counter()
+        with TableWriter(output_file) as writer:
+            for logs in log_chunks:
+                processed_interactions = []
+                
+                for log in logs:
+                    processed_log = self._process_interaction_log(log)
+                    if processed_log:
+                        processed_interactions.append(processed_log)
+                
+                if not processed_interactions:
+                    continue
+                
+                # Create DataFrame and save, appending every chunk after the first
+                interactions_df = pd.DataFrame(processed_interactions)
+                writer.write(interactions_df)
+                
+                total_interactions += len(interactions_df)
+                unique_users.update(interactions_df['user_id'].unique())
+                accuracy_total += interactions_df['accuracy'].sum()
+                error_types.update(interactions_df['error_type'].value_counts().to_dict())
         
         # Generate summary statistics
         summary = {
-            'total_interactions': len(processed_interactions),
-            'unique_users': len(interactions_df['user_id'].unique()) if not interactions_df.empty else 0,
-            'average_accuracy': interactions_df['accuracy'].mean() if not interactions_df.empty else 0,
-            'common_error_types': interactions_df['error_type'].value_counts().to_dict() if not interactions_df.empty else {},
+            'total_interactions': total_interactions,
+            'unique_users': len(unique_users),
+            'average_accuracy': accuracy_total / total_interactions if total_interactions else 0,
+            'common_error_types': dict(error_types.most_common()),
             'output_file': output_file
         }
         
@@ -390,56 +543,110 @@ class KiswahiliDataProcessor:
                               output_file: str) -> Dict:
         """
         Combine all processed data into a training dataset
+        
+        Inputs and output may each be CSV, Parquet or Arrow IPC files (by
+        extension); only the columns used are read from columnar inputs.
         """
         
         # Load processed data
-        vocab_df = pd.read_csv(vocab_file)
-        audio_df = pd.read_csv(audio_features_file)
-        interaction_df = pd.read_csv(interaction_file)
-        
-        # Create training examples
-        training_data = []
-        
-        # For each vocabulary word, create training examples
-        for _, vocab_row in vocab_df.iterrows():
-            word = vocab_row['kiswahili']
-            
-            # Find related audio features
-            audio_features = audio_df[audio_df['filename'].str.contains(word, na=False)]
-            
-            # Find related user interactions
-            user_interactions = interaction_df[interaction_df['topic_id'] == vocab_row.get('topic_id', 0)]
-            
-            # Create training example
-            training_example = {
-                'word': word,
-                'difficulty': vocab_row['difficulty'],
-                'category': vocab_row['category'],
-                'phonetic_complexity': vocab_row['phonetic_complexity'],
-                'syllable_count': vocab_row['syllable_count'],
-                'word_length': vocab_row['word_length'],
-                'has_audio': len(audio_features) > 0,
-                'user_success_rate': user_interactions['accuracy'].mean() if not user_interactions.empty else 0.5,
-                'avg_response_time': user_interactions['response_time'].mean() if not user_interactions.empty else 0.0,
-                'common_errors': user_interactions['error_type'].mode().iloc[0] if not user_interactions.empty else 'none'
-            }
-            
-            training_data.append(training_example)
+        vocab_df = read_table(vocab_file)
+        audio_df = read_table(audio_features_file, columns=['filename'])
+        interaction_df = read_table(interaction_file, columns=['topic_id', 'accuracy', 'response_time', 'error_type'])
+        
+        topic_ids = vocab_df['topic_id'] if 'topic_id' in vocab_df.columns else pd.Series(0, index=vocab_df.index)
+        
+        # Keyed lookups built once: which words occur in an audio filename,
+        # and interaction statistics per referenced topic
+        has_audio = self._words_with_audio(vocab_df['kiswahili'], audio_df['filename'])
+        topic_stats = self._topic_interaction_stats(interaction_df, topic_ids)
+        
+        no_interactions = (0.5, 0.0, 'none')
+        interactions = pd.DataFrame(
+            [topic_stats.get(topic_id, no_interactions) for topic_id in topic_ids],
+            columns=['user_success_rate', 'avg_response_time', 'common_errors'],
+            index=vocab_df.index
+        )
+        
+        # Create training examples, one per vocabulary word
+        training_df = pd.DataFrame({
+            'word': vocab_df['kiswahili'],
+            'difficulty': vocab_df['difficulty'],
+            'category': vocab_df['category'],
+            'phonetic_complexity': vocab_df['phonetic_complexity'],
+            'syllable_count': vocab_df['syllable_count'],
+            'word_length': vocab_df['word_length'],
+            'has_audio': vocab_df['kiswahili'].map(has_audio).astype(bool),
+            'user_success_rate': interactions['user_success_rate'],
+            'avg_response_time': interactions['avg_response_time'],
+            'common_errors': interactions['common_errors']
+        })
         
         # Save training dataset
-        training_df = pd.DataFrame(training_data)
-        training_df.to_csv(output_file, index=False)
+        write_table(training_df, output_file)
         
         return {
-            'training_examples': len(training_data),
+            'training_examples': len(training_df),
             'features': list(training_df.columns),
             'output_file': output_file
         }
     
+    def _words_with_audio(self, words: pd.Series, filenames: pd.Series) -> Dict:
+        """
+        Whether each distinct word occurs in any audio filename
+        
+        A word made of letters, spaces, apostrophes and hyphens (as every
+        cleaned word is) occurs in a filename exactly when it occurs in one
+        of the filename's runs of those characters. Filenames are built from
+        the same small vocabulary, so every substring of the distinct runs
+        (up to the longest word) makes a small index; other words are
+        matched against the filenames as before.
+        """
+        distinct_words = words.unique()
+        indexed = [word for word in distinct_words
+                   if isinstance(word, str) and self._word_run_pattern.fullmatch(word)]
+        max_length = max(map(len, indexed), default=0)
+        
+        runs = set()
+        for filename in filenames.dropna().unique():
+            if isinstance(filename, str):
+                runs.update(self._word_run_pattern.findall(filename))
+        substrings = {
+            run[start:end]
+            for run in runs
+            for start in range(len(run))
+            for end in range(start + 1, min(len(run), start + max_length) + 1)
+        }
+        
+        has_audio = {word: word in substrings for word in indexed}
+        for word in distinct_words:
+            if word not in has_audio:
+                has_audio[word] = bool(filenames.str.contains(word, na=False).any())
+        return has_audio
+    
+    def _topic_interaction_stats(self, interaction_df: pd.DataFrame, topic_ids: pd.Series) -> Dict:
+        """
+        Success rate, mean response time and most common error per topic
+        
+        One groupby pass over the interactions of the topics in topic_ids;
+        each group is reduced with the same Series methods as a filtered
+        table, so the values match exactly. A topic whose error types are
+        all missing has no common error ('none').
+        """
+        referenced = interaction_df[interaction_df['topic_id'].isin(topic_ids.dropna().unique())]
+        stats = {}
+        for topic_id, group in referenced.groupby('topic_id', sort=False):
+            modes = group['error_type'].mode()
+            stats[topic_id] = (
+                group['accuracy'].mean(),
+                group['response_time'].mean(),
+                modes.iloc[0] if len(modes) else 'none'
+            )
+        return stats
+    
     def validate_dataset(self, dataset_file: str) -> Dict:
         """Validate the processed dataset for quality issues"""
         
-        df = pd.read_csv(dataset_file)
+        df = read_table(dataset_file)
         
         validation_results = {
             'total_records': len(df),
@@ -0,0 +1,92 @@
+"""
+Phoneme and Syllable Segmentation for Kiswahili Words
+Compiled once and memoized per word, shared by the evaluator and data processor
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+
+# Multi-letter Kiswahili phonemes; single letters are phonemes on their own.
+# "ng'" (as in ng'ombe) is the velar nasal, distinct from the "ng" of ngoma,
+# and "mb" is the prenasalized stop of mbili.
+MULTI_LETTER_PHONEMES = ("ng'", 'ch', 'mb', 'ng', 'ny', 'th')
+
+VOWELS = 'aeiou'
+CONSONANTS = 'bcdfghjklmnpqrstvwxyz'
+
+
+class Segmentation(NamedTuple):
+    """Cached analysis of one word"""
+    phonemes: Tuple[str, ...]
+    syllables: Tuple[str, ...]
+    vowel_count: int
+    consonant_count: int
+
+
+class PhonemeSegmenter:
+    """
+    Splits words into phonemes and CV syllables with precompiled patterns
+    
+    Phonemes are matched longest first, so "ng'ombe" gives ng', o, mb, e;
+    letters outside the inventory and alphabet (spaces, hyphens, digits) are
+    skipped. A syllable ends at a vowel followed by a consonant or the end of
+    the word. Results are cached per word, since lessons and datasets repeat
+    the same small vocabulary.
+    """
+    
+    def __init__(self,
+                 inventory: Optional[Iterable[str]] = None,
+                 vowels: str = VOWELS,
+                 consonants: str = CONSONANTS,
+                 cache_size: int = 4096):
+        """
+        Args:
+            inventory: Phonemes to recognise (defaults to MULTI_LETTER_PHONEMES
+                plus every single letter); only multi-letter entries matter
+            vowels: Letters that end a syllable
+            consonants: Letters that may start the next syllable
+            cache_size: Words kept in the LRU cache
+        """
+        units = MULTI_LETTER_PHONEMES if inventory is None else inventory
+        multi_letter = sorted({unit for unit in units if len(unit) > 1}, key=len, reverse=True)
+        letters = re.escape(''.join(sorted(set(vowels + consonants))))
+        
+        self._phoneme_pattern = re.compile('|'.join([re.escape(unit) for unit in multi_letter] + [f'[{letters}]']))
+        self._syllable_pattern = re.compile(
+            rf".*?[{re.escape(vowels)}](?=[{re.escape(consonants)}]|\Z)|.+",
+            re.DOTALL
+        )
+        self._vowel_pattern = re.compile(f'[{re.escape(vowels)}]')
+        self._consonant_pattern = re.compile(f'[{re.escape(consonants)}]')
+        self.vowels = frozenset(vowels)
+        self.consonants = frozenset(consonants)
+        
+        # Separate caches, so a caller wanting only phonemes or syllables
+        # does not pay for the rest of the analysis on a miss
+        self.phonemes = lru_cache(maxsize=cache_size)(self._phonemes)
+        self.syllables = lru_cache(maxsize=cache_size)(self._syllables)
+        self.segment = lru_cache(maxsize=cache_size)(self._segment)
+    
+    def _phonemes(self, word: str) -> Tuple[str, ...]:
+        """Phonemes of a word (case-insensitive)"""
+        return tuple(self._phoneme_pattern.findall(word.lower()))
+    
+    def _syllables(self, word: str) -> Tuple[str, ...]:
+        """CV syllables of a word; a word without any is its own syllable"""
+        return tuple(self._syllable_pattern.findall(word)) or (word,)
+    
+    def _segment(self, word: str) -> Segmentation:
+        return Segmentation(
+            self.phonemes(word),
+            self.syllables(word),
+            len(self._vowel_pattern.findall(word)),
+            len(self._consonant_pattern.findall(word))
+        )
+    
+    def cache_clear(self):
+        """Forget every cached word"""
+        self.phonemes.cache_clear()
+        self.syllables.cache_clear()
+        self.segment.cache_clear()
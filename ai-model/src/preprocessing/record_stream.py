@@ -0,0 +1,108 @@
+"""
+Incremental JSON Record Reading
+Streams records from JSON array and NDJSON files in bounded memory
+"""
+
+import json
+import re
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+_WHITESPACE = ' \t\r\n'
+_VALUE_END = re.compile(r'[ \t\r\n,\]]')
+
+
+def iter_json_records(path: str, buffer_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yield the records of a JSON array or NDJSON file one at a time
+    
+    A file whose first non-blank character is '[' is read as a JSON array,
+    anything else as newline-delimited JSON (one record per line, blank lines
+    skipped). Only about buffer_size characters plus the record being
+    decoded are held in memory, however large the file.
+    
+    Args:
+        path: File to read
+        buffer_size: Characters read from the file at a time
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stripped = ''
+        while not stripped:
+            head = f.read(buffer_size)
+            if not head:
+                return
+            stripped = head.lstrip(_WHITESPACE)
+        if stripped.startswith('['):
+            yield from _iter_array(f, stripped[1:], buffer_size)
+            return
+        
+        f.seek(0)
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+
+
+def _iter_array(f, buffer: str, buffer_size: int) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    position = 0
+    at_end = False
+    expect_value = True
+    first = True
+    
+    while True:
+        # Skip whitespace and the separators between values
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if at_end:
+                raise ValueError("Unterminated JSON array")
+            buffer, position = f.read(buffer_size), 0
+            at_end = not buffer
+            continue
+        
+        if buffer[position] == ']':
+            if expect_value and not first:
+                raise ValueError("Trailing ',' in JSON array")
+            return
+        if not expect_value:
+            if buffer[position] != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {buffer[position]!r}")
+            position += 1
+            expect_value = True
+            continue
+        
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            record, end = None, None
+        
+        # A value not yet followed by a separator may continue in the next
+        # read (a number cut off mid-way, or an incomplete object), so read
+        # more and decode it again
+        if end is None or (not at_end and not _VALUE_END.search(buffer, end)):
+            if at_end:
+                raise ValueError("Invalid or truncated JSON array")
+            more = f.read(buffer_size)
+            at_end = not more
+            buffer, position = buffer[position:] + more, 0
+            continue
+        
+        yield record
+        position = end
+        expect_value = first = False
+
+
+def iter_chunks(records: Iterable[Any], chunksize: int) -> Iterator[List[Any]]:
+    """Group records into lists of at most chunksize"""
+    if chunksize <= 0:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunksize))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,164 @@
+"""
+Processed Table Storage
+Reads and writes processed datasets as CSV, Parquet or Arrow IPC, chosen by file extension
+"""
+
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+TABLE_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+
+
+def table_format(path: str) -> str:
+    """'csv', 'parquet' or 'arrow' from a file's extension (CSV if unknown)"""
+    return TABLE_FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+
+def read_table(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a processed table
+    
+    Parquet and Arrow IPC files are memory-mapped, and only the requested
+    columns are decoded; the types they were written with are kept.
+    Fixed-size list columns (MFCC vectors) come back as one numpy array per
+    row.
+    
+    Args:
+        path: File to read
+        columns: Columns to read; all of them if None
+    """
+    file_format = table_format(path)
+    if file_format == 'csv':
+        return pd.read_csv(path, usecols=columns)
+    if file_format == 'parquet':
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        return (table if columns is None else table.select(columns)).to_pandas()
+
+
+class TableWriter:
+    """
+    Writes a processed table to a file, one DataFrame chunk at a time
+    
+    CSV chunks are appended after a single header. Parquet chunks become
+    row groups and Arrow IPC chunks record batches, all with one schema:
+    the one given, or else that of the first chunk, so a column keeps one
+    type however its values vary between chunks. Every chunk must have the
+    same columns as the first (in any order); a chunk that does not, or
+    whose values do not fit the schema's types, raises ValueError before
+    any of it is written. Columns named in list_sizes hold equal-length
+    numeric vectors and are stored as fixed-size list columns.
+    """
+    
+    def __init__(self,
+                 path: str,
+                 list_sizes: Optional[Dict[str, int]] = None,
+                 schema: Optional[pa.Schema] = None):
+        """
+        Args:
+            path: File to write; the extension picks the format
+            list_sizes: Vector length of each list-valued column
+            schema: Columns and Arrow types of the table; for CSV only the
+                column names are used
+        """
+        self.path = path
+        self.format = table_format(path)
+        self.list_sizes = list_sizes or {}
+        self.chunks_written = 0
+        self._schema: Optional[pa.Schema] = schema
+        self._columns: Optional[List[str]] = None if schema is None else list(schema.names)
+        self._writer = None
+    
+    def __enter__(self) -> 'TableWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+    
+    def write(self, df: pd.DataFrame):
+        """
+        Append a chunk
+        
+        Raises:
+            ValueError: If the chunk's columns differ from the table's, or a
+                column cannot be stored with the schema's type
+        """
+        df = self._match_columns(df)
+        if self.format == 'csv':
+            df.to_csv(self.path, mode='a' if self.chunks_written else 'w', header=not self.chunks_written,
+                      index=False, encoding='utf-8')
+        else:
+            table = self._to_arrow(df)
+            if self._writer is None:
+                self._schema = table.schema
+                if self.format == 'parquet':
+                    self._writer = pq.ParquetWriter(self.path, self._schema)
+                else:
+                    self._writer = pa.ipc.new_file(self.path, self._schema)
+            self._writer.write_table(table)
+        self._columns = list(df.columns)
+        self.chunks_written += 1
+    
+    def close(self):
+        """Finish the file; one without any chunk is written as an empty table"""
+        if not self.chunks_written:
+            self.write(pd.DataFrame(columns=self._columns or []))
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+    
+    def _match_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """The chunk with its columns in the table's order"""
+        if self._columns is None:
+            return df
+        columns = list(df.columns)
+        if columns == self._columns:
+            return df
+        missing = [name for name in self._columns if name not in columns]
+        unexpected = [name for name in columns if name not in self._columns]
+        if missing or unexpected:
+            raise ValueError(f"{self.path}: chunk {self.chunks_written + 1} does not match the table's columns "
+                             f"(missing {missing}, unexpected {unexpected})")
+        return df[self._columns]
+    
+    def _to_arrow(self, df: pd.DataFrame) -> pa.Table:
+        arrays = []
+        for name in df.columns:
+            field_type = None if self._schema is None else self._schema.field(str(name)).type
+            try:
+                if name in self.list_sizes:
+                    size = self.list_sizes[name]
+                    values = np.asarray(df[name].tolist(), dtype=np.float64).reshape(len(df) * size)
+                    array = pa.FixedSizeListArray.from_arrays(pa.array(values), size)
+                    arrays.append(array if field_type is None else array.cast(field_type))
+                else:
+                    arrays.append(pa.array(df[name], type=field_type, from_pandas=True))
+            except (ValueError, TypeError, pa.ArrowException) as e:
+                expected = f" as {field_type}" if field_type is not None else ""
+                raise ValueError(f"{self.path}: column '{name}' of chunk {self.chunks_written + 1} "
+                                 f"cannot be stored{expected}: {e}") from e
+        if self._schema is None:
+            return pa.Table.from_arrays(arrays, names=[str(name) for name in df.columns])
+        return pa.Table.from_arrays(arrays, schema=self._schema)
+
+
+def write_table(df: pd.DataFrame,
+                path: str,
+                list_sizes: Optional[Dict[str, int]] = None,
+                schema: Optional[pa.Schema] = None):
+    """Write a whole processed table; see TableWriter"""
+    with TableWriter(path, list_sizes, schema) as writer:
+        writer.write(df)
@@ -0,0 +1,128 @@
+"""
+Voice Activity Detection for Pronunciation Recordings
+Trims leading and trailing silence before spectral feature extraction
+"""
+
+import threading
+import time
+import numpy as np
+from typing import Dict, Tuple
+
+
+class VoiceActivityDetector:
+    """
+    Energy and zero-crossing based detector for the voiced region of a clip
+    
+    The clip is cut into short frames. The noise floor is estimated from the
+    quietest frames; a frame is voiced if it is clearly louder than the floor
+    and within range_db of the loudest frame, or if it is a little louder
+    than the floor with a high zero-crossing rate (fricatives such as 's' and
+    'f' are quiet but noisy). Everything between the first and last voiced
+    frame, plus some padding, is kept; pauses inside the word are not cut.
+    A clip without a clear contrast between floor and peak is left as is.
+    """
+    
+    def __init__(self,
+                 frame_seconds: float = 0.02,
+                 margin_db: float = 12.0,
+                 range_db: float = 40.0,
+                 floor_db: float = -60.0,
+                 fricative_margin_db: float = 6.0,
+                 zcr_threshold: float = 0.25,
+                 padding_seconds: float = 0.1):
+        """
+        Args:
+            frame_seconds: Analysis frame length
+            margin_db: Level above the noise floor that marks speech
+            range_db: Frames further than this below the loudest frame are silence
+            floor_db: Frames below this level (dBFS) are always silence
+            fricative_margin_db: Level above the noise floor for high-ZCR frames
+            zcr_threshold: Zero crossings per sample that mark a fricative
+            padding_seconds: Audio kept before and after the voiced region
+        """
+        self.frame_seconds = frame_seconds
+        self.margin_db = margin_db
+        self.range_db = range_db
+        self.floor_db = floor_db
+        self.fricative_margin_db = fricative_margin_db
+        self.zcr_threshold = zcr_threshold
+        self.padding_seconds = padding_seconds
+    
+    def voiced_region(self, audio_data: np.ndarray, sample_rate: int) -> Tuple[int, int]:
+        """
+        Find the voiced part of a clip
+        
+        Returns:
+            (start, end) sample indices; (0, len(audio_data)) if nothing
+            can be trimmed
+        """
+        frame_length = max(int(self.frame_seconds * sample_rate), 1)
+        n_frames = len(audio_data) // frame_length
+        if n_frames < 2:
+            return 0, len(audio_data)
+        
+        frames = audio_data[:n_frames * frame_length].reshape(n_frames, frame_length)
+        energy = np.einsum('ij,ij->i', frames, frames, dtype=np.float64) / frame_length
+        level = 10.0 * np.log10(np.maximum(energy, 1e-12))
+        noise_db = np.percentile(level, 10)
+        peak_db = level.max()
+        if peak_db - noise_db < self.margin_db:
+            return 0, len(audio_data)
+        
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_length
+        
+        threshold = max(noise_db + self.margin_db, peak_db - self.range_db, self.floor_db)
+        voiced = level >= threshold
+        voiced |= (level >= max(noise_db + self.fricative_margin_db, self.floor_db)) & (zcr >= self.zcr_threshold)
+        
+        voiced_frames = np.flatnonzero(voiced)
+        if not voiced_frames.size:
+            return 0, len(audio_data)
+        
+        padding = int(self.padding_seconds * sample_rate)
+        start = max(voiced_frames[0] * frame_length - padding, 0)
+        end = min((voiced_frames[-1] + 1) * frame_length + padding, len(audio_data))
+        return int(start), int(end)
+    
+    def trim(self, audio_data: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, Dict]:
+        """
+        Trim a clip to its voiced region
+        
+        Returns:
+            The voiced samples (a view of audio_data) and trim statistics
+        """
+        started = time.perf_counter()
+        start, end = self.voiced_region(audio_data, sample_rate)
+        elapsed = time.perf_counter() - started
+        
+        return audio_data[start:end], {
+            'original_seconds': len(audio_data) / sample_rate,
+            'voiced_seconds': (end - start) / sample_rate,
+            'trim_ratio': 1.0 - (end - start) / len(audio_data) if len(audio_data) else 0.0,
+            'vad_ms': elapsed * 1000
+        }
+
+
+class TrimStats:
+    """Running totals of silence trimming, safe to share between threads"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clips = 0
+        self.total_trim_ratio = 0.0
+        self.total_cpu_saved_ms = 0.0
+    
+    def record(self, trim_ratio: float, cpu_saved_ms: float):
+        with self._lock:
+            self.clips += 1
+            self.total_trim_ratio += trim_ratio
+            self.total_cpu_saved_ms += cpu_saved_ms
+    
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                'clips': self.clips,
+                'average_trim_ratio': self.total_trim_ratio / self.clips if self.clips else 0.0,
+                'total_cpu_saved_ms': self.total_cpu_saved_ms
+            }
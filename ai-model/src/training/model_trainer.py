@@ -18,6 +18,13 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+try:
+    from ..models.flat_forest import FlatForest
+    from ..preprocessing.table_io import read_table
+except ImportError:
+    from models.flat_forest import FlatForest
+    from preprocessing.table_io import read_table
+
 
 class KiswahiliModelTrainer:
     """
@@ -69,15 +76,13 @@ class KiswahiliModelTrainer:
         Prepare training data from processed dataset
         
         Args:
-            dataset_file: Path to processed training dataset
+            dataset_file: Path to processed training dataset (CSV, Parquet
+                or Arrow IPC; only the feature columns are read)
             
         Returns:
             Tuple of (features, labels)
         """
         
-        # Load dataset
-        df = pd.read_csv(dataset_file)
-        
         # Define features for recommendation model
         feature_columns = [
             'difficulty',
@@ -88,6 +93,9 @@ class KiswahiliModelTrainer:
             'avg_response_time'
         ]
         
+        # Load dataset (the labels are derived from feature columns)
+        df = read_table(dataset_file, columns=feature_columns)
+        
         # Handle missing values
         df = df.fillna({
             'user_success_rate': 0.5,
@@ -363,13 +371,19 @@ class KiswahiliModelTrainer:
     
     def save_model(self, 
                   model_path: str,
-                  metadata_path: str = None) -> bool:
+                  metadata_path: str = None,
+                  flatten_forest: bool = True) -> bool:
         """
         Save trained model and associated metadata
         
+        Random forests are stored as a FlatForest by default, so that
+        load_model can memory-map the tree arrays and worker processes
+        share them instead of each holding a private copy.
+        
         Args:
             model_path: Path to save the model
             metadata_path: Path to save metadata (optional)
+            flatten_forest: Store random forests as flat, mmap-able arrays
             
         Returns:
             True if successful, False otherwise
@@ -380,9 +394,13 @@ class KiswahiliModelTrainer:
             return False
         
         try:
-            # Save model components
+            model = self.best_model
+            if flatten_forest and isinstance(model, RandomForestClassifier):
+                model = FlatForest.from_sklearn(model)
+            
+            # Save model components (uncompressed, so arrays can be memory-mapped)
             model_data = {
-                'model': self.best_model,
+                'model': model,
                 'scaler': self.scaler,
                 'label_encoder': self.label_encoder,
                 'feature_names': self.feature_names,
@@ -398,7 +416,8 @@ class KiswahiliModelTrainer:
                     'feature_names': self.feature_names,
                     'classes': self.label_encoder.classes_.tolist(),
                     'training_date': datetime.now().isoformat(),
-                    'model_version': '1.0'
+                    'model_version': '1.0',
+                    'model_format': type(model).__name__
                 }
                 
                 with open(metadata_path, 'w') as f:
@@ -411,19 +430,21 @@ class KiswahiliModelTrainer:
             print(f"Error saving model: {e}")
             return False
     
-    def load_model(self, model_path: str) -> bool:
+    def load_model(self, model_path: str, mmap_mode: Optional[str] = 'r') -> bool:
         """
         Load a previously trained model
         
         Args:
             model_path: Path to the saved model
+            mmap_mode: joblib mmap_mode for the model's arrays; 'r' shares a
+                FlatForest's trees read-only across processes, None copies
             
         Returns:
             True if successful, False otherwise
         """
         
         try:
-            model_data = joblib.load(model_path)
+            model_data = joblib.load(model_path, mmap_mode=mmap_mode)
             
             self.best_model = model_data['model']
             self.scaler = model_data['scaler']
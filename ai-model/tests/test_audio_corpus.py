@@ -0,0 +1,55 @@
+"""
+The on-disk audio feature cache
+"""
+
+import glob
+import os
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from preprocessing.audio_corpus import FEATURE_NAMES, N_MFCC, SHARD_SCHEMA, VECTOR_FEATURES, AudioFeatureCache
+from preprocessing.table_io import read_table
+
+SAMPLE_RATE = 22050
+
+
+def make_features(rng) -> dict:
+    return {
+        name: rng.normal(0, 20, N_MFCC).tolist() if name in VECTOR_FEATURES else float(rng.random() * 1000)
+        for name in FEATURE_NAMES
+    }
+
+
+def test_flushed_shards_reload_with_identical_features(tmp_path):
+    rng = np.random.default_rng(24)
+    entries = {f"hash{i}": make_features(rng) for i in range(7)}
+    
+    cache = AudioFeatureCache(str(tmp_path), SAMPLE_RATE, flush_every=3)
+    for key, features in entries.items():
+        cache.add(key, features)
+    cache.flush()
+    
+    shards = sorted(glob.glob(os.path.join(cache.directory, '*')))
+    assert len(shards) == 3 and all(os.path.basename(shard).startswith('shard-') for shard in shards)
+    assert all(pq.read_schema(shard).equals(SHARD_SCHEMA) for shard in shards)
+    
+    reloaded = AudioFeatureCache(str(tmp_path), SAMPLE_RATE)
+    assert len(reloaded) == len(entries)
+    for key, features in entries.items():
+        assert reloaded.get(key) == features
+        assert list(reloaded.get(key)) == list(FEATURE_NAMES)
+
+
+def test_compact_merges_shards_into_one(tmp_path):
+    rng = np.random.default_rng(25)
+    cache = AudioFeatureCache(str(tmp_path), SAMPLE_RATE, flush_every=2)
+    for i in range(5):
+        cache.add(f"hash{i}", make_features(rng))
+    cache.compact()
+    
+    shards = glob.glob(os.path.join(cache.directory, 'shard-*.parquet'))
+    assert len(shards) == 1
+    assert read_table(shards[0])['content_hash'].tolist() == [f"hash{i}" for i in range(5)]
+    reloaded = AudioFeatureCache(str(tmp_path), SAMPLE_RATE)
+    assert all(reloaded.get(f"hash{i}") == cache.get(f"hash{i}") for i in range(5))
@@ -0,0 +1,65 @@
+"""
+Multipart recordings on /api/pronunciation/evaluate/audio
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from app import app, audio_decoder
+
+client = TestClient(app)
+
+URL = '/api/pronunciation/evaluate/audio'
+
+
+@pytest.fixture
+def no_temp_files(monkeypatch):
+    """Fail if a spooled upload rolls over to disk"""
+    def rollover(self):
+        raise AssertionError('upload written to a temporary file')
+    monkeypatch.setattr(tempfile.SpooledTemporaryFile, 'rollover', rollover)
+
+
+def pcm(seconds, sample_rate):
+    samples = np.random.default_rng(11).normal(0, 3000, int(seconds * sample_rate))
+    return samples.astype('<i2').tobytes()
+
+
+def test_recording_over_a_megabyte_stays_in_memory(no_temp_files):
+    audio = pcm(20, 48000)
+    assert len(audio) > 1024 * 1024
+    response = client.post(URL, data={'word': 'kiatu', 'sample_rate': '48000'},
+                           files={'audio': ('kiatu.pcm', audio, 'audio/pcm')})
+    
+    assert response.status_code == 200
+    assert response.json()['word'] == 'kiatu'
+
+
+def multipart_chunks(boundary, audio, chunk_bytes=65536):
+    """A form with a word and an audio file, sent without a Content-Length"""
+    yield (f'--{boundary}\r\nContent-Disposition: form-data; name="word"\r\n\r\nkiatu\r\n'
+           f'--{boundary}\r\nContent-Disposition: form-data; name="audio"; filename="kiatu.wav"\r\n'
+           'Content-Type: audio/wav\r\n\r\n').encode()
+    for start in range(0, len(audio), chunk_bytes):
+        yield audio[start:start + chunk_bytes]
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+
+@pytest.mark.parametrize('streamed', [False, True], ids=['content-length', 'chunked'])
+def test_oversized_form_is_rejected(no_temp_files, streamed):
+    audio = b'\x00' * (audio_decoder.max_encoded_bytes + 1)
+    if streamed:
+        response = client.post(URL, content=multipart_chunks('recording', audio),
+                               headers={'content-type': 'multipart/form-data; boundary=recording'})
+    else:
+        response = client.post(URL, data={'word': 'kiatu'}, files={'audio': ('kiatu.wav', audio, 'audio/wav')})
+    
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Invalid audio upload: Recording too large'
@@ -0,0 +1,64 @@
+"""
+FlatForest against the sklearn forest it was converted from
+"""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from models.flat_forest import FlatForest
+
+N_FEATURES = 19
+
+CONFIGS = [
+    dict(n_estimators=50, max_depth=None, n_classes=10),
+    dict(n_estimators=30, max_depth=6, n_classes=3),
+    dict(n_estimators=10, max_depth=None, n_classes=2),
+    dict(n_estimators=1, max_depth=1, n_classes=4),
+]
+
+
+def fitted_forest(rng, n_estimators, max_depth, n_classes):
+    X = rng.normal(size=(2000, N_FEATURES))
+    y = rng.integers(1, n_classes + 1, len(X))
+    return RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=3).fit(X, y), X
+
+
+def sample_inputs(rng, flat, X):
+    """Random, training and single-row inputs, and rows exactly on split thresholds"""
+    on_threshold = rng.normal(size=(500, N_FEATURES))
+    internal = np.flatnonzero(flat.feature >= 0)
+    if internal.size:
+        picks = rng.choice(internal, len(on_threshold))
+        on_threshold[np.arange(len(on_threshold)), flat.feature[picks]] = flat.threshold[picks]
+    return [rng.normal(size=(3000, N_FEATURES)) * 3, X[:500], rng.normal(size=(1, N_FEATURES)), on_threshold]
+
+
+def assert_same_predictions(forest, flat, inputs):
+    for sample in inputs:
+        assert np.array_equal(forest.predict_proba(sample), flat.predict_proba(sample))
+        assert np.array_equal(forest.predict(sample), flat.predict(sample))
+
+
+@pytest.mark.parametrize('config', CONFIGS, ids=lambda config: f"{config['n_estimators']}trees-{config['n_classes']}classes")
+def test_probabilities_match_sklearn(config):
+    rng = np.random.default_rng(7)
+    forest, X = fitted_forest(rng, **config)
+    flat = FlatForest.from_sklearn(forest)
+    
+    assert_same_predictions(forest, flat, sample_inputs(rng, flat, X))
+    assert np.array_equal(flat.feature_importances_, forest.feature_importances_)
+
+
+@pytest.mark.parametrize('mmap_mode', ['r', None])
+def test_probabilities_match_after_joblib_round_trip(tmp_path, mmap_mode):
+    rng = np.random.default_rng(8)
+    forest, X = fitted_forest(rng, **CONFIGS[1])
+    path = str(tmp_path / 'forest.joblib')
+    joblib.dump(FlatForest.from_sklearn(forest), path)
+    
+    loaded = joblib.load(path, mmap_mode=mmap_mode)
+    if mmap_mode is not None:
+        assert all(isinstance(array, np.memmap) for array in loaded.arrays().values())
+    assert_same_predictions(forest, loaded, sample_inputs(rng, loaded, X))
@@ -0,0 +1,38 @@
+"""
+Batch pronunciation evaluation through the inference engine
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.inference.inference_engine import KiswahiliInferenceEngine
+
+
+@pytest.fixture(scope='module', params=[0, 2], ids=['in-process', 'worker-pool'])
+def engine(request):
+    engine = KiswahiliInferenceEngine(model_dir='missing-models', pronunciation_workers=request.param)
+    yield engine
+    engine.close()
+
+
+def test_malformed_request_only_fails_its_own_item(engine):
+    audio = np.random.default_rng(14).normal(0, 0.1, 22050)
+    requests = [
+        {'request_id': 'a', 'word': 'jambo', 'audio_data': audio},
+        {'request_id': 'b', 'word': 'simba', 'sample_rate': 'fast'},
+        {'request_id': 'c', 'audio_data': audio},
+        {'request_id': 'd', 'word': 'rafiki', 'audio_data': audio, 'sample_rate': [22050]},
+        {'request_id': 'e', 'word': 'ndizi', 'sample_rate': 16000},
+    ]
+    results = engine.evaluate_pronunciation_batch(requests)
+    
+    assert [result['request_id'] for result in results] == ['a', 'b', 'c', 'd', 'e']
+    assert [('error' in result) for result in results] == [False, True, True, True, False]
+    failed = results[1]
+    assert failed['word'] == 'simba' and failed['overall_score'] == 0.0
+    assert results[0]['word'] == 'jambo' and results[4]['word'] == 'ndizi'
@@ -0,0 +1,43 @@
+"""
+Saving and reloading a trained recommendation model
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from models.flat_forest import FlatForest
+from training.model_trainer import KiswahiliModelTrainer
+
+FEATURE_NAMES = ['accuracy', 'attempts', 'time_spent', 'difficulty']
+
+
+@pytest.fixture
+def trainer():
+    rng = np.random.default_rng(9)
+    X = rng.random((300, len(FEATURE_NAMES)))
+    y = (X[:, 0] + 0.2 * X[:, 3] > 0.6).astype(int)
+    
+    trainer = KiswahiliModelTrainer()
+    trainer.best_model = RandomForestClassifier(n_estimators=20, random_state=42).fit(X, y)
+    trainer.best_model_name = 'random_forest'
+    trainer.feature_names = FEATURE_NAMES
+    trainer.label_encoder.fit(['practice', 'advance'])
+    return trainer, X, y
+
+
+@pytest.mark.parametrize('mmap_mode', ['r', None])
+def test_flattened_forest_keeps_feature_importance(tmp_path, trainer, mmap_mode):
+    trainer, X, y = trainer
+    expected = trainer.evaluate_model(X, y, save_plots=False)
+    assert expected['feature_importance'] is not None
+    
+    model_path = str(tmp_path / 'model.joblib')
+    assert trainer.save_model(model_path)
+    loaded = KiswahiliModelTrainer()
+    assert loaded.load_model(model_path, mmap_mode=mmap_mode)
+    assert isinstance(loaded.best_model, FlatForest)
+    
+    results = loaded.evaluate_model(X, y, save_plots=False)
+    assert results['feature_importance'] == expected['feature_importance']
+    assert results['confusion_matrix'] == expected['confusion_matrix']
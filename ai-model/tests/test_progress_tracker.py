@@ -0,0 +1,146 @@
+"""
+Snapshots of a ProgressTracker storage_dir shared by several workers,
+and the running statistics they store
+"""
+
+import fcntl
+import multiprocessing as mp
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from models import progress_tracker as progress_module
+from models.progress_tracker import LearningSession, ProgressTracker, RunningStats
+
+SNAPSHOT_INTERVAL = 3
+
+
+def make_session(i: int, worker: str = 'a') -> LearningSession:
+    start = datetime(2025, 1, 1) + timedelta(minutes=i)
+    return LearningSession(
+        session_id=f"{worker}-{i}",
+        user_id=f"user{i % 4}",
+        topic_id=1 + i % 5,
+        start_time=start,
+        end_time=start + timedelta(minutes=10),
+        activities_completed=4,
+        total_activities=5,
+        accuracy_score=0.5 + (i % 5) / 10,
+        pronunciation_score=0.7,
+        engagement_score=0.8,
+        help_requests=i % 2,
+        retry_attempts=0,
+        errors=[{'type': 'phoneme_errors'}]
+    )
+
+
+def snapshot_dirs(storage_dir):
+    snapshots = os.path.join(storage_dir, 'snapshots')
+    return sorted(entry for entry in os.listdir(snapshots) if os.path.isdir(os.path.join(snapshots, entry)))
+
+
+def current_snapshot(storage_dir):
+    with open(os.path.join(storage_dir, 'snapshots', 'CURRENT')) as f:
+        return f.read().strip()
+
+
+def record_many(storage_dir, worker, n_sessions):
+    tracker = ProgressTracker(storage_dir=storage_dir, snapshot_interval=SNAPSHOT_INTERVAL)
+    for i in range(n_sessions):
+        tracker.record_session(make_session(i, worker))
+
+
+def test_interleaved_trackers_snapshot_and_restart(tmp_path):
+    storage_dir = str(tmp_path)
+    first = ProgressTracker(storage_dir=storage_dir, snapshot_interval=SNAPSHOT_INTERVAL)
+    second = ProgressTracker(storage_dir=storage_dir, snapshot_interval=SNAPSHOT_INTERVAL)
+    for i in range(20):
+        (first if i % 2 else second).record_session(make_session(i))
+    first.sync_from_log()
+    second.sync_from_log()
+    
+    assert current_snapshot(storage_dir) in snapshot_dirs(storage_dir)
+    restarted = ProgressTracker(storage_dir=storage_dir, snapshot_interval=SNAPSHOT_INTERVAL)
+    assert len(restarted.sessions_data) == len(first.sessions_data) == len(second.sessions_data) == 20
+    assert restarted.calculate_progress_metrics('user1') == first.calculate_progress_metrics('user1')
+
+
+def test_concurrent_processes_snapshot_and_restart(tmp_path):
+    storage_dir = str(tmp_path)
+    context = mp.get_context('fork')
+    workers = [context.Process(target=record_many, args=(storage_dir, worker, 60)) for worker in 'ab']
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert [worker.exitcode for worker in workers] == [0, 0]
+    
+    assert current_snapshot(storage_dir) in snapshot_dirs(storage_dir)
+    restarted = ProgressTracker(storage_dir=storage_dir, snapshot_interval=SNAPSHOT_INTERVAL)
+    assert len(restarted.sessions_data) == 120
+
+
+def test_snapshot_skipped_while_another_worker_holds_the_lock(tmp_path):
+    storage_dir = str(tmp_path)
+    tracker = ProgressTracker(storage_dir=storage_dir, snapshot_interval=SNAPSHOT_INTERVAL)
+    with open(os.path.join(storage_dir, 'snapshots', 'LOCK'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        for i in range(5):
+            tracker.record_session(make_session(i))
+        assert tracker.save_snapshot() is False
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    assert snapshot_dirs(storage_dir) == []
+    assert tracker.save_snapshot() is True
+    assert len(snapshot_dirs(storage_dir)) == 1
+
+
+def test_failed_snapshot_does_not_fail_recorded_session(tmp_path, monkeypatch):
+    storage_dir = str(tmp_path)
+    tracker = ProgressTracker(storage_dir=storage_dir, snapshot_interval=1)
+    
+    def vanished(store, directory):
+        raise FileNotFoundError(directory)
+    
+    monkeypatch.setattr(progress_module, 'save_store', vanished)
+    tracker.record_session(make_session(0))
+    monkeypatch.undo()
+    
+    restarted = ProgressTracker(storage_dir=storage_dir, snapshot_interval=1)
+    assert len(restarted.sessions_data) == 1
+
+
+@pytest.mark.parametrize('keep_older', [True, False])
+def test_restart_when_current_names_a_missing_snapshot(tmp_path, keep_older):
+    storage_dir = str(tmp_path)
+    tracker = ProgressTracker(storage_dir=storage_dir, snapshot_interval=1000)
+    for i in range(6):
+        tracker.record_session(make_session(i))
+    if keep_older:
+        tracker.save_snapshot()
+    for i in range(6, 10):
+        tracker.record_session(make_session(i))
+    
+    with open(os.path.join(storage_dir, 'snapshots', 'CURRENT'), 'w') as f:
+        f.write(f"{10 ** 9:012d}-1")
+    
+    restarted = ProgressTracker(storage_dir=storage_dir, snapshot_interval=1000)
+    assert len(restarted.sessions_data) == 10
+    assert restarted.calculate_progress_metrics('user2') == tracker.calculate_progress_metrics('user2')
+
+
+def test_running_stats_batches_match_numpy():
+    # A large offset cancels catastrophically in a sum-of-squares variance
+    rng = np.random.default_rng(19)
+    values = 1e8 + rng.normal(0, 0.01, (13, 1000))
+    stats = RunningStats(0, np.zeros(13), np.zeros(13))
+    empty = RunningStats(0, np.zeros(13), np.zeros(13))
+    for batch in np.array_split(values, [0, 1, 250, 700], axis=1):
+        stats.push_batch(batch)
+    
+    assert stats.count == 1000
+    assert np.allclose(stats.mean, values.mean(axis=1), rtol=0, atol=1e-6)
+    assert np.allclose(stats.std, values.std(axis=1), rtol=1e-6)
+    assert empty.std.tolist() == [0.0] * 13
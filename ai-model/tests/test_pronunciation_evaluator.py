@@ -0,0 +1,78 @@
+"""
+Reproducibility of the pronunciation evaluator's simulated scores
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator
+
+SAMPLE_RATE = 22050
+WORDS = ['kitabu', "ng'ombe", 'nyumba', 'mbwa', 'chakula', 'dada']
+
+
+def recording(seed: int = 0) -> np.ndarray:
+    """A second of voiced, syllable-modulated tone with noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    voice = sum(np.sin(2 * np.pi * 300 * k * t) / k for k in range(1, 6))
+    audio = 0.2 * voice * 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) + rng.normal(0, 0.01, len(t))
+    return audio.astype(np.float32)
+
+
+def workload(evaluator, seed=None):
+    """Evaluations (without wall-clock metadata), suggestions and report for WORDS"""
+    rng = np.random.default_rng(seed) if seed is not None else None
+    clip = recording()
+    evaluations = []
+    for word in WORDS:
+        result = evaluator.evaluate_pronunciation(word, clip, SAMPLE_RATE, rng=rng)
+        evaluations.append({key: value for key, value in result.items() if key != 'metadata'})
+    suggestions = [evaluator.get_practice_suggestions(e['areas_for_improvement']) for e in evaluations]
+    report = evaluator.create_pronunciation_report(evaluations)
+    return json.loads(json.dumps([evaluations, suggestions, report], sort_keys=True, default=float))
+
+
+@pytest.mark.parametrize('seed', [0, 42])
+def test_same_seed_gives_identical_outputs(seed):
+    first = workload(KiswahiliPronunciationEvaluator(), seed)
+    second = workload(KiswahiliPronunciationEvaluator(), seed)
+    assert first == second
+
+
+def test_evaluator_rng_gives_identical_outputs():
+    first = workload(KiswahiliPronunciationEvaluator(rng=np.random.default_rng(7)))
+    second = workload(KiswahiliPronunciationEvaluator(rng=np.random.default_rng(7)))
+    assert first == second
+
+
+def test_deterministic_gives_identical_outputs():
+    evaluator = KiswahiliPronunciationEvaluator(deterministic=True)
+    assert workload(evaluator) == workload(evaluator) == workload(KiswahiliPronunciationEvaluator(deterministic=True))
+
+
+def test_different_seeds_differ():
+    assert workload(KiswahiliPronunciationEvaluator(), 1) != workload(KiswahiliPronunciationEvaluator(), 2)
+
+
+def test_outputs_identical_across_processes():
+    """Nothing may depend on per-process state such as string hash randomization"""
+    script = (
+        "import json, sys\n"
+        f"sys.path[:0] = [{os.path.dirname(__file__)!r}, {os.path.join(os.path.dirname(__file__), '..', 'src')!r}]\n"
+        "from models.pronunciation_evaluator import KiswahiliPronunciationEvaluator\n"
+        "from test_pronunciation_evaluator import workload\n"
+        "print(json.dumps([workload(KiswahiliPronunciationEvaluator(), 42),\n"
+        "                  workload(KiswahiliPronunciationEvaluator(deterministic=True))], sort_keys=True))\n"
+    )
+    outputs = []
+    for hash_seed in ('1', '2'):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        completed = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True, text=True, check=True)
+        outputs.append(completed.stdout.strip().splitlines()[-1])
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,39 @@
+"""
+Control messages on the /ws/pronunciation socket
+"""
+
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from app import app
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize('text', ['123', '[]', '"end"', 'null', '{"type": '])
+def test_control_message_that_is_not_a_json_object_is_rejected(text):
+    with client.websocket_connect('/ws/pronunciation?word=kiatu') as websocket:
+        websocket.send_text(text)
+        error = websocket.receive_json()
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    
+    assert error['type'] == 'error' and error['detail'].startswith('Invalid audio stream')
+    assert closed.value.code == 1003
+
+
+def test_end_message_returns_the_final_evaluation():
+    with client.websocket_connect('/ws/pronunciation?word=kiatu') as websocket:
+        websocket.send_bytes(b'\x00\x10' * 22050)
+        partial = websocket.receive_json()
+        websocket.send_text('{"type": "end"}')
+        final = websocket.receive_json()
+    
+    assert partial['type'] == 'partial'
+    assert final['type'] == 'final' and final['word'] == 'kiatu'
@@ -0,0 +1,74 @@
+"""
+Per-item statuses from /api/session/record/batch
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import app as app_module
+from models.progress_tracker import ProgressTracker
+
+client = TestClient(app_module.app)
+
+URL = '/api/session/record/batch'
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = ProgressTracker()
+    monkeypatch.setattr(app_module, 'progress_tracker', tracker)
+    return tracker
+
+
+def session(i, **overrides):
+    item = {
+        'session_id': f's{i}',
+        'user_id': 'amani',
+        'topic_id': 1,
+        'start_time': f'2025-03-0{i}T10:00:00',
+        'end_time': f'2025-03-0{i}T10:10:00',
+        'activities_completed': 4,
+        'total_activities': 5,
+        'accuracy_score': 0.8,
+        'pronunciation_score': 0.7,
+        'engagement_score': 0.9,
+    }
+    item.update(overrides)
+    return item
+
+
+def test_invalid_items_fail_without_rejecting_the_batch(tracker):
+    lines = [
+        json.dumps(session(1)),
+        json.dumps(session(2, topic_id='first', accuracy_score=None)),
+        '{"session_id": ',
+        json.dumps(session(3, start_time='yesterday')),
+        json.dumps([1, 2]),
+        json.dumps(session(4)),
+    ]
+    response = client.post(URL, content='\n'.join(lines), headers={'content-type': 'application/x-ndjson'})
+    body = response.json()
+    
+    assert response.status_code == 200
+    assert (body['status'], body['recorded'], body['failed']) == ('partial', 2, 4)
+    assert [result['status'] for result in body['results']] == ['recorded', 'failed', 'failed', 'failed', 'failed', 'recorded']
+    assert [result['session_id'] for result in body['results']] == ['s1', 's2', None, 's3', None, 's4']
+    assert body['results'][1]['error'].startswith('topic_id: ') and '; accuracy_score: ' in body['results'][1]['error']
+    assert [s.session_id for s in tracker.get_user_sessions('amani')] == ['s1', 's4']
+
+
+def test_nothing_is_reported_recorded_when_the_write_fails(tracker, monkeypatch):
+    def record_sessions(sessions):
+        raise OSError('disk full')
+    monkeypatch.setattr(tracker, 'record_sessions', record_sessions)
+    
+    response = client.post(URL, json=[session(1), session(2)])
+    
+    assert response.status_code == 500
+    assert response.json()['detail'] == 'Session recording error: disk full'
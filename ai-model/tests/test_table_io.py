@@ -0,0 +1,82 @@
+"""
+Chunked table writing across CSV, Parquet and Arrow IPC
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from preprocessing.table_io import TableWriter, read_table
+
+FORMATS = ['csv', 'parquet', 'arrow']
+
+
+def vocabulary_chunk(start: int, **columns) -> pd.DataFrame:
+    chunk = pd.DataFrame({
+        'word': [f"neno{i}" for i in range(start, start + 3)],
+        'topic_id': [start + i for i in range(3)],
+    })
+    for name, values in columns.items():
+        chunk[name] = values
+    return chunk
+
+
+@pytest.mark.parametrize('file_format', FORMATS)
+def test_chunks_are_appended_in_the_first_chunks_column_order(tmp_path, file_format):
+    path = str(tmp_path / f"vocabulary.{file_format}")
+    with TableWriter(path) as writer:
+        writer.write(vocabulary_chunk(0))
+        writer.write(vocabulary_chunk(3)[['topic_id', 'word']])
+    
+    expected = pd.concat([vocabulary_chunk(0), vocabulary_chunk(3)], ignore_index=True)
+    pd.testing.assert_frame_equal(read_table(path), expected)
+
+
+@pytest.mark.parametrize('file_format', FORMATS)
+@pytest.mark.parametrize('columns', [['word'], ['word', 'topic_id', 'english']])
+def test_chunk_with_other_columns_is_rejected(tmp_path, file_format, columns):
+    path = str(tmp_path / f"vocabulary.{file_format}")
+    second = vocabulary_chunk(3, english=['word'] * 3)[columns]
+    with pytest.raises(ValueError, match='columns'):
+        with TableWriter(path) as writer:
+            writer.write(vocabulary_chunk(0))
+            writer.write(second)
+    
+    pd.testing.assert_frame_equal(read_table(path), vocabulary_chunk(0))
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_chunk_not_fitting_the_schema_is_rejected_before_writing(tmp_path, file_format):
+    path = str(tmp_path / f"vocabulary.{file_format}")
+    second = vocabulary_chunk(3)
+    second['topic_id'] = ['three', 'four', 'five']
+    with pytest.raises(ValueError, match="topic_id"):
+        with TableWriter(path) as writer:
+            writer.write(vocabulary_chunk(0))
+            writer.write(second)
+    
+    pd.testing.assert_frame_equal(read_table(path), vocabulary_chunk(0))
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_explicit_schema_types_columns_the_first_chunk_leaves_empty(tmp_path, file_format):
+    path = str(tmp_path / f"vocabulary.{file_format}")
+    schema = pa.schema([('word', pa.string()), ('topic_id', pa.int64()), ('english', pa.string())])
+    with TableWriter(path, schema=schema) as writer:
+        writer.write(vocabulary_chunk(0, english=[None] * 3))
+        writer.write(vocabulary_chunk(3, english=['one', 'two', 'three']))
+    
+    table = read_table(path)
+    assert table['english'].isna().tolist() == [True] * 3 + [False] * 3
+    assert table['english'].tolist()[3:] == ['one', 'two', 'three']
+    assert table['topic_id'].tolist() == list(range(6))
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'arrow'])
+def test_explicit_schema_without_chunks_writes_an_empty_table(tmp_path, file_format):
+    path = str(tmp_path / f"vocabulary.{file_format}")
+    schema = pa.schema([('word', pa.string()), ('topic_id', pa.int64())])
+    TableWriter(path, schema=schema).close()
+    
+    table = read_table(path)
+    assert list(table.columns) == ['word', 'topic_id'] and table.empty
@@ -0,0 +1,137 @@
+"""
+create_training_dataset against the previous per-word scan
+"""
+
+import filecmp
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing.data_processor import KiswahiliDataProcessor
+
+WORDS = ['mbwa', 'paka', 'kitabu', 'kiti', 'mama', 'baba', "ng'ombe", 'ndizi', 'maji', 'samaki', 'ki', 'ma']
+ERROR_TYPES = ['none', 'phonetic', 'visual_confusion', 'sequence']
+TRAINING_COLUMNS = ['word', 'difficulty', 'category', 'phonetic_complexity', 'syllable_count', 'word_length',
+                    'has_audio', 'user_success_rate', 'avg_response_time', 'common_errors']
+
+
+def reference_create_training_dataset(vocab_file, audio_features_file, interaction_file, output_file):
+    """KiswahiliDataProcessor.create_training_dataset before the keyed joins"""
+    vocab_df = pd.read_csv(vocab_file)
+    audio_df = pd.read_csv(audio_features_file)
+    interaction_df = pd.read_csv(interaction_file)
+    training_data = []
+    for _, vocab_row in vocab_df.iterrows():
+        word = vocab_row['kiswahili']
+        audio_features = audio_df[audio_df['filename'].str.contains(word, na=False)]
+        user_interactions = interaction_df[interaction_df['topic_id'] == vocab_row.get('topic_id', 0)]
+        training_data.append({
+            'word': word,
+            'difficulty': vocab_row['difficulty'],
+            'category': vocab_row['category'],
+            'phonetic_complexity': vocab_row['phonetic_complexity'],
+            'syllable_count': vocab_row['syllable_count'],
+            'word_length': vocab_row['word_length'],
+            'has_audio': len(audio_features) > 0,
+            'user_success_rate': user_interactions['accuracy'].mean() if not user_interactions.empty else 0.5,
+            'avg_response_time': user_interactions['response_time'].mean() if not user_interactions.empty else 0.0,
+            'common_errors': user_interactions['error_type'].mode().iloc[0] if not user_interactions.empty else 'none'
+        })
+    pd.DataFrame(training_data).to_csv(output_file, index=False)
+
+
+def vocabulary(words, topic_ids=None) -> pd.DataFrame:
+    vocab = pd.DataFrame({
+        'kiswahili': words,
+        'english': 'word',
+        'category': 'animals',
+        'difficulty': 1,
+        'syllable_count': 2,
+        'phonetic_complexity': 0.5,
+        'word_length': [len(word) for word in words],
+    })
+    if topic_ids is not None:
+        vocab['topic_id'] = topic_ids
+    return vocab
+
+
+def random_tables(rng, with_topics):
+    """Words that are substrings of others, missing values and tied error modes"""
+    n_words, n_audio, n_interactions = 300, 800, 3000
+    words = np.array(WORDS, dtype=object)[rng.integers(0, len(WORDS), n_words)]
+    compound = rng.random(n_words) < 0.5
+    words[compound] = words[compound] + '-' + np.array(WORDS, dtype=object)[rng.integers(0, len(WORDS), compound.sum())]
+    words[:2] = ['mama.', 'a+b']
+    topic_ids = None
+    if with_topics:
+        topic_ids = rng.integers(0, 40, n_words).astype(float)
+        topic_ids[rng.random(n_words) < 0.05] = np.nan
+    
+    named = words[rng.integers(0, n_words, n_audio)]
+    speakers = rng.integers(1, 30, n_audio).astype(str)
+    filenames = np.where(rng.random(n_audio) < 0.7, named.astype(str) + '_child' + speakers + '.wav',
+                         'silence_' + speakers + '.wav').astype(object)
+    filenames[rng.random(n_audio) < 0.01] = None
+    
+    accuracy = rng.random(n_interactions).round(3)
+    accuracy[rng.random(n_interactions) < 0.02] = np.nan
+    interactions = pd.DataFrame({
+        'topic_id': rng.integers(0, 30, n_interactions),
+        'accuracy': accuracy,
+        'response_time': rng.gamma(2.0, 1.5, n_interactions).round(2),
+        'error_type': rng.choice(ERROR_TYPES, n_interactions),
+    })
+    return vocabulary(list(words), topic_ids), pd.DataFrame({'filename': filenames}), interactions
+
+
+def write_tables(directory, tables):
+    paths = [str(directory / name) for name in ('vocab.csv', 'audio.csv', 'interactions.csv')]
+    for table, path in zip(tables, paths):
+        table.to_csv(path, index=False)
+    return paths
+
+
+def run_both(tmp_path, tables):
+    paths = write_tables(tmp_path, tables)
+    expected, actual = str(tmp_path / 'expected.csv'), str(tmp_path / 'actual.csv')
+    reference_create_training_dataset(*paths, expected)
+    KiswahiliDataProcessor().create_training_dataset(*paths, actual)
+    return expected, actual
+
+
+@pytest.mark.parametrize('with_topics', [False, True])
+def test_matches_the_per_word_scan(tmp_path, with_topics):
+    expected, actual = run_both(tmp_path, random_tables(np.random.default_rng(23), with_topics))
+    assert filecmp.cmp(expected, actual, shallow=False)
+
+
+def test_unreferenced_topic_without_error_types_is_ignored(tmp_path):
+    interactions = pd.DataFrame({
+        'topic_id': [0, 3],
+        'accuracy': [0.8, 0.4],
+        'response_time': [1.5, 2.5],
+        'error_type': ['x', None],
+    })
+    tables = (vocabulary(['mbwa', 'paka']), pd.DataFrame({'filename': ['mbwa_child1.wav']}), interactions)
+    expected, actual = run_both(tmp_path, tables)
+    
+    assert filecmp.cmp(expected, actual, shallow=False)
+    assert pd.read_csv(actual)['common_errors'].tolist() == ['x', 'x']
+
+
+def test_referenced_topic_without_error_types_has_no_common_error(tmp_path):
+    interactions = pd.DataFrame({
+        'topic_id': [1, 1, 2],
+        'accuracy': [0.8, 0.6, 0.4],
+        'response_time': [1.5, 2.5, 3.0],
+        'error_type': [None, None, 'phonetic'],
+    })
+    paths = write_tables(tmp_path, (vocabulary(['mbwa', 'paka'], [1, 2]), pd.DataFrame({'filename': []}), interactions))
+    output = str(tmp_path / 'training.csv')
+    KiswahiliDataProcessor().create_training_dataset(*paths, output)
+    
+    training = pd.read_csv(output)
+    assert list(training.columns) == TRAINING_COLUMNS
+    assert training['common_errors'].tolist() == ['none', 'phonetic']
+    assert training['user_success_rate'].tolist() == pytest.approx([0.7, 0.4])